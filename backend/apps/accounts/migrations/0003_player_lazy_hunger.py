@@ -0,0 +1,54 @@
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def start_decay(apps, schema_editor):
+    """Игрокам на локации — скорость снижения, прежде задаваемая hunger_tick."""
+    Player = apps.get_model('accounts', 'Player')
+    game = settings.GAME_SETTINGS
+    Player.objects.filter(current_location__isnull=False).update(
+        hunger_rate=game['HUNGER_DECREASE'] / game['HUNGER_TICK_MINUTES'],
+        hunger_as_of=django.utils.timezone.now(),
+    )
+
+
+def drop_hunger_tick(apps, schema_editor):
+    """Расписание beat хранится в БД: удаляем запись снятой задачи."""
+    try:
+        PeriodicTask = apps.get_model('django_celery_beat', 'PeriodicTask')
+    except LookupError:
+        return
+    PeriodicTask.objects.filter(task='apps.fishing.tasks.hunger_tick').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_player_rod_slot_1_player_rod_slot_2_and_more'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='player',
+            old_name='hunger',
+            new_name='hunger_value',
+        ),
+        migrations.AlterField(
+            model_name='player',
+            name='hunger_value',
+            field=models.FloatField(default=100, verbose_name='Сытость на момент фиксации'),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='hunger_as_of',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Сытость зафиксирована'),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='hunger_rate',
+            field=models.FloatField(default=0, verbose_name='Снижение сытости в минуту'),
+        ),
+        migrations.RunPython(start_decay, migrations.RunPython.noop),
+        migrations.RunPython(drop_hunger_tick, migrations.RunPython.noop),
+    ]
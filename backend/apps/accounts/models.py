@@ -1,7 +1,18 @@
 """Модель игрока."""
 
+import math
+
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
+
+from . import ranks
+
+
+def hunger_decay_per_minute() -> float:
+    """Снижение сытости в минуту у игрока на локации."""
+    game = settings.GAME_SETTINGS
+    return game['HUNGER_DECREASE'] / game['HUNGER_TICK_MINUTES']
 
 
 class Player(models.Model):
@@ -14,7 +25,11 @@ class Player(models.Model):
     karma = models.IntegerField('Карма', default=0)
     money = models.DecimalField('Деньги', max_digits=12, decimal_places=2, default=500.00)
     gold = models.IntegerField('Голд (премиум)', default=0)
-    hunger = models.IntegerField('Сытость (0-100)', default=100)
+    # Сытость хранится как (значение, момент, скорость снижения) и считается
+    # при чтении — см. свойство hunger.
+    hunger_value = models.FloatField('Сытость на момент фиксации', default=100)
+    hunger_as_of = models.DateTimeField('Сытость зафиксирована', default=timezone.now)
+    hunger_rate = models.FloatField('Снижение сытости в минуту', default=0)
     current_base = models.ForeignKey(
         'world.Base', on_delete=models.SET_NULL, null=True, blank=True,
         related_name='players', verbose_name='Текущая база',
@@ -39,6 +54,8 @@ class Player(models.Model):
     created_at = models.DateTimeField('Создан', auto_now_add=True)
     updated_at = models.DateTimeField('Обновлён', auto_now=True)
 
+    HUNGER_FIELDS = ['hunger_value', 'hunger_as_of', 'hunger_rate']
+
     class Meta:
         verbose_name = 'Игрок'
         verbose_name_plural = 'Игроки'
@@ -46,6 +63,32 @@ class Player(models.Model):
     def __str__(self):
         return self.nickname
 
+    def hunger_at(self, moment) -> int:
+        """Сытость (0-100) на момент moment."""
+        elapsed = max(0.0, (moment - self.hunger_as_of).total_seconds() / 60)
+        value = self.hunger_value - self.hunger_rate * elapsed
+        return min(100, max(0, math.ceil(value)))
+
+    @property
+    def hunger(self) -> int:
+        """Текущая сытость (0-100)."""
+        return self.hunger_at(timezone.now())
+
+    @hunger.setter
+    def hunger(self, value):
+        self.hunger_value = min(100, max(0, value))
+        self.hunger_as_of = timezone.now()
+
+    def feed(self, amount) -> int:
+        """Восстановить сытость; сохранять с update_fields=HUNGER_FIELDS."""
+        self.hunger = self.hunger + amount
+        return self.hunger
+
+    def sync_hunger_rate(self):
+        """Зафиксировать сытость и пересчитать скорость по current_location."""
+        self.hunger = self.hunger
+        self.hunger_rate = hunger_decay_per_minute() if self.current_location_id else 0
+
     @property
     def rank_title(self):
         """Название разряда."""
@@ -63,14 +106,38 @@ class Player(models.Model):
     @property
     def experience_to_next_rank(self):
         """Опыт, необходимый для следующего разряда."""
-        if self.rank < 50:
-            return self.rank * 1000
-        return 200000
+        return ranks.experience_to_next(self.rank)
+
+    def reward(self, money=0, experience=0, karma=0):
+        """
+        Начислить награду в памяти; в БД пишет flush().
+
+        Use case копит все начисления и сохраняет игрока одним UPDATE.
+        Деньги и карма уходят приращениями (F() + delta), чтобы не затереть
+        параллельное списание: runtime рыбалки держит игрока долго, а
+        покупки списывают деньги в обход этого экземпляра.
+        """
+        deltas = self.__dict__.setdefault('_pending_deltas', {})
+        if money:
+            self.money += money
+            deltas['money'] = deltas.get('money', 0) + money
+        if karma:
+            self.karma += karma
+            deltas['karma'] = deltas.get('karma', 0) + karma
+        if experience:
+            self.rank, self.experience = ranks.apply_experience(self.rank, self.experience, experience)
+            self.__dict__.setdefault('_pending_fields', set()).update(('experience', 'rank'))
+
+    def flush(self, *extra_fields):
+        """Сохранить накопленные reward() поля (и extra_fields) одним UPDATE."""
+        deltas = self.__dict__.pop('_pending_deltas', {})
+        fields = (self.__dict__.pop('_pending_fields', set()) | set(extra_fields)) - set(deltas)
+        values = {name: models.F(name) + delta for name, delta in deltas.items()}
+        values.update((name, getattr(self, name)) for name in fields)
+        if values:
+            type(self)._default_manager.filter(pk=self.pk).update(**values)
 
     def add_experience(self, amount):
-        """Добавить опыт и проверить повышение разряда."""
-        self.experience += amount
-        while self.experience >= self.experience_to_next_rank:
-            self.experience -= self.experience_to_next_rank
-            self.rank += 1
-        self.save(update_fields=['experience', 'rank'])
+        """Добавить опыт, пересчитать разряд и сразу сохранить."""
+        self.reward(experience=amount)
+        self.flush()
@@ -0,0 +1,52 @@
+"""Кривая разрядов: опыт на разряд и переход по накопленному опыту.
+
+Player хранит разряд и опыт внутри разряда. До CURVE_TOP_RANK разряду r
+нужно r * 1000 опыта, дальше — по TOP_RANK_EXPERIENCE на каждый.
+CUMULATIVE[r] — опыт от начала первого разряда до начала r-го; новый
+разряд ищется бинарным поиском, за пределами таблицы — делением.
+"""
+
+from bisect import bisect_right
+
+CURVE_TOP_RANK = 50
+EXPERIENCE_PER_RANK = 1000
+TOP_RANK_EXPERIENCE = 200000
+
+
+def experience_to_next(rank) -> int:
+    """Опыт, необходимый для перехода с rank на следующий разряд."""
+    if rank < CURVE_TOP_RANK:
+        return rank * EXPERIENCE_PER_RANK
+    return TOP_RANK_EXPERIENCE
+
+
+# CUMULATIVE[0] не используется: разряды начинаются с 1.
+CUMULATIVE = [0, 0]
+for _rank in range(1, CURVE_TOP_RANK):
+    CUMULATIVE.append(CUMULATIVE[-1] + experience_to_next(_rank))
+del _rank
+
+
+def total_experience(rank, experience) -> int:
+    """Опыт от начала первого разряда."""
+    if rank <= CURVE_TOP_RANK:
+        return CUMULATIVE[max(rank, 1)] + experience
+    return CUMULATIVE[CURVE_TOP_RANK] + (rank - CURVE_TOP_RANK) * TOP_RANK_EXPERIENCE + experience
+
+
+def rank_for(total) -> tuple[int, int]:
+    """(разряд, опыт внутри разряда) по суммарному опыту."""
+    top = CUMULATIVE[CURVE_TOP_RANK]
+    if total >= top:
+        extra, experience = divmod(total - top, TOP_RANK_EXPERIENCE)
+        return CURVE_TOP_RANK + extra, experience
+    rank = bisect_right(CUMULATIVE, total, lo=1) - 1
+    return rank, total - CUMULATIVE[rank]
+
+
+def apply_experience(rank, experience, amount) -> tuple[int, int]:
+    """Разряд и опыт после начисления amount (разряд не понижается)."""
+    new_rank, new_experience = rank_for(total_experience(rank, experience) + amount)
+    if new_rank < rank:
+        return rank, experience + amount
+    return new_rank, new_experience
@@ -1,9 +1,13 @@
 """Тесты API аккаунтов."""
 
+from datetime import timedelta
+
 import pytest
 from django.contrib.auth.models import User
+from django.utils import timezone
 from rest_framework import status
 
+from apps.accounts import ranks
 from apps.accounts.models import Player
 from apps.world.models import Base
 
@@ -143,3 +147,119 @@ class TestProfile:
         """Без токена — 401."""
         resp = client.get(PROFILE_URL)
         assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+# ── Hunger ────────────────────────────────────────────────────────────
+
+
+@pytest.mark.django_db
+class TestLazyHunger:
+
+    def test_decays_on_read(self, player, location):
+        """Сытость на локации считается при чтении, без записи в БД."""
+        player.current_location = location
+        player.sync_hunger_rate()
+        player.save(update_fields=['current_location', *Player.HUNGER_FIELDS])
+        as_of = player.hunger_as_of
+
+        # 2 единицы за 5 минут → через 50 минут минус 20
+        assert player.hunger_at(as_of + timedelta(minutes=50)) == 80
+        # Формула ограничена снизу нулём
+        assert player.hunger_at(as_of + timedelta(days=1)) == 0
+
+        player.refresh_from_db()
+        assert player.hunger_value == 100
+        assert player.hunger_as_of == as_of
+
+    def test_no_decay_off_location(self, player):
+        """Без локации сытость не снижается."""
+        player.sync_hunger_rate()
+        assert player.hunger_rate == 0
+        assert player.hunger_at(player.hunger_as_of + timedelta(days=1)) == 100
+
+    def test_feed_materializes(self, player, location):
+        """Еда фиксирует текущую сытость и прибавляет к ней, не выше 100."""
+        player.current_location = location
+        player.sync_hunger_rate()
+        player.hunger_as_of -= timedelta(minutes=100)  # −40
+
+        assert player.feed(25) == 85
+        assert player.hunger_value == 85
+        assert player.feed(50) == 100
+
+    def test_profile_shows_computed_hunger(self, api_client, player, location):
+        """Профиль отдаёт вычисленную сытость."""
+        Player.objects.filter(pk=player.pk).update(
+            current_location=location, hunger_value=60, hunger_rate=0.4,
+            hunger_as_of=timezone.now() - timedelta(minutes=25),
+        )
+        resp = api_client.get(PROFILE_URL)
+        assert resp.data['hunger'] == 50
+
+
+# ── Ranks ─────────────────────────────────────────────────────────────
+
+
+def _add_experience_loop(rank, experience, amount):
+    """Прежний алгоритм: по одному разряду за итерацию."""
+    experience += amount
+    while experience >= ranks.experience_to_next(rank):
+        experience -= ranks.experience_to_next(rank)
+        rank += 1
+    return rank, experience
+
+
+class TestRankCurve:
+
+    @pytest.mark.parametrize('rank,experience,amount', [
+        (1, 0, 0), (1, 0, 999), (1, 0, 1000), (1, 500, 2500),
+        (3, 100, 45000), (49, 48000, 1000), (49, 0, 1_000_000),
+        (50, 0, 199_999), (50, 150_000, 650_000), (75, 10, 3),
+    ])
+    def test_matches_step_by_step(self, rank, experience, amount):
+        """Бинарный поиск по таблице даёт то же, что пошаговый цикл."""
+        assert ranks.apply_experience(rank, experience, amount) == (
+            _add_experience_loop(rank, experience, amount)
+        )
+
+    def test_total_roundtrip(self):
+        for rank in (1, 2, 10, 49, 50, 51, 120):
+            assert ranks.rank_for(ranks.total_experience(rank, 7)) == (rank, 7)
+
+
+@pytest.mark.django_db
+class TestPlayerReward:
+
+    def test_reward_is_saved_by_flush(self, player):
+        """reward() копит изменения в памяти, flush() пишет их одним UPDATE."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        player.reward(experience=700)
+        player.reward(money=15, karma=3, experience=400)
+        assert Player.objects.get(pk=player.pk).experience == 0
+
+        with CaptureQueriesContext(connection) as ctx:
+            player.flush()
+        assert len(ctx.captured_queries) == 1
+
+        player.refresh_from_db()
+        assert (player.rank, player.experience, player.karma) == (2, 100, 3)
+        assert player.money == 1015
+
+    def test_flush_keeps_concurrent_debit(self, player):
+        """Деньги и карма пишутся приращением: списание в обход экземпляра не теряется."""
+        from django.db.models import F
+
+        player.reward(money=100, karma=2, experience=10)
+        Player.objects.filter(pk=player.pk).update(money=F('money') - 300, karma=F('karma') - 1)
+        player.flush()
+
+        player.refresh_from_db()
+        assert player.money == 1000 + 100 - 300
+        assert player.karma == 2 - 1
+        assert player.experience == 10
+
+    def test_flush_without_changes(self, player, assert_max_queries):
+        with assert_max_queries(0):
+            player.flush()
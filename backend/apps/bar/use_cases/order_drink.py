@@ -25,8 +25,8 @@ class OrderDrinkUseCase:
 
         with transaction.atomic():
             player.money -= drink.price
-            player.hunger = min(100, player.hunger + drink.satiety)
-            player.save(update_fields=['money', 'hunger'])
+            player.feed(drink.satiety)
+            player.save(update_fields=['money', *player.HUNGER_FIELDS])
             BarDrinkOrder.objects.create(
                 player=player, drink=drink, game_day=game_time.current_day,
             )
@@ -36,8 +36,8 @@ class PrepareSnackUseCase:
             fish.is_sold = True
             fish.save(update_fields=['is_sold'])
 
-            player.hunger = min(100, player.hunger + satiety)
-            player.save(update_fields=['hunger'])
+            player.feed(satiety)
+            player.save(update_fields=player.HUNGER_FIELDS)
 
             BarSnackOrder.objects.create(
                 player=player,
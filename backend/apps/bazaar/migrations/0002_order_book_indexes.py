@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_player_rod_slot_1_player_rod_slot_2_and_more'),
+        ('bazaar', '0001_initial'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='marketlisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['content_type', 'object_id', 'price', 'id'], name='bazaar_active_item_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketlisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='bazaar_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketlisting',
+            index=models.Index(fields=['seller', 'is_active'], name='bazaar_seller_active_idx'),
+        ),
+    ]
@@ -36,6 +36,22 @@ class MarketListing(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['content_type', 'object_id']),
+            # Стакан по предмету: дешёвые активные лоты первыми.
+            models.Index(
+                fields=['content_type', 'object_id', 'price', 'id'],
+                condition=models.Q(is_active=True),
+                name='bazaar_active_item_price_idx',
+            ),
+            # Лента активных лотов (курсорная пагинация по -created_at).
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(is_active=True),
+                name='bazaar_active_created_idx',
+            ),
+            models.Index(
+                fields=['seller', 'is_active'],
+                name='bazaar_seller_active_idx',
+            ),
         ]
 
     def __str__(self):
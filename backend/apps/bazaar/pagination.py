@@ -0,0 +1,113 @@
+"""Курсорная пагинация барахолки."""
+
+import json
+from base64 import b64decode, b64encode
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class MarketCursorPagination(CursorPagination):
+    """
+    Keyset-пагинация лотов без COUNT и OFFSET.
+
+    Порядок берётся из view.get_ordering() — пара (поле, id) с одним
+    направлением; у каждого варианта есть покрывающий частичный индекс
+    (см. MarketListing.Meta.indexes). Курсор хранит ключ крайнего лота
+    (значение поля, id), следующая страница — строго после него:
+    (price > p) OR (price = p AND id > i). В отличие от CursorPagination
+    DRF, лоты с одинаковой ценой не перебираются смещением.
+    """
+
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-created_at', '-id')
+
+    def get_ordering(self, request, queryset, view):
+        get_view_ordering = getattr(view, 'get_ordering', None)
+        if get_view_ordering is not None:
+            return get_view_ordering()
+        return self.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        key, self.reverse = self.decode_cursor(request)
+
+        ordering = self._flip(self.ordering) if self.reverse else self.ordering
+        if key is not None:
+            field = queryset.model._meta.get_field(self.ordering[0].lstrip('-'))
+            try:
+                key = [field.to_python(key[0]), key[1]]
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+            queryset = queryset.filter(self._after(ordering, key))
+        results = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+
+        # Назад — страница перед первым лотом, вперёд — после последнего.
+        self.has_next = has_more if not self.reverse else True
+        self.has_previous = key is not None if not self.reverse else has_more
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._key(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self._key(self.page[0]), reverse=True)
+
+    def decode_cursor(self, request):
+        """(ключ [значение, id] или None, назад ли)."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            data = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            key, reverse = data['k'], bool(data.get('r'))
+            if not (isinstance(key, list) and len(key) == 2 and isinstance(key[0], str) and type(key[1]) is int):
+                raise ValueError(key)
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return key, reverse
+
+    def encode_cursor(self, key, reverse):
+        data = {'k': key}
+        if reverse:
+            data['r'] = 1
+        encoded = b64encode(json.dumps(data, separators=(',', ':')).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _key(self, obj) -> list:
+        value = getattr(obj, self.ordering[0].lstrip('-'))
+        value = value.isoformat() if hasattr(value, 'isoformat') else str(value)
+        return [value, obj.pk]
+
+    @staticmethod
+    def _flip(ordering):
+        return tuple(f[1:] if f.startswith('-') else f'-{f}' for f in ordering)
+
+    @staticmethod
+    def _after(ordering, key):
+        """Строго после ключа в порядке ordering: (поле, id), одно направление."""
+        field, tie = ordering
+        op = 'lt' if field.startswith('-') else 'gt'
+        field, tie = field.lstrip('-'), tie.lstrip('-')
+        value, pk = key
+        return Q(**{f'{field}__{op}': value}) | Q(**{field: value, f'{tie}__{op}': pk})
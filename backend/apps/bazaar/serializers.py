@@ -46,3 +46,42 @@ class CreateListingSerializer(serializers.Serializer):
     item_id = serializers.IntegerField()
     quantity = serializers.IntegerField(min_value=1)
     price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0.01)
+
+
+class MarketFilterSerializer(serializers.Serializer):
+    """Параметры фильтрации и сортировки стакана барахолки."""
+
+    ORDERING_CHOICES = {
+        'price': ('price', 'id'),
+        '-price': ('-price', '-id'),
+        '-created_at': ('-created_at', '-id'),
+    }
+
+    item_type = serializers.CharField(required=False)
+    item_id = serializers.IntegerField(required=False, min_value=1)
+    seller = serializers.IntegerField(required=False, min_value=1)
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    max_price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    min_quantity = serializers.IntegerField(required=False, min_value=1)
+    ordering = serializers.ChoiceField(
+        choices=list(ORDERING_CHOICES), required=False, default='-created_at',
+    )
+
+    def validate(self, attrs):
+        if 'item_id' in attrs and 'item_type' not in attrs:
+            raise serializers.ValidationError({'item_type': 'Обязателен вместе с item_id.'})
+        min_price, max_price = attrs.get('min_price'), attrs.get('max_price')
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise serializers.ValidationError({'min_price': 'Больше max_price.'})
+        return attrs
+
+
+class BestPriceSerializer(serializers.Serializer):
+    """Лучшая цена по предмету."""
+
+    item_type = serializers.CharField()
+    object_id = serializers.IntegerField()
+    item_name = serializers.CharField()
+    best_price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    listings = serializers.IntegerField()
+    total_quantity = serializers.IntegerField()
@@ -1,16 +1,22 @@
 """Тесты API барахолки."""
-import pytest
+import random
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 
+import pytest
+
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import AccessToken
 
 from apps.accounts.models import Player
 from apps.bazaar.models import MarketListing
+from apps.bazaar.use_cases.buy_listing import BuyListingUseCase
 from apps.inventory.models import InventoryItem
-from apps.tackle.models import Bait
+from apps.tackle.models import Bait, Hook
 
 
 @pytest.fixture
@@ -76,6 +82,142 @@ class TestMarketList:
         assert resp.status_code == 200
         assert len(resp.data['results']) == 0
 
+    def test_query_count_does_not_grow_with_listings(self, api_client, player, listing):
+        """GFK лотов резолвится пачкой: число запросов постоянно для любой страницы."""
+        with CaptureQueriesContext(connection) as small:
+            resp = api_client.get('/api/bazaar/')
+        assert len(resp.data['results']) == 1
+        with CaptureQueriesContext(connection) as mine_small:
+            api_client.get('/api/bazaar/my/')
+
+        ct_hook = ContentType.objects.get_for_model(Hook)
+        for i in range(20):
+            hook = Hook.objects.create(name=f'Крючок {i}', size=i, price=Decimal('1.00'))
+            MarketListing.objects.create(
+                seller=player, content_type=ct_hook, object_id=hook.pk,
+                quantity=1, price=Decimal('5.00'),
+            )
+        with CaptureQueriesContext(connection) as market:
+            resp = api_client.get('/api/bazaar/')
+        assert len(resp.data['results']) == 21
+        assert len(market) <= len(small) + 1  # +1 in_bulk на новый тип (hook)
+
+        with CaptureQueriesContext(connection) as mine:
+            resp = api_client.get('/api/bazaar/my/')
+        assert len(resp.data['results']) == 21
+        assert len(mine) <= len(mine_small) + 1
+
+
+@pytest.fixture
+def order_book(player, buyer, bait_item):
+    """Несколько лотов одного предмета от двух продавцов."""
+    ct = ContentType.objects.get_for_model(bait_item)
+    return [
+        MarketListing.objects.create(
+            seller=seller, content_type=ct, object_id=bait_item.pk,
+            quantity=qty, price=Decimal(price),
+        )
+        for seller, qty, price in [
+            (player, 5, '50.00'), (buyer, 1, '20.00'), (player, 3, '35.00'),
+            (buyer, 10, '80.00'), (player, 2, '20.00'),
+        ]
+    ]
+
+
+@pytest.mark.django_db
+class TestOrderBook:
+    def test_cheapest_first(self, api_client, order_book, bait_item):
+        resp = api_client.get(
+            f'/api/bazaar/?item_type=bait&item_id={bait_item.pk}&ordering=price',
+        )
+        assert resp.status_code == 200
+        prices = [Decimal(r['price']) for r in resp.data['results']]
+        assert prices == sorted(prices)
+        assert prices[0] == Decimal('20.00')
+
+    def test_price_and_quantity_filters(self, api_client, order_book):
+        resp = api_client.get('/api/bazaar/?min_price=30&max_price=60&min_quantity=3')
+        assert sorted(Decimal(r['price']) for r in resp.data['results']) == [
+            Decimal('35.00'), Decimal('50.00'),
+        ]
+
+    def test_seller_filter(self, api_client, order_book, buyer):
+        resp = api_client.get(f'/api/bazaar/?seller={buyer.pk}')
+        assert {r['seller_nickname'] for r in resp.data['results']} == {'Покупатель'}
+        assert len(resp.data['results']) == 2
+
+    def test_invalid_params(self, api_client, order_book):
+        assert api_client.get('/api/bazaar/?ordering=quantity').status_code == 400
+        assert api_client.get('/api/bazaar/?min_price=10&max_price=5').status_code == 400
+        assert api_client.get('/api/bazaar/?item_id=1').status_code == 400
+
+    def test_cursor_pagination_walks_all_pages(self, api_client, order_book):
+        seen = []
+        url = '/api/bazaar/?ordering=price&page_size=2'
+        while url:
+            resp = api_client.get(url)
+            assert resp.status_code == 200
+            assert 'count' not in resp.data
+            seen.extend(r['id'] for r in resp.data['results'])
+            url = resp.data['next']
+        assert len(seen) == len(set(seen)) == len(order_book)
+        by_id = {lst.pk: lst.price for lst in order_book}
+        assert [by_id[pk] for pk in seen] == sorted(by_id.values())
+
+    def test_cursor_pages_through_equal_prices(self, api_client, player, bait_item):
+        """Лоты с одной ценой не теряются и не повторяются на границах страниц — вперёд и назад."""
+        ct = ContentType.objects.get_for_model(bait_item)
+        listings = MarketListing.objects.bulk_create([
+            MarketListing(
+                seller=player, content_type=ct, object_id=bait_item.pk,
+                quantity=1, price=Decimal('10.00') if i < 9 else Decimal('15.00'),
+            )
+            for i in range(11)
+        ])
+        for ordering in ('price', '-price'):
+            pages, url = [], f'/api/bazaar/?ordering={ordering}&page_size=4'
+            while url:
+                resp = api_client.get(url)
+                pages.append([r['id'] for r in resp.data['results']])
+                last, url = resp, resp.data['next']
+            seen = [pk for page in pages for pk in page]
+            assert sorted(seen) == sorted(lst.pk for lst in listings)
+            assert len(pages) == 3
+
+            back, url = [], last.data['previous']
+            while url:
+                resp = api_client.get(url)
+                back.insert(0, [r['id'] for r in resp.data['results']])
+                url = resp.data['previous']
+            assert back == pages[:-1]
+
+    def test_invalid_cursor(self, api_client, order_book):
+        from base64 import b64encode
+        bad_price = b64encode(b'{"k":["abc",1]}').decode()
+        assert api_client.get('/api/bazaar/?cursor=bm9wZQ==').status_code == 404
+        assert api_client.get(f'/api/bazaar/?ordering=price&cursor={bad_price}').status_code == 404
+
+    def test_best_price_summary(self, api_client, order_book, bait_item, hook):
+        ct_hook = ContentType.objects.get_for_model(hook)
+        MarketListing.objects.create(
+            seller=order_book[0].seller, content_type=ct_hook, object_id=hook.pk,
+            quantity=4, price=Decimal('7.00'),
+        )
+        order_book[1].is_active = False
+        order_book[1].save()
+
+        resp = api_client.get('/api/bazaar/summary/')
+        assert resp.status_code == 200
+        rows = {r['item_type']: r for r in resp.data}
+        assert Decimal(rows['bait']['best_price']) == Decimal('20.00')
+        assert rows['bait']['listings'] == 4
+        assert rows['bait']['total_quantity'] == 20
+        assert rows['bait']['item_name'] == str(bait_item)
+        assert Decimal(rows['hook']['best_price']) == Decimal('7.00')
+
+        resp = api_client.get('/api/bazaar/summary/?item_type=hook')
+        assert [r['item_type'] for r in resp.data] == ['hook']
+
 
 @pytest.mark.django_db
 class TestMyListings:
@@ -145,6 +287,92 @@ class TestBuyListing:
         resp = buyer_client.post('/api/bazaar/9999/buy/')
         assert resp.status_code == 404
 
+    def test_second_buyer_rejected(self, buyer_client, listing, player, buyer, base):
+        user3 = User.objects.create_user(username='late', password='testpass123')
+        late = Player.objects.create(user=user3, nickname='Опоздавший', current_base=base)
+        assert buyer_client.post(f'/api/bazaar/{listing.pk}/buy/').status_code == 200
+
+        with pytest.raises(ValueError, match='неактивен'):
+            BuyListingUseCase().execute(late, listing.pk)
+        late.refresh_from_db()
+        assert late.money == Decimal('500.00')
+
+    def test_not_enough_money_keeps_listing(self, buyer_client, listing, buyer):
+        buyer.money = Decimal('10.00')
+        buyer.save(update_fields=['money'])
+        buyer_client.post(f'/api/bazaar/{listing.pk}/buy/')
+        listing.refresh_from_db()
+        assert listing.is_active
+        assert listing.buyer is None
+
+
+@pytest.mark.slow
+@pytest.mark.django_db(transaction=True)
+class TestBuyListingConcurrency:
+    """Стресс-тест: много покупателей и встречные сделки одновременно."""
+
+    THREADS = 8
+    ATTEMPTS = 120
+
+    def _run_attempt(self, buyer_id, listing_id):
+        from django.db import connection
+        try:
+            BuyListingUseCase().execute(Player.objects.get(pk=buyer_id), listing_id)
+            return True
+        except ValueError:
+            return False
+        finally:
+            connection.close()
+
+    def test_money_and_items_conserved(self, base, bait_item):
+        if connection.vendor == 'sqlite':
+            pytest.skip('SQLite не поддерживает строковые блокировки')
+
+        players = []
+        for i in range(6):
+            user = User.objects.create_user(username=f'trader{i}', password='x')
+            players.append(Player.objects.create(
+                user=user, nickname=f'Трейдер {i}', current_base=base,
+                money=Decimal('200.00'),
+            ))
+        ct = ContentType.objects.get_for_model(bait_item)
+        listings = [
+            MarketListing.objects.create(
+                seller=players[i % len(players)], content_type=ct,
+                object_id=bait_item.pk, quantity=1, price=Decimal('30.00'),
+            )
+            for i in range(30)
+        ]
+        money_before = sum(p.money for p in players)
+
+        rng = random.Random(42)
+        attempts = []
+        for _ in range(self.ATTEMPTS):
+            lst = rng.choice(listings)
+            buyer = rng.choice([p for p in players if p.pk != lst.seller_id])
+            attempts.append((buyer.pk, lst.pk))
+
+        with ThreadPoolExecutor(max_workers=self.THREADS) as pool:
+            results = list(pool.map(lambda a: self._run_attempt(*a), attempts))
+
+        sold = MarketListing.objects.filter(is_active=False)
+        assert sum(results) == sold.count()
+        assert all(lst.buyer_id is not None for lst in sold)
+
+        money_after = sum(
+            Player.objects.filter(pk__in=[p.pk for p in players]).values_list('money', flat=True)
+        )
+        assert money_after == money_before
+        assert not Player.objects.filter(money__lt=0).exists()
+
+        for p in players:
+            p.refresh_from_db()
+            spent = sum(Decimal('30.00') for lst in sold if lst.buyer_id == p.pk)
+            earned = sum(Decimal('30.00') for lst in sold if lst.seller_id == p.pk)
+            assert p.money == Decimal('200.00') - spent + earned
+            bought = InventoryItem.objects.filter(player=p, content_type=ct)
+            assert sum(i.quantity for i in bought) == sold.filter(buyer=p).count()
+
 
 @pytest.mark.django_db
 class TestCancelListing:
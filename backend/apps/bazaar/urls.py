@@ -1,6 +1,7 @@
 from django.urls import path
 
 from .views import (
+    BestPriceView,
     BuyListingView,
     CancelListingView,
     CreateListingView,
@@ -10,6 +11,7 @@ from .views import (
 
 urlpatterns = [
     path('bazaar/', MarketListView.as_view(), name='bazaar-list'),
+    path('bazaar/summary/', BestPriceView.as_view(), name='bazaar-summary'),
     path('bazaar/my/', MyListingsView.as_view(), name='bazaar-my'),
     path('bazaar/create/', CreateListingView.as_view(), name='bazaar-create'),
     path('bazaar/<int:pk>/buy/', BuyListingView.as_view(), name='bazaar-buy'),
@@ -3,9 +3,10 @@
 from dataclasses import dataclass
 
 from django.db import transaction
-
+from django.db.models import F
 from django.utils import timezone
 
+from apps.accounts.models import Player
 from apps.inventory.models import InventoryItem
 
 from ..models import MarketListing
@@ -22,52 +23,78 @@ class BuyListingResult:
     money_left: float
 
 
+def lock_players(*player_ids):
+    """
+    Блокирует строки игроков в порядке возрастания pk.
+
+    Единый порядок захвата исключает взаимоблокировки, когда два игрока
+    одновременно покупают друг у друга.
+    """
+    ids = sorted(set(player_ids))
+    list(Player.objects.select_for_update().filter(pk__in=ids).order_by('pk').values_list('pk'))
+
+
+def add_to_inventory(player_id, content_type_id, object_id, quantity):
+    """Зачисляет предметы в инвентарь через F(); строка игрока должна быть заблокирована."""
+    updated = InventoryItem.objects.filter(
+        player_id=player_id, content_type_id=content_type_id, object_id=object_id,
+    ).update(quantity=F('quantity') + quantity)
+    if not updated:
+        InventoryItem.objects.create(
+            player_id=player_id, content_type_id=content_type_id,
+            object_id=object_id, quantity=quantity,
+        )
+
+
 class BuyListingUseCase:
-    """Покупка лота: проверки, атомарная транзакция."""
+    """
+    Покупка лота под конкурентной нагрузкой.
+
+    Лот захватывается условным UPDATE ... WHERE is_active, деньги
+    переводятся через F() с условием money >= price. Порядок блокировок:
+    лот, затем игроки по возрастанию pk.
+    """
 
     def execute(self, buyer, listing_id: int) -> BuyListingResult:
         """Raises: MarketListing.DoesNotExist, ValueError."""
         try:
-            listing = MarketListing.objects.select_related('seller').get(pk=listing_id)
+            listing = MarketListing.objects.select_related('content_type').get(pk=listing_id)
         except MarketListing.DoesNotExist:
             raise MarketListing.DoesNotExist('Лот не найден.')
 
-        if not listing.is_active:
-            raise ValueError('Лот уже неактивен.')
-
         if buyer.pk == listing.seller_id:
             raise ValueError('Нельзя купить собственный лот.')
 
-        if buyer.money < listing.price:
-            raise ValueError('Недостаточно денег.')
+        if not listing.is_active:
+            raise ValueError('Лот уже неактивен.')
 
+        price = listing.price
         with transaction.atomic():
-            buyer.money -= listing.price
-            buyer.save(update_fields=['money'])
-
-            seller = listing.seller
-            seller.money += listing.price
-            seller.save(update_fields=['money'])
-
-            inv_item, created = InventoryItem.objects.get_or_create(
-                player=buyer,
-                content_type=listing.content_type,
-                object_id=listing.object_id,
-                defaults={'quantity': listing.quantity},
+            claimed = MarketListing.objects.filter(pk=listing.pk, is_active=True).update(
+                is_active=False, buyer=buyer, sold_at=timezone.now(),
             )
-            if not created:
-                inv_item.quantity += listing.quantity
-                inv_item.save(update_fields=['quantity'])
+            if not claimed:
+                raise ValueError('Лот уже неактивен.')
 
-            listing.is_active = False
-            listing.buyer = buyer
-            listing.sold_at = timezone.now()
-            listing.save(update_fields=['is_active', 'buyer', 'sold_at'])
+            lock_players(buyer.pk, listing.seller_id)
+
+            debited = Player.objects.filter(pk=buyer.pk, money__gte=price).update(
+                money=F('money') - price,
+            )
+            if not debited:
+                # Откатывает захват лота вместе с транзакцией.
+                raise ValueError('Недостаточно денег.')
+            Player.objects.filter(pk=listing.seller_id).update(money=F('money') + price)
+
+            add_to_inventory(
+                buyer.pk, listing.content_type_id, listing.object_id, listing.quantity,
+            )
+            buyer.money = Player.objects.values_list('money', flat=True).get(pk=buyer.pk)
 
         return BuyListingResult(
             listing_id=listing.pk,
             item_name=str(listing.item),
             quantity=listing.quantity,
-            price=float(listing.price),
+            price=float(price),
             money_left=float(buyer.money),
         )
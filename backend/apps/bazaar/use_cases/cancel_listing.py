@@ -2,9 +2,10 @@
 
 from dataclasses import dataclass
 
-from apps.inventory.models import InventoryItem
+from django.db import transaction
 
 from ..models import MarketListing
+from .buy_listing import add_to_inventory, lock_players
 
 
 @dataclass
@@ -29,21 +30,19 @@ class CancelListingUseCase:
         if listing.seller_id != player.pk:
             raise PermissionError('Только продавец может отменить лот.')
 
-        if not listing.is_active:
-            raise ValueError('Лот уже неактивен.')
-
-        inv_item, created = InventoryItem.objects.get_or_create(
-            player=player,
-            content_type=listing.content_type,
-            object_id=listing.object_id,
-            defaults={'quantity': listing.quantity},
-        )
-        if not created:
-            inv_item.quantity += listing.quantity
-            inv_item.save(update_fields=['quantity'])
-
-        listing.is_active = False
-        listing.save(update_fields=['is_active'])
+        with transaction.atomic():
+            # Тот же условный захват, что и при покупке: отмена и покупка
+            # одного лота не могут пройти обе.
+            claimed = MarketListing.objects.filter(pk=listing.pk, is_active=True).update(
+                is_active=False,
+            )
+            if not claimed:
+                raise ValueError('Лот уже неактивен.')
+
+            lock_players(player.pk)
+            add_to_inventory(
+                player.pk, listing.content_type_id, listing.object_id, listing.quantity,
+            )
 
         return CancelListingResult(
             listing_id=listing.pk,
@@ -1,6 +1,8 @@
 """Use case: создание лота на барахолке."""
 
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import F
 
 from apps.inventory.models import InventoryItem
 
@@ -37,16 +39,19 @@ class CreateListingUseCase:
         if inv_item.quantity < quantity:
             raise ValueError(f'Недостаточно предметов. В наличии: {inv_item.quantity}.')
 
-        inv_item.quantity -= quantity
-        if inv_item.quantity <= 0:
-            inv_item.delete()
-        else:
-            inv_item.save(update_fields=['quantity'])
-
-        return MarketListing.objects.create(
-            seller=player,
-            content_type=ct,
-            object_id=item_id,
-            quantity=quantity,
-            price=price,
-        )
+        with transaction.atomic():
+            # Условное списание: параллельные выставления не уводят остаток в минус.
+            taken = InventoryItem.objects.filter(
+                pk=inv_item.pk, quantity__gte=quantity,
+            ).update(quantity=F('quantity') - quantity)
+            if not taken:
+                raise ValueError('Недостаточно предметов.')
+            InventoryItem.objects.filter(pk=inv_item.pk, quantity__lte=0).delete()
+
+            return MarketListing.objects.create(
+                seller=player,
+                content_type=ct,
+                object_id=item_id,
+                quantity=quantity,
+                price=price,
+            )
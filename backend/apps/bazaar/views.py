@@ -1,13 +1,23 @@
 """Views барахолки (торговля между игроками)."""
 
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Min, Sum
+from django.utils.functional import cached_property
 from rest_framework import status
 from rest_framework.generics import ListAPIView
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.inventory.utils import GenericItemPrefetchMixin, resolve_generic_objects
+
 from .models import MarketListing
-from .serializers import CreateListingSerializer, MarketListingSerializer
+from .pagination import MarketCursorPagination
+from .serializers import (
+    BestPriceSerializer,
+    CreateListingSerializer,
+    MarketFilterSerializer,
+    MarketListingSerializer,
+)
 from .use_cases.buy_listing import BuyListingUseCase
 from .use_cases.cancel_listing import CancelListingUseCase
 from .use_cases.create_listing import CreateListingUseCase
@@ -19,27 +29,91 @@ def _resolve(use_case_cls):
     return container.resolve(use_case_cls)
 
 
-class MarketListView(ListAPIView):
-    """Список всех активных лотов на барахолке."""
+def _active_listings(filters):
+    """Активные лоты с фильтрами из MarketFilterSerializer; None — тип не найден."""
+    qs = MarketListing.objects.filter(is_active=True)
+    item_type = filters.get('item_type')
+    if item_type:
+        try:
+            ct = ContentType.objects.get_by_natural_key('tackle', item_type)
+        except ContentType.DoesNotExist:
+            return None
+        qs = qs.filter(content_type=ct)
+    if 'item_id' in filters:
+        qs = qs.filter(object_id=filters['item_id'])
+    if 'seller' in filters:
+        qs = qs.filter(seller_id=filters['seller'])
+    if filters.get('min_price') is not None:
+        qs = qs.filter(price__gte=filters['min_price'])
+    if filters.get('max_price') is not None:
+        qs = qs.filter(price__lte=filters['max_price'])
+    if 'min_quantity' in filters:
+        qs = qs.filter(quantity__gte=filters['min_quantity'])
+    return qs
+
+
+class MarketListView(GenericItemPrefetchMixin, ListAPIView):
+    """Стакан барахолки: активные лоты с фильтрами, сортировкой и курсором."""
 
     serializer_class = MarketListingSerializer
+    pagination_class = MarketCursorPagination
+
+    @cached_property
+    def filters(self):
+        serializer = MarketFilterSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def get_ordering(self):
+        """Порядок для курсора: price — дешёвые первыми."""
+        return MarketFilterSerializer.ORDERING_CHOICES[self.filters['ordering']]
 
     def get_queryset(self):
-        """Возвращает активные лоты с возможностью фильтрации по типу предмета."""
-        qs = MarketListing.objects.filter(is_active=True).select_related(
-            'seller', 'content_type',
-        )
-        item_type = self.request.query_params.get('item_type')
-        if item_type:
-            try:
-                ct = ContentType.objects.get(app_label='tackle', model=item_type)
-                qs = qs.filter(content_type=ct)
-            except ContentType.DoesNotExist:
-                return MarketListing.objects.none()
-        return qs
+        """Возвращает активные лоты, отфильтрованные по параметрам запроса."""
+        qs = _active_listings(self.filters)
+        if qs is None:
+            return MarketListing.objects.none()
+        return qs.select_related('seller', 'content_type')
 
 
-class MyListingsView(ListAPIView):
+class BestPriceView(APIView):
+    """Сводка стакана: лучшая цена и объём по каждому предмету."""
+
+    def get(self, request):
+        """Агрегат по активным лотам, сгруппированным по предмету."""
+        serializer = MarketFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        qs = _active_listings(serializer.validated_data)
+        if qs is None:
+            return Response([])
+
+        rows = list(
+            qs.order_by('content_type_id', 'object_id')
+            .values('content_type_id', 'object_id')
+            .annotate(
+                best_price=Min('price'),
+                listings=Count('id'),
+                total_quantity=Sum('quantity'),
+            )
+        )
+        items = resolve_generic_objects(
+            (row['content_type_id'], row['object_id']) for row in rows
+        )
+        summary = [
+            {
+                'item_type': ContentType.objects.get_for_id(row['content_type_id']).model,
+                'object_id': row['object_id'],
+                'item_name': str(items.get((row['content_type_id'], row['object_id']), '')),
+                'best_price': row['best_price'],
+                'listings': row['listings'],
+                'total_quantity': row['total_quantity'],
+            }
+            for row in rows
+        ]
+        return Response(BestPriceSerializer(summary, many=True).data)
+
+
+class MyListingsView(GenericItemPrefetchMixin, ListAPIView):
     """Список лотов текущего игрока."""
 
     serializer_class = MarketListingSerializer
@@ -48,7 +122,7 @@ class MyListingsView(ListAPIView):
         """Возвращает все лоты текущего игрока."""
         return MarketListing.objects.filter(
             seller=self.request.user.player,
-        ).select_related('seller', 'content_type')
+        ).select_related('seller', 'content_type').order_by('-created_at', '-id')
 
 
 class CreateListingView(APIView):
@@ -0,0 +1,11 @@
+"""Админка начальных данных."""
+
+from django.contrib import admin
+
+from .models import FixtureVersion
+
+
+@admin.register(FixtureVersion)
+class FixtureVersionAdmin(admin.ModelAdmin):
+    list_display = ('name', 'sha256', 'rows', 'applied_at')
+    readonly_fields = ('name', 'sha256', 'rows', 'applied_at')
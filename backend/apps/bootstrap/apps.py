@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class BootstrapConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.bootstrap'
+    verbose_name = 'Начальные данные'
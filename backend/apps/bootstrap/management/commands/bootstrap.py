@@ -0,0 +1,135 @@
+"""Начальные данные при старте контейнера: фикстуры, изображения, игровое время,
+присутствие игроков на локациях.
+
+Замена `loaddata fixtures/*.json` на каждом старте. SHA-256 каждого файла
+сверяется с FixtureVersion; неизменённые файлы не разбираются. Изменённые
+применяются одной транзакцией: bulk_create(update_conflicts=True) по
+моделям, M2M — пересборкой строк through-таблицы, затем сброс
+последовательностей pk.
+"""
+
+import glob
+import hashlib
+import os
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core import serializers
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.bootstrap.models import FixtureVersion
+from apps.world.services import OccupancyService
+from config.container import container
+
+FIXTURES_GLOB = os.path.join(settings.BASE_DIR, 'fixtures', '*.json')
+
+
+class Command(BaseCommand):
+    help = 'Идемпотентная загрузка фикстур (по хэшу файла), изображений и игрового времени'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'fixtures', nargs='*',
+            help='Файлы фикстур (по умолчанию fixtures/*.json)',
+        )
+        parser.add_argument('--force', action='store_true', help='Применить все файлы заново')
+        parser.add_argument('--skip-images', action='store_true', help='Не запускать load_images')
+        parser.add_argument('--images-dir', help='Передаётся в load_images')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        paths = options['fixtures'] or sorted(glob.glob(FIXTURES_GLOB))
+        applied = self._apply_fixtures(paths, options['force'])
+
+        if not options['skip_images']:
+            step = time.perf_counter()
+            image_opts = {'images_dir': options['images_dir']} if options['images_dir'] else {}
+            call_command('load_images', stdout=self.stdout, stderr=self.stderr, **image_opts)
+            self._timing('load_images', step)
+
+        step = time.perf_counter()
+        call_command('init_game_time', stdout=self.stdout)
+        self._timing('init_game_time', step)
+
+        step = time.perf_counter()
+        players = container.resolve(OccupancyService).reconcile()
+        self._timing('reconcile_occupancy', step, f', игроков на локациях {players}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'bootstrap: применено файлов {applied} из {len(paths)} '
+            f'за {(time.perf_counter() - started) * 1000:.0f} мс',
+        ))
+
+    def _timing(self, label, start, extra=''):
+        self.stdout.write(f'  {label}: {(time.perf_counter() - start) * 1000:.1f} мс{extra}')
+
+    # ── Фикстуры ──────────────────────────────────────────────
+
+    def _apply_fixtures(self, paths, force):
+        versions = dict(FixtureVersion.objects.values_list('name', 'sha256'))
+        changed = []
+        for path in paths:
+            if not os.path.isfile(path):
+                raise CommandError(f'Файл не найден: {path}')
+            with open(path, 'rb') as f:
+                data = f.read()
+            name = os.path.basename(path)
+            digest = hashlib.sha256(data).hexdigest()
+            if force or versions.get(name) != digest:
+                changed.append((name, data, digest))
+        if not changed:
+            return 0
+
+        with transaction.atomic():
+            for name, data, digest in changed:
+                start = time.perf_counter()
+                rows = self._upsert(data)
+                FixtureVersion.objects.update_or_create(
+                    name=name, defaults={'sha256': digest, 'rows': rows},
+                )
+                self._timing(name, start, f', объектов {rows}')
+        return len(changed)
+
+    def _upsert(self, data) -> int:
+        """Применяет один файл: upsert по моделям, M2M, сброс последовательностей."""
+        objects = defaultdict(list)
+        m2m = defaultdict(lambda: defaultdict(dict))
+        for deserialized in serializers.deserialize('json', data):
+            obj = deserialized.object
+            objects[type(obj)].append(obj)
+            for field_name, values in (deserialized.m2m_data or {}).items():
+                m2m[type(obj)][field_name][obj.pk] = values
+
+        for model, objs in objects.items():
+            update_fields = [
+                f.name for f in model._meta.concrete_fields if not f.primary_key
+            ]
+            model.objects.bulk_create(
+                objs, update_conflicts=True,
+                unique_fields=[model._meta.pk.name], update_fields=update_fields,
+            )
+            for field_name, values_by_pk in m2m[model].items():
+                self._replace_m2m(model._meta.get_field(field_name), values_by_pk)
+
+        sql = connection.ops.sequence_reset_sql(self.style, list(objects))
+        if sql:
+            with connection.cursor() as cursor:
+                for statement in sql:
+                    cursor.execute(statement)
+        return sum(len(objs) for objs in objects.values())
+
+    @staticmethod
+    def _replace_m2m(field, values_by_pk):
+        """Как obj.field.set(values): строки through для этих объектов пересоздаются."""
+        through = field.remote_field.through
+        source = f'{field.m2m_field_name()}_id'
+        target = f'{field.m2m_reverse_field_name()}_id'
+        through.objects.filter(**{f'{source}__in': list(values_by_pk)}).delete()
+        through.objects.bulk_create([
+            through(**{source: pk, target: value})
+            for pk, values in values_by_pk.items()
+            for value in values
+        ])
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FixtureVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Файл')),
+                ('sha256', models.CharField(max_length=64, verbose_name='SHA-256')),
+                ('rows', models.PositiveIntegerField(default=0, verbose_name='Объектов')),
+                ('applied_at', models.DateTimeField(auto_now=True, verbose_name='Применён')),
+            ],
+            options={
+                'verbose_name': 'Версия фикстуры',
+                'verbose_name_plural': 'Версии фикстур',
+                'ordering': ['name'],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+"""Учёт применённых файлов фикстур."""
+
+from django.db import models
+
+
+class FixtureVersion(models.Model):
+    """Версия файла фикстур, уже применённая к БД командой bootstrap."""
+
+    name = models.CharField('Файл', max_length=255, unique=True)
+    sha256 = models.CharField('SHA-256', max_length=64)
+    rows = models.PositiveIntegerField('Объектов', default=0)
+    applied_at = models.DateTimeField('Применён', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Версия фикстуры'
+        verbose_name_plural = 'Версии фикстур'
+        ordering = ['name']
+
+    def __str__(self):
+        return f'{self.name} ({self.sha256[:12]})'
@@ -0,0 +1,73 @@
+"""Тесты команды bootstrap."""
+
+import glob
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from apps.bootstrap.management.commands.bootstrap import FIXTURES_GLOB
+from apps.bootstrap.models import FixtureVersion
+from apps.tackle.models import FishSpecies, Groundbait
+
+
+def _bootstrap(*fixtures, **options):
+    out = StringIO()
+    call_command('bootstrap', *fixtures, skip_images=True, stdout=out, **options)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestBootstrap:
+    """manage.py bootstrap — фикстуры по хэшу, bulk upsert, учёт версий."""
+
+    def test_applies_all_fixtures(self):
+        out = _bootstrap()
+        files = glob.glob(FIXTURES_GLOB)
+        assert f'применено файлов {len(files)} из {len(files)}' in out
+        assert FixtureVersion.objects.count() == len(files)
+        assert FishSpecies.objects.count() == sum(
+            1 for path in files for obj in json.load(open(path))
+            if obj['model'] == 'tackle.fishspecies'
+        )
+
+    def test_m2m_loaded(self):
+        _bootstrap()
+        fixture = json.load(open(glob.glob(FIXTURES_GLOB.replace('*', 'groundbaits'))[0]))
+        for obj in fixture:
+            if obj['model'] == 'tackle.groundbait':
+                loaded = Groundbait.objects.get(pk=obj['pk'])
+                assert sorted(loaded.target_species.values_list('pk', flat=True)) == \
+                    sorted(obj['fields']['target_species'])
+
+    def test_unchanged_is_skipped(self, assert_max_queries):
+        _bootstrap()
+        with assert_max_queries(3):
+            out = _bootstrap()
+        assert 'применено файлов 0' in out
+
+    def test_changed_file_upserted(self, tmp_path):
+        _bootstrap()
+        species = FishSpecies.objects.order_by('pk').first()
+        path = tmp_path / 'fish_species.json'
+        path.write_text(json.dumps([{
+            'model': 'tackle.fishspecies', 'pk': species.pk,
+            'fields': {
+                'name_ru': 'Переименован', 'name_latin': species.name_latin,
+                'weight_min': 0.1, 'weight_max': 3.0, 'length_min': 5, 'length_max': 40,
+                'rarity': 'rare', 'sell_price_per_kg': '99.00', 'experience_per_kg': 7,
+            },
+        }]), encoding='utf-8')
+
+        out = _bootstrap(str(path))
+        assert 'применено файлов 1 из 1' in out
+        species.refresh_from_db()
+        assert species.name_ru == 'Переименован'
+        assert species.rarity == 'rare'
+        assert FixtureVersion.objects.get(name='fish_species.json').rows == 1
+
+    def test_force(self):
+        _bootstrap()
+        out = _bootstrap(force=True)
+        assert 'применено файлов 0' not in out
@@ -1,7 +1,5 @@
 """Celery-задачи кафе."""
 
-import random
-
 from celery import shared_task
 from django.utils import timezone
 from datetime import timedelta
@@ -17,7 +15,10 @@ def refresh_cafe_orders():
     """
     from apps.cafe.models import CafeOrder
     from apps.world.models import Location, LocationFish
+    from config.container import container
+    from config.rng import RandomService
 
+    rng = container.resolve(RandomService).stream('cafe')
     now = timezone.now()
 
     # Деактивируем истёкшие
@@ -66,21 +67,21 @@ def refresh_cafe_orders():
             if not available:
                 break
 
-            lf = random.choice(available)
+            lf = rng.choice(available)
             species = lf.fish
             available = [x for x in available if x.fish_id != species.pk]
 
             rarity = species.rarity
             qty_min, qty_max = qty_ranges.get(rarity, (3, 10))
-            quantity = random.randint(qty_min, qty_max)
+            quantity = rng.randint(qty_min, qty_max)
 
             # Мин. вес: 30-70% от weight_max, округлено до 100г
             weight_max_grams = int(species.weight_max * 1000)
-            min_weight = int(weight_max_grams * random.uniform(0.3, 0.7))
+            min_weight = int(weight_max_grams * rng.uniform(0.3, 0.7))
             min_weight = max(100, (min_weight // 100) * 100)
 
             # Награда: sell_price_per_kg × (min_weight/1000) × множитель(1.5-2.5)
-            multiplier = random.uniform(1.5, 2.5)
+            multiplier = rng.uniform(1.5, 2.5)
             reward = float(species.sell_price_per_kg) * (min_weight / 1000) * multiplier
             reward = round(reward, 2)
 
@@ -2,11 +2,15 @@
 
 import json
 
-from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 
+from config import metrics
+from config.db import database_sync_to_async
+from config.fastjson import FastJSONConsumerMixin
+from config.routers import EVENTUAL, read_consistency
 
-class ChatConsumer(AsyncJsonWebsocketConsumer):
+
+class ChatConsumer(FastJSONConsumerMixin, AsyncJsonWebsocketConsumer):
     """WebSocket consumer для чата локации/базы/глобального."""
 
     # Онлайн-участники по комнатам: {room_group: {channel_name: nickname}}
@@ -16,6 +20,8 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
         self.channel_type = self.scope['url_route']['kwargs'].get('channel_type', 'global')
         self.channel_id = self.scope['url_route']['kwargs'].get('channel_id', 0)
         self.room_group = f'chat_{self.channel_type}_{self.channel_id}'
+        # Метка location у ws_connections — id локации (у чатов базы и общего пустая).
+        self._location_label = str(self.channel_id) if self.channel_type == 'location' else ''
 
         user = self.scope.get('user')
         if not user or user.is_anonymous:
@@ -29,6 +35,7 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
 
         await self.channel_layer.group_add(self.room_group, self.channel_name)
         await self.accept()
+        metrics.WS_CONNECTIONS.inc(consumer='chat', location=self._location_label)
 
         # Отправить последние сообщения
         messages = await self._get_recent_messages()
@@ -49,6 +56,8 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
                 if not room:
                     self._online.pop(self.room_group, None)
             await self.channel_layer.group_discard(self.room_group, self.channel_name)
+            if hasattr(self, 'player') and self.player:
+                metrics.WS_CONNECTIONS.dec(consumer='chat', location=self._location_label)
             await self._broadcast_members()
 
     async def receive_json(self, content):
@@ -58,6 +67,7 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
 
         message = await self._save_message(text)
 
+        metrics.CHAT_FANOUT.inc(kind='message')
         await self.channel_layer.group_send(
             self.room_group,
             {
@@ -72,10 +82,15 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
     async def chat_members(self, event):
         await self.send_json({'type': 'members', 'members': event['members']})
 
+    async def location_presence(self, event):
+        """Вход/выход игрока на локации (apps.world.services.OccupancyService)."""
+        await self.send_json({'type': 'presence', 'event': event['event'], 'player': event['player']})
+
     async def _broadcast_members(self):
         """Рассылает список онлайн-участников комнаты."""
         room = self._online.get(self.room_group, {})
         members = sorted(set(room.values()))
+        metrics.CHAT_FANOUT.inc(kind='members')
         await self.channel_layer.group_send(
             self.room_group,
             {'type': 'chat.members', 'members': members},
@@ -89,6 +104,7 @@ class ChatConsumer(AsyncJsonWebsocketConsumer):
             return None
 
     @database_sync_to_async
+    @read_consistency(EVENTUAL)
     def _get_recent_messages(self):
         from .models import ChatMessage
         qs = ChatMessage.objects.filter(
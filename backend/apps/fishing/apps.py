@@ -5,3 +5,6 @@ class FishingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.fishing'
     verbose_name = 'Рыбалка'
+
+    def ready(self):
+        from . import signals  # noqa: F401 — поток RNG сессии забывается при её удалении
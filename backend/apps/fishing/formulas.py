@@ -0,0 +1,163 @@
+"""Формулы баланса рыбалки — единый источник для сервисов и симулятора.
+
+Поклёвка (BiteCalculatorService), выбор вида и вес (FishSelectorService),
+вываживание (FightEngineService) и снижение цены при продаже
+(FishPriceDynamic) считаются здесь. Функции принимают и числа, и массивы
+NumPy (симулятор simulate_balance): случайные величины передаются
+аргументами, поэтому формула не зависит от источника случайности.
+"""
+
+import math
+import numbers
+
+# === Поклёвка ===
+BASE_BITE_CHANCE = 0.05  # за тик
+MAX_BITE_CHANCE = 0.5
+DEFAULT_ACTIVITY = 0.5  # активность вида, если фаза суток не задана
+BAIT_MATCH_BITE = 1.5
+BAIT_MISS_BITE = 0.7
+LUCK_POTION_BITE = 1.3
+TROPHY_POTION_BITE = 1.1
+NIBBLE_SECONDS = (1.0, 3.0)  # поклёвка до подсечки
+
+# === Выбор вида ===
+BAIT_MATCH_WEIGHT = 2.0
+DEPTH_MATCH_WEIGHT = 1.5
+DEPTH_MISS_WEIGHT = 0.3
+GROUNDBAIT_WEIGHT = 1.8
+RARE_RARITIES = ('rare', 'trophy', 'legendary')
+WEIGHT_BETA = (2, 5)  # больше мелких, меньше крупных
+TROPHY_WEIGHT_BETA = (3, 3)  # зелье трофея — сдвиг к крупным
+
+# === Вываживание ===
+RARITY_MULT = {
+    'common': 1.0, 'uncommon': 1.2, 'rare': 1.5,
+    'trophy': 2.0, 'legendary': 3.0,
+}
+START_TENSION = 20
+START_DISTANCE = (10, 30)  # м, упрощённо от точки заброса
+DEFAULT_REEL_POWER = 2.0
+REEL_IN_PULL = (0.8, 1.8)
+REEL_IN_TENSION = (0.1, 0.5)
+PULL_ROD_PULL = (1.5, 3.0)
+PULL_ROD_TENSION = (0.2, 0.7)
+WAIT_RELIEF = 8
+JERK_CHANCE = 0.2
+JERK_DISTANCE = (0.3, 0.8)
+JERK_TENSION = (1.5, 3.5)
+TENSION_DECAY = 2
+FATIGUE = 0.97
+DEFAULT_LINE_LIMIT = 100
+
+# === Цена ===
+PRICE_DECAY_PER_KG = 0.002
+MIN_PRICE_MODIFIER = 0.50
+
+
+def _scalar(value) -> bool:
+    return isinstance(value, numbers.Real)
+
+
+def _minimum(value, bound):
+    return min(value, bound) if _scalar(value) else value.clip(max=bound)
+
+
+def _maximum(value, bound):
+    return max(value, bound) if _scalar(value) else value.clip(min=bound)
+
+
+def _log1p(value):
+    if _scalar(value):
+        return math.log1p(value)
+    import numpy
+    return numpy.log1p(value)
+
+
+def _where(condition, a, b):
+    if _scalar(condition) or isinstance(condition, bool):
+        return a if condition else b
+    import numpy
+    return numpy.where(condition, a, b)
+
+
+def bait_bite_modifier(match):
+    """Наживка, которую берут рыбы локации, — +50%, иначе −30%."""
+    return _where(match, BAIT_MATCH_BITE, BAIT_MISS_BITE)
+
+
+def depth_bite_modifier(suited_share):
+    """Доля рыб локации, обитающих на глубине наживки: 0.8 — никто, 1.2 — все."""
+    return 0.8 + 0.4 * suited_share
+
+
+def rank_bite_modifier(rank):
+    return 1.0 + _minimum(rank, 100) * 0.003  # макс +30%
+
+
+def karma_bite_modifier(karma):
+    return _where(
+        karma > 0,
+        1.0 + _minimum(karma, 1000) * 0.0002,  # макс +20%
+        _maximum(1.0 + karma * 0.0002, 0.8),
+    )
+
+
+def hunger_bite_modifier(hunger):
+    return 0.7 + (hunger / 100) * 0.3  # 0.7 при 0, 1.0 при 100
+
+
+def groundbait_bite_modifier(effectiveness):
+    return 1.0 + effectiveness * 0.05  # макс +50%
+
+
+def bite_chance(modifiers):
+    """Шанс поклёвки за тик при произведении модификаторов."""
+    return _minimum(BASE_BITE_CHANCE * modifiers, MAX_BITE_CHANCE)
+
+
+def depth_select_modifier(depth, depth_min, depth_max):
+    """Вид на своей глубине — ×1.5, иначе ×0.3."""
+    return _where(
+        (depth_min <= depth) & (depth <= depth_max), DEPTH_MATCH_WEIGHT, DEPTH_MISS_WEIGHT,
+    )
+
+
+def fish_weight(weight_min, weight_max, raw):
+    """Вес рыбы по значению бета-распределения raw из 0..1."""
+    return weight_min + (weight_max - weight_min) * raw
+
+
+def normalized_strength(fish_weight, rarity_mult):
+    """Сила рыбы 1–10: лог. шкала от веса × редкость."""
+    raw = fish_weight * rarity_mult
+    return _minimum(_maximum(1.0 + _log1p(raw) * 2.0, 1.0), 10.0)
+
+
+def pull_distance(reel_power, u):
+    """Подтяжка за действие: ~1 м (слабая катушка) .. ~2 м (сильная) при u из *_PULL."""
+    return (reel_power / 6) * u
+
+
+def action_tension(base, strength, u):
+    """Прирост натяжения за действие: base + сила × u (u из *_TENSION)."""
+    return base + strength * u
+
+
+def fish_jerk(distance, tension, strength, u_distance, u_tension):
+    """Рывок рыбы: u_distance из JERK_DISTANCE, u_tension из JERK_TENSION."""
+    return distance + u_distance + strength * 0.15, tension + u_tension + strength * 0.2
+
+
+def fish_rest(tension, strength):
+    """Естественное снижение натяжения и усталость рыбы после действия."""
+    return _maximum(tension - TENSION_DECAY, 0), _maximum(strength * FATIGUE, 1.0)
+
+
+def line_limit(breaking_strength):
+    """Порог обрыва: 5 кг леска → 100, 2 кг → 82, 8 кг → 118."""
+    return 70 + breaking_strength * 6
+
+
+def price_modifier(sold_weight):
+    """Модификатор цены при проданном за день весе (−1% за 5 кг, не ниже 50%)."""
+    return _maximum(1.0 - sold_weight * PRICE_DECAY_PER_KG, MIN_PRICE_MODIFIER)
@@ -0,0 +1,67 @@
+"""Management команда: воркер тиков рыбалки на каналы шардов."""
+
+import threading
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.fishing import shards
+from config.metrics import worker_id
+
+
+class Command(BaseCommand):
+    """
+    runworker на выбранные каналы шардов — по процессу на канал.
+
+    Каналы кольца (FISHING_SHARDS) и закреплённые (FISHING_SHARD_PINS)
+    масштабируются добавлением процессов, а не реплик одного: канал
+    занимается в кэше, и второй процесс на тот же канал не стартует.
+    """
+
+    help = 'Запускает runworker на каналы шардов рыбалки'
+
+    def add_arguments(self, parser):
+        parser.add_argument('channels', nargs='*', help='Каналы этого процесса, например fishing-0')
+        parser.add_argument('--pins-only', action='store_true', help='Только закреплённые каналы')
+        parser.add_argument('--all', action='store_true', help='Все каналы в одном процессе (разработка)')
+        parser.add_argument('--list', action='store_true', help='Только вывести каналы')
+
+    def handle(self, *args, **options):
+        known = shards.all_shards()
+        if not known:
+            raise CommandError('Шарды не заданы: FISHING_SHARDS и FISHING_SHARD_PINS пусты')
+        unknown = [c for c in options['channels'] if c not in known]
+        if unknown:
+            raise CommandError(f'Неизвестные каналы: {", ".join(unknown)}; есть: {", ".join(known)}')
+
+        if options['channels']:
+            channels = options['channels']
+        elif options['pins_only']:
+            channels = shards.pinned_shards()
+        elif options['all'] or options['list']:
+            channels = known
+        else:
+            raise CommandError('Укажите каналы, --pins-only или --all')
+        if options['list']:
+            self.stdout.write(' '.join(channels))
+            return
+        if not channels:
+            raise CommandError('Закреплённых каналов нет: FISHING_SHARD_PINS пуст')
+
+        owner = worker_id()
+        taken = shards.claim_channels(channels, owner)
+        if taken:
+            raise CommandError(f'Каналы уже обслуживает другой процесс: {", ".join(taken)}')
+        stop = threading.Event()
+        holder = threading.Thread(target=self._hold, args=(channels, owner, stop), daemon=True)
+        holder.start()
+        try:
+            call_command('runworker', *channels)
+        finally:
+            stop.set()
+            shards.release_channels(channels, owner)
+
+    @staticmethod
+    def _hold(channels, owner, stop):
+        while not stop.wait(shards.heartbeat_seconds()):
+            shards.refresh_claims(channels, owner)
@@ -0,0 +1,113 @@
+"""Management команда: офлайн-симуляция баланса по фикстурам."""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.fishing.simulation import Tackle, default_tackles, load_catalog, simulate
+
+
+class Command(BaseCommand):
+    """Монте-Карло забросов, вываживания и продаж по локациям и снастям (без БД)."""
+
+    help = 'Симуляция баланса: улов, виды, обрывы и доход в час по локациям и снастям'
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixtures', nargs='*', help='Файлы фикстур (по умолчанию fixtures/*.json)')
+        parser.add_argument('--casts', type=int, default=5000, help='Забросов на локацию и снасть')
+        parser.add_argument('--anglers', type=int, default=100, help='Рыболовов для распределения дохода')
+        parser.add_argument('--location', type=int, action='append', help='pk локации (можно несколько)')
+        parser.add_argument('--reel', type=int, help='pk катушки')
+        parser.add_argument('--line', type=int, help='pk лески')
+        parser.add_argument('--bait', type=int, action='append', help='pk наживки (можно несколько)')
+        parser.add_argument('--hour', type=int, choices=range(24), help='Игровой час (по умолчанию случайный)')
+        parser.add_argument('--depth', type=float, default=1.5, help='Глубина снасти, м')
+        parser.add_argument('--rank', type=int, default=1)
+        parser.add_argument('--karma', type=int, default=0)
+        parser.add_argument('--hunger', type=float, default=100)
+        parser.add_argument('--safety', type=float, default=0.75, help='Подматывать, пока натяжение < доли порога')
+        parser.add_argument('--seed', type=int, help='Зерно генератора')
+        parser.add_argument('--json', action='store_true', help='Вывод в JSON')
+
+    def handle(self, *args, **options):
+        try:
+            import numpy as np
+        except ImportError:
+            raise CommandError('Для симуляции нужен numpy: pip install numpy')
+
+        catalog = load_catalog(options['fixtures'])
+        locations = options['location'] or sorted(catalog.location_fish)
+        if options['reel'] or options['line'] or options['bait']:
+            tackles = [
+                Tackle(options['reel'], options['line'], bait)
+                for bait in options['bait'] or [None]
+            ]
+        else:
+            tackles = default_tackles(catalog)
+
+        rng = np.random.default_rng(options['seed'])
+        reports = []
+        for location_id in locations:
+            if location_id not in catalog.locations:
+                raise CommandError(f'Локация {location_id} не найдена в фикстурах')
+            for tackle in tackles:
+                report = simulate(
+                    catalog, location_id, tackle, casts=options['casts'], rng=rng,
+                    anglers=options['anglers'], hour=options['hour'], depth_setting=options['depth'],
+                    rank=options['rank'], karma=options['karma'], hunger=options['hunger'],
+                    safety=options['safety'],
+                )
+                if report is not None:
+                    reports.append(report)
+
+        if options['json']:
+            self.stdout.write(json.dumps([self._row(catalog, r) for r in reports], ensure_ascii=False))
+            return
+        for report in reports:
+            self._print(catalog, report)
+
+    @staticmethod
+    def _percentile(values, share):
+        return values[min(len(values) - 1, int(share * len(values)))]
+
+    @staticmethod
+    def _name(items, pk):
+        return items[pk]['name'] if pk in items else '—'
+
+    def _row(self, catalog, report) -> dict:
+        income = report.income_per_hour
+        return {
+            'location': report.location,
+            'reel': report.tackle.reel,
+            'line': report.tackle.line,
+            'bait': report.tackle.bait,
+            'casts': report.casts,
+            'bite_chance': round(report.bite_chance, 4),
+            'catch_rate': round(report.catch_rate, 4),
+            'line_break_rate': round(report.line_break_rate, 4),
+            'species_mix': {
+                catalog.species[pk]['name_ru']: share for pk, share in report.species_mix.items()
+            },
+            'income_per_hour': {
+                'mean': round(sum(income) / len(income), 2),
+                'p10': round(self._percentile(income, 0.1), 2),
+                'p50': round(self._percentile(income, 0.5), 2),
+                'p90': round(self._percentile(income, 0.9), 2),
+            },
+        }
+
+    def _print(self, catalog, report):
+        row = self._row(catalog, report)
+        income = row['income_per_hour']
+        mix = ', '.join(f'{species} {share:.0%}' for species, share in list(row['species_mix'].items())[:5])
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{catalog.locations[report.location]['name']} | {self._name(catalog.reels, report.tackle.reel)}"
+            f' | {self._name(catalog.lines, report.tackle.line)} | {self._name(catalog.baits, report.tackle.bait)}',
+        ))
+        self.stdout.write(
+            f"  поклёвка за тик {row['bite_chance']:.3f}, вытащено {row['catch_rate']:.0%}, "
+            f"обрывы {row['line_break_rate']:.0%}\n"
+            f'  виды: {mix or "—"}\n'
+            f"  доход в час: среднее {income['mean']:.0f}, p10 {income['p10']:.0f}, "
+            f"p50 {income['p50']:.0f}, p90 {income['p90']:.0f}",
+        )
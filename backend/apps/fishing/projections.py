@@ -0,0 +1,140 @@
+"""Лёгкие проекции состояния рыбалки для тика WebSocket.
+
+FishingSessionSerializer и FightStateSerializer остаются для REST API;
+тик FishingConsumer собирает те же поля напрямую: атрибуты читаются
+один раз в __slots__-датаклассы, в dict они превращаются через заранее
+собранный attrgetter. Формат вывода совпадает с сериализаторами.
+"""
+
+from dataclasses import dataclass, fields
+from operator import attrgetter
+
+from django.utils import timezone
+
+from apps.tackle.images import thumbnail_urls
+
+
+def _iso(value):
+    """datetime как у DRF DateTimeField: в текущей TZ, UTC — с суффиксом Z."""
+    if not value:
+        return None
+    value = timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def _float(value):
+    return None if value is None else float(value)
+
+
+class _Projection:
+    """Общее для проекций: to_dict/to_tuple по заранее собранным аксессорам."""
+
+    __slots__ = ()
+
+    @classmethod
+    def _compile(cls):
+        names = tuple(f.name for f in fields(cls))
+        cls._names = names
+        cls._getter = attrgetter(*names)
+        return cls
+
+    def to_tuple(self) -> tuple:
+        return self._getter(self)
+
+    def to_dict(self) -> dict:
+        return dict(zip(self._names, self._getter(self)))
+
+
+@dataclass(slots=True)
+class SessionProjection(_Projection):
+    """Поля FishingSessionSerializer."""
+
+    id: int
+    state: str
+    slot: int
+    location: int
+    location_name: str
+    rod_id: int
+    rod_name: str
+    rod_class: str
+    cast_x: float
+    cast_y: float
+    cast_time: str | None
+    bite_time: str | None
+    hooked_species_name: str | None
+    hooked_weight: float | None
+    hooked_length: float | None
+    hooked_rarity: str | None
+    hooked_species_image: str | None
+    hooked_species_thumbs: dict | None
+
+    @classmethod
+    def from_session(cls, session):
+        rod = session.rod
+        rod_type = rod.rod_type
+        species = session.hooked_species
+        return cls(
+            session.pk,
+            session.state,
+            session.slot,
+            session.location_id,
+            session.location.name,
+            rod.pk,
+            rod.custom_name or rod_type.name,
+            rod_type.rod_class,
+            float(session.cast_x),
+            float(session.cast_y),
+            _iso(session.cast_time),
+            _iso(session.bite_time),
+            species.name_ru if species else None,
+            _float(session.hooked_weight),
+            _float(session.hooked_length),
+            species.rarity if species else None,
+            species.image.url if species and species.image else None,
+            thumbnail_urls(species.image) if species else None,
+        )
+
+
+@dataclass(slots=True)
+class FightProjection(_Projection):
+    """Поля FightStateSerializer."""
+
+    session_id: int
+    line_tension: float
+    distance: float
+    rod_durability: float
+    fish_strength: float
+
+    @classmethod
+    def from_fight(cls, fight):
+        return cls(
+            fight.session_id,
+            float(fight.line_tension),
+            float(fight.distance),
+            float(fight.rod_durability),
+            float(fight.fish_strength),
+        )
+
+
+SessionProjection._compile()
+FightProjection._compile()
+
+
+def game_time_dict(gt):
+    if gt is None:
+        return None
+    return {'hour': gt.current_hour, 'day': gt.current_day, 'time_of_day': gt.time_of_day}
+
+
+def state_payload(sessions, fights, game_time) -> dict:
+    """Кадр state: сессии, fights по str(session_id) и игровое время."""
+    return {
+        'sessions': [SessionProjection.from_session(s).to_dict() for s in sessions],
+        'fights': {
+            str(sid): FightProjection.from_fight(fight).to_dict()
+            for sid, fight in fights.items()
+        },
+        'game_time': game_time_dict(game_time),
+    }
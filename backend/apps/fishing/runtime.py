@@ -0,0 +1,479 @@
+"""Игровая логика рыбалки одного игрока: действия, тик, снимок состояния.
+
+Не зависит от транспорта: сообщения уходят в корутину send(payload).
+FishingConsumer использует PlayerRuntime напрямую, воркер шарда
+(apps.fishing.shards) — для игроков, чьи локации ему назначены.
+"""
+
+import asyncio
+import logging
+import time
+
+from apps.fishing.ticks import IDLE, TickInterval, get_limiter, tick_priority
+from config import metrics
+from config.db import database_sync_to_async
+from config.querybudget import instrumented
+
+logger = logging.getLogger(__name__)
+
+
+def _resolve(use_case_cls):
+    """Резолвит use case из DI-контейнера."""
+    from config.container import container
+    return container.resolve(use_case_cls)
+
+
+class PlayerRuntime:
+    """Состояние рыбалки игрока с серверным tick loop."""
+
+    def __init__(self, player, send):
+        self.player = player
+        self.send = send
+        self._tick_task = None
+        self._tick = None
+        self._interval = TickInterval()
+        self._priority = IDLE
+        # Действия одного игрока выполняются строго по очереди (Lock — FIFO).
+        self._lock = asyncio.Lock()
+        self._handlers = {
+            'cast': self._handle_cast,
+            'strike': self._handle_strike,
+            'reel_in': self._handle_reel_in,
+            'pull': self._handle_pull,
+            'keep': self._handle_keep,
+            'release': self._handle_release,
+            'retrieve': self._handle_retrieve,
+            'change_bait': self._handle_change_bait,
+            'groundbait': self._handle_groundbait,
+        }
+
+    async def start(self):
+        """Отправляет начальный state и запускает tick loop."""
+        await self.send_state()
+        self._tick_task = asyncio.create_task(self._tick_loop())
+
+    def stop(self):
+        if self._tick_task is not None:
+            self._tick_task.cancel()
+            self._tick_task = None
+
+    async def send_state(self):
+        state = await self._get_state_snapshot()
+        self._priority = tick_priority(state['sessions'])
+        await self.send({'type': 'state', **state})
+
+    async def handle(self, content):
+        """Выполняет действие игрока {'action': ..., ...}."""
+        action = content.get('action')
+        handler = self._handlers.get(action)
+        if not handler:
+            await self.send({'type': 'error', 'message': f'Неизвестное действие: {action}'})
+            return
+        metrics.FISHING_ACTIONS.inc(action=action)
+
+        async with self._lock:
+            try:
+                await handler(content)
+            except Exception as e:
+                logger.exception('Ошибка обработки действия %s', action)
+                await self.send({'type': 'error', 'message': str(e)})
+
+    # --- Tick loop ---
+
+    async def _tick_loop(self):
+        """Серверный тик — проверяет поклёвки и прогресс проводки.
+
+        Тик не накладывается на незавершённый предыдущий, ждёт слота
+        TickLimiter по приоритету игрока, интервал растягивается под нагрузкой.
+        """
+        try:
+            while True:
+                await asyncio.sleep(self._interval.current)
+                if self._tick is not None and not self._tick.done():
+                    metrics.FISHING_TICKS_SKIPPED.inc(reason='busy')
+                    self._interval.stretch()
+                    continue
+                if self._interval.stretched:
+                    metrics.FISHING_TICKS_DELAYED.inc(reason='stretched')
+                self._tick = asyncio.create_task(self._run_tick())
+        except asyncio.CancelledError:
+            if self._tick is not None:
+                self._tick.cancel()
+
+    async def _run_tick(self):
+        limiter = get_limiter()
+        queued = limiter.saturated
+        if not await limiter.acquire(self._priority, timeout=self._interval.current):
+            metrics.FISHING_TICKS_SKIPPED.inc(reason='overload')
+            self._interval.stretch()
+            return
+        if queued:
+            metrics.FISHING_TICKS_DELAYED.inc(reason='queued')
+
+        started = time.perf_counter()
+        try:
+            # Тик идёт в общем пуле потоков (config.db), поэтому с действиями
+            # игрока он сериализуется тем же замком, что и они сами.
+            async with self._lock:
+                with metrics.FISHING_TICK_DURATION.time():
+                    result = await self._do_tick()
+            metrics.FISHING_TICKS.inc()
+        except Exception:
+            logger.exception('Ошибка тика рыбалки игрока %s', self.player.pk)
+            self._interval.stretch()
+            return
+        finally:
+            saturated = limiter.saturated
+            limiter.release()
+
+        self._interval.observe(time.perf_counter() - started, saturated)
+        self._priority = tick_priority(result['sessions'])
+        await self.send(result)
+
+    @database_sync_to_async
+    @instrumented('ws.tick')
+    def _do_tick(self):
+        """Выполняет логику тика (аналог FishingStatusUseCase.execute)."""
+        from apps.fishing.projections import state_payload
+        from apps.fishing.use_cases.status import FishingStatusUseCase
+
+        self.player.refresh_from_db()
+        uc = _resolve(FishingStatusUseCase)
+        result = uc.execute(self.player)
+
+        # Определяем новые поклёвки и подёргивания
+        bite_sessions = [s for s in result.sessions if s.state == 'bite']
+        nibble_sessions = [s for s in result.sessions if s.state == 'nibble']
+
+        response = {'type': 'state', **state_payload(result.sessions, result.fights, result.game_time)}
+
+        if bite_sessions:
+            response['bites'] = [s.pk for s in bite_sessions]
+            metrics.FISHING_BITES.inc(len(bite_sessions), state='bite')
+        if nibble_sessions:
+            response['nibbles'] = [s.pk for s in nibble_sessions]
+            metrics.FISHING_BITES.inc(len(nibble_sessions), state='nibble')
+
+        return response
+
+    # --- Обработчики действий ---
+
+    async def _handle_cast(self, content):
+        rod_id = content.get('rod_id')
+        point_x = content.get('point_x')
+        point_y = content.get('point_y')
+
+        if not all([rod_id, point_x is not None, point_y is not None]):
+            await self.send({'type': 'error', 'message': 'Укажите rod_id, point_x, point_y.'})
+            return
+
+        result = await self._do_cast(rod_id, point_x, point_y)
+        await self.send(result)
+
+        if result['type'] != 'error':
+            await self.send_state()
+
+    @database_sync_to_async
+    @instrumented('ws.cast')
+    def _do_cast(self, rod_id, point_x, point_y):
+        from apps.fishing.use_cases.cast import CastUseCase
+        from apps.inventory.models import PlayerRod
+
+        self.player.refresh_from_db()
+        uc = _resolve(CastUseCase)
+        try:
+            result = uc.execute(self.player, rod_id, point_x, point_y)
+            return {
+                'type': 'cast_ok',
+                'session_id': result.session_id,
+                'slot': result.slot,
+            }
+        except PlayerRod.DoesNotExist:
+            return {'type': 'error', 'message': 'Снасть не найдена.'}
+        except ValueError as e:
+            return {'type': 'error', 'message': str(e)}
+
+    async def _handle_strike(self, content):
+        session_id = content.get('session_id')
+        if not session_id:
+            await self.send({'type': 'error', 'message': 'Укажите session_id.'})
+            return
+
+        result = await self._do_strike(session_id)
+        await self.send(result)
+
+        if result['type'] != 'error':
+            await self.send_state()
+
+    @database_sync_to_async
+    @instrumented('ws.strike')
+    def _do_strike(self, session_id):
+        from apps.fishing.use_cases.strike import StrikeUseCase
+        from apps.fishing.models import FishingSession
+
+        self.player.refresh_from_db()
+        uc = _resolve(StrikeUseCase)
+        try:
+            result = uc.execute(self.player, session_id)
+            return {
+                'type': 'strike_ok',
+                'session_id': result.session_id,
+                'fish': result.fish_name,
+                'species_id': result.species_id,
+                'species_image': result.species_image,
+                'tension': result.tension,
+                'distance': result.distance,
+            }
+        except FishingSession.DoesNotExist:
+            return {'type': 'error', 'message': 'Сессия не найдена.'}
+        except ValueError as e:
+            return {'type': 'error', 'message': str(e)}
+
+    async def _handle_reel_in(self, content):
+        await self._handle_fight_action(content, 'reel_in')
+
+    async def _handle_pull(self, content):
+        await self._handle_fight_action(content, 'pull')
+
+    async def _handle_fight_action(self, content, action):
+        session_id = content.get('session_id')
+        if not session_id:
+            await self.send({'type': 'error', 'message': 'Укажите session_id.'})
+            return
+
+        result = await self._do_fight_action(session_id, action)
+        await self.send(result)
+
+        if result['type'] != 'error':
+            await self.send_state()
+
+    @database_sync_to_async
+    @instrumented('ws.fight')
+    def _do_fight_action(self, session_id, action):
+        from apps.fishing.use_cases.fight import PullRodUseCase, ReelInUseCase
+        from apps.fishing.models import FishingSession
+
+        self.player.refresh_from_db()
+        uc_cls = ReelInUseCase if action == 'reel_in' else PullRodUseCase
+        uc = _resolve(uc_cls)
+        try:
+            result = uc.execute(self.player, session_id)
+
+            if result.result == 'caught':
+                return {
+                    'type': 'fight_result',
+                    'result': 'caught',
+                    'session_id': result.session_id,
+                    'fish': result.fish_name,
+                    'species_id': result.species_id,
+                    'species_image': result.species_image,
+                    'weight': result.weight,
+                    'length': result.length,
+                    'rarity': result.rarity,
+                }
+            elif result.result in ('line_break', 'rod_break'):
+                return {
+                    'type': 'fight_result',
+                    'result': result.result,
+                    'session_id': session_id,
+                }
+            else:
+                return {
+                    'type': 'fight_result',
+                    'result': 'fighting',
+                    'session_id': result.session_id,
+                    'tension': result.tension,
+                    'distance': result.distance,
+                    'rod_durability': result.rod_durability,
+                }
+        except FishingSession.DoesNotExist:
+            return {'type': 'error', 'message': 'Сессия не найдена.'}
+        except ValueError as e:
+            return {'type': 'error', 'message': str(e)}
+
+    async def _handle_keep(self, content):
+        session_id = content.get('session_id')
+        if not session_id:
+            await self.send({'type': 'error', 'message': 'Укажите session_id.'})
+            return
+
+        result = await self._do_keep(session_id)
+        await self.send(result)
+
+        if result['type'] != 'error':
+            await self.send_state()
+
+    @database_sync_to_async
+    @instrumented('ws.keep')
+    def _do_keep(self, session_id):
+        from apps.fishing.use_cases.keep_fish import KeepFishUseCase
+        from apps.fishing.models import FishingSession
+
+        self.player.refresh_from_db()
+        uc = _resolve(KeepFishUseCase)
+        try:
+            result = uc.execute(self.player, session_id)
+            return {
+                'type': 'keep_result',
+                **result.caught_fish_data,
+            }
+        except FishingSession.DoesNotExist:
+            return {'type': 'error', 'message': 'Сессия не найдена.'}
+        except ValueError as e:
+            return {'type': 'error', 'message': str(e)}
+
+    async def _handle_release(self, content):
+        session_id = content.get('session_id')
+        if not session_id:
+            await self.send({'type': 'error', 'message': 'Укажите session_id.'})
+            return
+
+        result = await self._do_release(session_id)
+        await self.send(result)
+
+        if result['type'] != 'error':
+            await self.send_state()
+
+    @database_sync_to_async
+    @instrumented('ws.release')
+    def _do_release(self, session_id):
+        from apps.fishing.use_cases.release_fish import ReleaseFishUseCase
+        from apps.fishing.models import FishingSession
+
+        self.player.refresh_from_db()
+        uc = _resolve(ReleaseFishUseCase)
+        try:
+            result = uc.execute(self.player, session_id)
+            return {
+                'type': 'release_result',
+                'karma_bonus': result.karma_bonus,
+                'karma_total': result.karma_total,
+            }
+        except FishingSession.DoesNotExist:
+            return {'type': 'error', 'message': 'Сессия не найдена.'}
+        except ValueError as e:
+            return {'type': 'error', 'message': str(e)}
+
+    async def _handle_retrieve(self, content):
+        session_id = content.get('session_id')
+        if not session_id:
+            await self.send({'type': 'error', 'message': 'Укажите session_id.'})
+            return
+
+        result = await self._do_retrieve(session_id)
+        await self.send(result)
+
+        if result['type'] != 'error':
+            await self.send_state()
+
+    @database_sync_to_async
+    @instrumented('ws.retrieve')
+    def _do_retrieve(self, session_id):
+        from apps.fishing.use_cases.retrieve import RetrieveRodUseCase
+        from apps.fishing.models import FishingSession
+
+        self.player.refresh_from_db()
+        uc = _resolve(RetrieveRodUseCase)
+        try:
+            uc.execute(self.player, session_id)
+            return {'type': 'retrieve_ok', 'session_id': session_id}
+        except FishingSession.DoesNotExist:
+            return {'type': 'error', 'message': 'Сессия не найдена.'}
+        except ValueError as e:
+            return {'type': 'error', 'message': str(e)}
+
+    async def _handle_change_bait(self, content):
+        session_id = content.get('session_id')
+        bait_id = content.get('bait_id')
+
+        if not session_id or not bait_id:
+            await self.send({'type': 'error', 'message': 'Укажите session_id и bait_id.'})
+            return
+
+        result = await self._do_change_bait(session_id, bait_id)
+        await self.send(result)
+
+        if result['type'] != 'error':
+            await self.send_state()
+
+    @database_sync_to_async
+    @instrumented('ws.change_bait')
+    def _do_change_bait(self, session_id, bait_id):
+        from apps.fishing.use_cases.change_bait import ChangeBaitUseCase
+        from apps.fishing.models import FishingSession
+        from apps.tackle.models import Bait
+
+        self.player.refresh_from_db()
+        uc = _resolve(ChangeBaitUseCase)
+        try:
+            result = uc.execute(self.player, session_id, bait_id)
+            return {
+                'type': 'change_bait_ok',
+                'session_id': result.session_id,
+                'new_bait': result.new_bait_name,
+                'bait_remaining': result.bait_remaining,
+            }
+        except (FishingSession.DoesNotExist, Bait.DoesNotExist):
+            return {'type': 'error', 'message': 'Сессия или наживка не найдена.'}
+        except ValueError as e:
+            return {'type': 'error', 'message': str(e)}
+
+    async def _handle_groundbait(self, content):
+        groundbait_id = content.get('groundbait_id')
+        flavoring_id = content.get('flavoring_id')
+
+        if not groundbait_id:
+            await self.send({'type': 'error', 'message': 'Укажите groundbait_id.'})
+            return
+
+        result = await self._do_groundbait(groundbait_id, flavoring_id)
+        await self.send(result)
+
+    @database_sync_to_async
+    @instrumented('ws.groundbait')
+    def _do_groundbait(self, groundbait_id, flavoring_id):
+        from apps.fishing.use_cases.groundbait import ApplyGroundbaitUseCase
+        from apps.tackle.models import Flavoring, Groundbait
+
+        self.player.refresh_from_db()
+        uc = _resolve(ApplyGroundbaitUseCase)
+        try:
+            result = uc.execute(self.player, groundbait_id, flavoring_id)
+            return {
+                'type': 'groundbait_ok',
+                'message': result.message,
+                'duration_hours': result.duration_hours,
+                'flavoring': result.flavoring_name,
+            }
+        except (Groundbait.DoesNotExist, Flavoring.DoesNotExist) as e:
+            return {'type': 'error', 'message': str(e)}
+        except ValueError as e:
+            return {'type': 'error', 'message': str(e)}
+
+    # --- Хелперы ---
+
+    @database_sync_to_async
+    @instrumented('ws.state')
+    def _get_state_snapshot(self):
+        """Сериализует текущее состояние всех сессий игрока."""
+        from apps.fishing.use_cases.status import SELECT_RELATED
+        from apps.fishing.models import FightState, FishingSession, GameTime
+        from apps.fishing.projections import state_payload
+
+        self.player.refresh_from_db()
+        sessions = list(
+            FishingSession.objects.filter(player=self.player)
+            .select_related(*SELECT_RELATED)
+            .order_by('slot')
+        )
+
+        fights = {}
+        for session in sessions:
+            if session.state == FishingSession.State.FIGHTING:
+                try:
+                    fights[session.pk] = session.fight
+                except FightState.DoesNotExist:
+                    pass
+
+        return state_payload(sessions, fights, GameTime.get_instance())
+
@@ -2,6 +2,8 @@
 
 from rest_framework import serializers
 
+from apps.tackle.serializers import ThumbnailsField
+
 from .models import FightState, FishingSession
 
 
@@ -31,6 +33,7 @@ class FishingSessionSerializer(serializers.ModelSerializer):
     hooked_species_name = serializers.CharField(source='hooked_species.name_ru', read_only=True, default=None)
     hooked_rarity = serializers.CharField(source='hooked_species.rarity', read_only=True, default=None)
     hooked_species_image = serializers.SerializerMethodField()
+    hooked_species_thumbs = ThumbnailsField(source='hooked_species.image')
 
     def get_hooked_species_image(self, obj):
         if obj.hooked_species and obj.hooked_species.image:
@@ -47,7 +50,7 @@ class FishingSessionSerializer(serializers.ModelSerializer):
             'rod_id', 'rod_name', 'rod_class',
             'cast_x', 'cast_y', 'cast_time', 'bite_time',
             'hooked_species_name', 'hooked_weight', 'hooked_length',
-            'hooked_rarity', 'hooked_species_image',
+            'hooked_rarity', 'hooked_species_image', 'hooked_species_thumbs',
         ]
 
 
@@ -1,19 +1,24 @@
 """Расчёт вероятности поклёвки."""
 
-import random
-
+from apps.fishing import formulas
 from apps.fishing.services.time_service import TimeService
 from apps.home.services import MoonshineService
 from apps.potions.services import PotionService
+from apps.world.depth import bait_depth
+from config.rng import RandomService
 
 
 class BiteCalculatorService:
     """Сервис расчёта шанса поклёвки с модификаторами."""
 
-    def __init__(self, time_service: TimeService, potion_service: PotionService, moonshine_service: MoonshineService):
+    def __init__(
+        self, time_service: TimeService, potion_service: PotionService,
+        moonshine_service: MoonshineService, rng: RandomService = None,
+    ):
         self._time = time_service
         self._potions = potion_service
         self._moonshine = moonshine_service
+        self._rng = rng or RandomService()
 
     def calculate_bite_chance(self, player, location, rod_setup, session=None):
         """
@@ -21,8 +26,6 @@ class BiteCalculatorService:
 
         Возвращает: float (0.0 - 1.0) — вероятность поклёвки.
         """
-        base_chance = 0.05  # 5% базовый шанс за тик
-
         modifiers = 1.0
 
         # Модификатор времени суток (средний по рыбам локации)
@@ -32,39 +35,42 @@ class BiteCalculatorService:
             tod_values = []
             for lf in location_fish:
                 active_time = lf.fish.active_time or {}
-                tod_values.append(active_time.get(tod, 0.5))
+                tod_values.append(active_time.get(tod, formulas.DEFAULT_ACTIVITY))
             modifiers *= sum(tod_values) / len(tod_values)
 
+            # Модификатор глубины в точке заброса: доля рыб локации,
+            # обитающих на глубине наживки
+            if session is not None:
+                depth = bait_depth(session)
+                suited = sum(
+                    1 for lf in location_fish
+                    if lf.fish.preferred_depth_min <= depth <= lf.fish.preferred_depth_max
+                )
+                modifiers *= formulas.depth_bite_modifier(suited / len(location_fish))
+
         # Модификатор наживки/приманки
         bait_match = False
         if rod_setup.bait:
             bait_match = rod_setup.bait.target_species.filter(
                 location_fish__location=location,
             ).exists()
-        modifiers *= 1.5 if bait_match else 0.7
+        modifiers *= formulas.bait_bite_modifier(bait_match)
 
         # Модификатор разряда игрока
-        rank_mod = 1.0 + min(player.rank, 100) * 0.003  # макс +30%
-        modifiers *= rank_mod
+        modifiers *= formulas.rank_bite_modifier(player.rank)
 
         # Модификатор кармы
-        if player.karma > 0:
-            karma_mod = 1.0 + min(player.karma, 1000) * 0.0002  # макс +20%
-        else:
-            karma_mod = max(0.8, 1.0 + player.karma * 0.0002)
-        modifiers *= karma_mod
+        modifiers *= formulas.karma_bite_modifier(player.karma)
 
-        # Модификатор голода
-        hunger_mod = 0.7 + (player.hunger / 100) * 0.3  # 0.7 при 0, 1.0 при 100
-        modifiers *= hunger_mod
+        # Модификатор голода (сытость считается на текущий момент, без записи)
+        modifiers *= formulas.hunger_bite_modifier(player.hunger)
 
         # Модификатор прикормки
         from apps.fishing.models import GroundbaitSpot
         active_spots = GroundbaitSpot.objects.filter(player=player, location=location)
         for spot in active_spots:
             if spot.is_active():
-                groundbait_mod = 1.0 + spot.groundbait.effectiveness * 0.05  # макс +50%
-                modifiers *= groundbait_mod
+                modifiers *= formulas.groundbait_bite_modifier(spot.groundbait.effectiveness)
                 if spot.flavoring:
                     modifiers *= spot.flavoring.bonus_multiplier
                 break  # Только один прикорм за раз
@@ -72,21 +78,22 @@ class BiteCalculatorService:
         # Модификатор зелья удачи
         luck_val = self._potions.get_potion_effect_value(player, 'luck')
         if luck_val:
-            modifiers *= 1.3  # +30% шанс поклёвки с зельем удачи
+            modifiers *= formulas.LUCK_POTION_BITE
 
         # Модификатор зелья трофея (привлекает крупную рыбу, немного повышает шанс)
         trophy_val = self._potions.get_potion_effect_value(player, 'trophy')
         if trophy_val:
-            modifiers *= 1.1
+            modifiers *= formulas.TROPHY_POTION_BITE
 
         # Модификатор самогона (bite_boost)
         bite_val = self._moonshine.get_buff_effect_value(player, 'bite_boost')
         if bite_val:
             modifiers *= (1.0 + bite_val)
 
-        return min(base_chance * modifiers, 0.5)  # Не более 50% за тик
+        return formulas.bite_chance(modifiers)
 
     def try_bite(self, player, location, rod_setup, session=None):
         """Попытка поклёвки. Возвращает True, если поклёвка произошла."""
         chance = self.calculate_bite_chance(player, location, rod_setup, session)
-        return random.random() < chance
+        stream = self._rng.stream_for(session, player.pk)
+        return stream.random() < chance
@@ -1,27 +1,35 @@
 """Выбор вида рыбы при поклёвке (weighted random)."""
 
-import random
-
+from apps.fishing import formulas
 from apps.fishing.services.time_service import TimeService
 from apps.home.services import MoonshineService
 from apps.potions.services import PotionService
+from apps.world.depth import bait_depth
+from config.rng import RandomService
 
 
 class FishSelectorService:
     """Сервис выбора рыбы при поклёвке."""
 
-    def __init__(self, time_service: TimeService, potion_service: PotionService, moonshine_service: MoonshineService):
+    def __init__(
+        self, time_service: TimeService, potion_service: PotionService,
+        moonshine_service: MoonshineService, rng: RandomService = None,
+    ):
         self._time = time_service
         self._potions = potion_service
         self._moonshine = moonshine_service
+        self._rng = rng or RandomService()
 
-    def select_fish(self, location, rod_setup):
+    def select_fish(self, location, rod_setup, session=None):
         """
         Выбирает вид рыбы для поклёвки на основе весов.
 
         Учитывает: spawn_weight локации, совместимость наживки/приманки,
-        время суток, глубину.
+        время суток, глубину (с сессией — глубину наживки в точке заброса
+        по растру глубин локации, иначе — настройку снасти).
         """
+        depth = bait_depth(session) if session is not None else rod_setup.depth_setting
+
         location_fish = location.location_fish.select_related('fish').all()
         if not location_fish:
             return None
@@ -50,18 +58,16 @@ class FishSelectorService:
 
             # Модификатор наживки
             if rod_setup.bait and rod_setup.bait.target_species.filter(pk=fish.pk).exists():
-                weight *= 2.0
+                weight *= formulas.BAIT_MATCH_WEIGHT
 
             # Модификатор глубины
-            depth = rod_setup.depth_setting
-            if fish.preferred_depth_min <= depth <= fish.preferred_depth_max:
-                weight *= 1.5
-            else:
-                weight *= 0.3
+            weight *= formulas.depth_select_modifier(
+                depth, fish.preferred_depth_min, fish.preferred_depth_max,
+            )
 
             # Модификатор прикормки (целевые виды)
             if fish.pk in groundbait_species_ids:
-                weight *= 1.8
+                weight *= formulas.GROUNDBAIT_WEIGHT
 
             if weight > 0:
                 candidates.append(lf)
@@ -74,42 +80,40 @@ class FishSelectorService:
         rarity_val = self._potions.get_potion_effect_value(rod_setup.player, 'rarity')
         if rarity_val:
             for i, lf in enumerate(candidates):
-                if lf.fish.rarity in ('rare', 'trophy', 'legendary'):
+                if lf.fish.rarity in formulas.RARE_RARITIES:
                     weights[i] *= rarity_val
 
         # Модификатор самогона (luck — редкие рыбы)
         luck_val = self._moonshine.get_buff_effect_value(rod_setup.player, 'luck')
         if luck_val:
             for i, lf in enumerate(candidates):
-                if lf.fish.rarity in ('rare', 'trophy', 'legendary'):
+                if lf.fish.rarity in formulas.RARE_RARITIES:
                     weights[i] *= (1.0 + luck_val)
 
-        selected = random.choices(candidates, weights=weights, k=1)[0]
+        stream = self._rng.stream_for(session, rod_setup.player_id)
+        selected = stream.choices(candidates, weights=weights, k=1)[0]
         return selected.fish
 
-    def generate_fish_weight(self, species, player=None):
+    def generate_fish_weight(self, species, player=None, session=None):
         """
         Генерирует вес рыбы в пределах диапазона вида.
         Распределение: больше мелких, меньше крупных (бета-распределение).
         Зелье трофея сдвигает распределение в сторону крупных экземпляров.
         """
-        min_w = species.weight_min
-        max_w = species.weight_max
-
-        alpha, beta_param = 2, 5
+        alpha, beta_param = formulas.WEIGHT_BETA
         if player:
             trophy_val = self._potions.get_potion_effect_value(player, 'trophy')
             if trophy_val:
-                alpha = 3
-                beta_param = 3  # Сдвиг к крупным экземплярам
+                alpha, beta_param = formulas.TROPHY_WEIGHT_BETA
 
-        raw = random.betavariate(alpha, beta_param)
-        weight = min_w + (max_w - min_w) * raw
+        stream = self._rng.stream_for(session, player.pk if player else None)
+        raw = stream.betavariate(alpha, beta_param)
+        weight = formulas.fish_weight(species.weight_min, species.weight_max, raw)
         return round(weight, 3)
 
-    def generate_fish_length(self, species, weight):
+    def generate_fish_length(self, species, weight, session=None):
         """Генерирует длину рыбы пропорционально весу."""
         weight_ratio = (weight - species.weight_min) / max(species.weight_max - species.weight_min, 0.01)
         length = species.length_min + (species.length_max - species.length_min) * weight_ratio
-        length *= random.uniform(0.9, 1.1)
+        length *= self._rng.stream_for(session).uniform(0.9, 1.1)
         return round(max(species.length_min, min(species.length_max, length)), 1)
@@ -1,5 +1,6 @@
 """Сервис игрового времени."""
 
+from apps.fishing import formulas
 from apps.fishing.models import GameTime
 
 
@@ -18,4 +19,4 @@ class TimeService:
         """Модификатор клёва по времени суток для конкретного вида рыбы."""
         tod = self.get_time_of_day()
         active_time = fish_species.active_time or {}
-        return active_time.get(tod, 0.5)
+        return active_time.get(tod, formulas.DEFAULT_ACTIVITY)
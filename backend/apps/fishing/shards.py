@@ -0,0 +1,273 @@
+"""Шардирование тиков рыбалки по воркерам через channel layer.
+
+Локация (или база) игрока отображается на канал воркера кольцом
+консистентного хэширования по settings.FISHING_SHARDS; горячие локации
+закрепляются за отдельными каналами через FISHING_SHARD_PINS. При
+добавлении воркера переезжает примерно 1/N локаций.
+
+FishingConsumer в этом режиме — шлюз: пересылает действия воркеру
+(shard.join / shard.action / shard.leave) и отдаёт клиенту его ответы
+(shard.state). Воркер держит PlayerRuntime каждого игрока со своим tick
+loop. Запуск: отдельный процесс на канал — ``python manage.py
+run_fishing_shards fishing-0`` (канал занимается в кэше, второй процесс на
+тот же канал не стартует), либо FISHING_SHARDS_EMBEDDED=True — воркеры в
+процессе daphne (InMemoryChannelLayer).
+
+Пустой FISHING_SHARDS — прежний режим, тики в процессе сокета.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from bisect import bisect
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from channels.consumer import AsyncConsumer
+from channels.exceptions import ChannelFull
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.fishing.runtime import PlayerRuntime
+from config import metrics
+from config.db import database_sync_to_async
+
+logger = logging.getLogger(__name__)
+
+RING_REPLICAS = 128
+DEFAULT_HEARTBEAT = 10
+CLAIM_KEY = 'fishing:shard-owner:{}'
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+
+
+class HashRing:
+    """Кольцо консистентного хэширования с виртуальными узлами."""
+
+    def __init__(self, nodes, replicas=RING_REPLICAS):
+        self.nodes = tuple(nodes)
+        points = sorted(
+            (_hash(f'{node}#{i}'), node) for node in self.nodes for i in range(replicas)
+        )
+        self._hashes = [h for h, _ in points]
+        self._owners = [node for _, node in points]
+
+    def node_for(self, key: str) -> str | None:
+        if not self._hashes:
+            return None
+        idx = bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._owners[idx]
+
+
+_ring = None
+
+
+def get_ring() -> HashRing:
+    """Кольцо по settings.FISHING_SHARDS (пересобирается при смене настройки)."""
+    global _ring
+    nodes = tuple(getattr(settings, 'FISHING_SHARDS', ()))
+    if _ring is None or _ring.nodes != nodes:
+        _ring = HashRing(nodes)
+    return _ring
+
+
+def sharding_enabled() -> bool:
+    return bool(getattr(settings, 'FISHING_SHARDS', ()))
+
+
+def all_shards() -> list:
+    """Каналы кольца и закреплённые каналы — всё, что обслуживают воркеры."""
+    pinned = getattr(settings, 'FISHING_SHARD_PINS', {}).values()
+    return list(dict.fromkeys([*settings.FISHING_SHARDS, *pinned]))
+
+
+def pinned_shards() -> list:
+    """Закреплённые каналы (FISHING_SHARD_PINS) без каналов кольца."""
+    ring = set(settings.FISHING_SHARDS)
+    return [name for name in all_shards() if name not in ring]
+
+
+def claim_channels(channels, owner) -> list:
+    """
+    Занимает каналы за процессом owner; возвращает уже занятые другими.
+
+    Канал шарда должен читать ровно один процесс: иначе у одного игрока
+    окажется несколько PlayerRuntime. Занятость живёт в кэше с TTL в три
+    heartbeat и продлевается refresh_claims, пока процесс жив.
+    """
+    ttl = heartbeat_seconds() * 3
+    taken = []
+    for name in channels:
+        key = CLAIM_KEY.format(name)
+        if not cache.add(key, owner, ttl) and cache.get(key) != owner:
+            taken.append(name)
+    if taken:
+        release_channels([c for c in channels if c not in taken], owner)
+    return taken
+
+
+def refresh_claims(channels, owner):
+    for name in channels:
+        key = CLAIM_KEY.format(name)
+        if cache.get(key) == owner:
+            cache.touch(key, heartbeat_seconds() * 3)
+
+
+def release_channels(channels, owner):
+    for name in channels:
+        key = CLAIM_KEY.format(name)
+        if cache.get(key) == owner:
+            cache.delete(key)
+
+
+def shard_keys(location_id, base_id, player_id) -> list:
+    """Ключи шардирования в порядке приоритета: локация, база, игрок."""
+    keys = []
+    if getattr(settings, 'FISHING_SHARD_BY', 'location') == 'location' and location_id:
+        keys.append(f'location:{location_id}')
+    if base_id:
+        keys.append(f'base:{base_id}')
+    keys.append(f'player:{player_id}')
+    return keys
+
+
+def shard_for(location_id, base_id, player_id) -> str:
+    keys = shard_keys(location_id, base_id, player_id)
+    pins = getattr(settings, 'FISHING_SHARD_PINS', {})
+    for key in keys:
+        if key in pins:
+            return pins[key]
+    return get_ring().node_for(keys[0])
+
+
+def shard_for_player(player) -> str:
+    return shard_for(player.current_location_id, player.current_base_id, player.pk)
+
+
+def heartbeat_seconds() -> float:
+    return getattr(settings, 'FISHING_SHARD_HEARTBEAT', DEFAULT_HEARTBEAT)
+
+
+@database_sync_to_async
+def load_player(player_id):
+    from apps.accounts.models import Player
+
+    return Player.objects.filter(pk=player_id).first()
+
+
+class _Member:
+    """Игрок на воркере: runtime, канал шлюза и время последнего heartbeat."""
+
+    __slots__ = ('runtime', 'reply_channel', 'seen')
+
+    def __init__(self, runtime, reply_channel):
+        self.runtime = runtime
+        self.reply_channel = reply_channel
+        self.seen = time.monotonic()
+
+
+class FishingShardWorker(AsyncConsumer):
+    """Воркер шарда: PlayerRuntime игроков, чьи локации назначены этому каналу."""
+
+    async def __call__(self, scope, receive, send):
+        self.shard = scope['channel']
+        self.members = {}
+        self._tasks = set()
+        reaper = asyncio.create_task(self._reap_loop())
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            reaper.cancel()
+            for player_id in list(self.members):
+                self._drop(player_id)
+
+    async def shard_join(self, message):
+        """Подключение и heartbeat шлюза (идемпотентно)."""
+        await self._member(message['player_id'], message['reply_channel'])
+
+    async def shard_action(self, message):
+        member = await self._member(message['player_id'], message['reply_channel'])
+        if member is not None:
+            # Диспетчер обрабатывает сообщения по одному: действие не должно
+            # задерживать остальных игроков шарда.
+            self._spawn(member.runtime.handle(message['content']))
+
+    async def shard_leave(self, message):
+        member = self.members.get(message['player_id'])
+        if member is not None and member.reply_channel == message['reply_channel']:
+            self._drop(message['player_id'])
+
+    async def _member(self, player_id, reply_channel):
+        member = self.members.get(player_id)
+        if member is not None and member.reply_channel == reply_channel:
+            member.seen = time.monotonic()
+            return member
+        if member is not None:
+            # Переподключение через другой шлюз: старый runtime больше не нужен.
+            self._drop(player_id)
+
+        player = await load_player(player_id)
+        if player is None:
+            return None
+        runtime = PlayerRuntime(player, partial(self._reply, reply_channel))
+        member = self.members[player_id] = _Member(runtime, reply_channel)
+        metrics.FISHING_SHARD_PLAYERS.set(len(self.members), shard=self.shard)
+        self._spawn(runtime.start())
+        return member
+
+    def _drop(self, player_id):
+        member = self.members.pop(player_id, None)
+        if member is not None:
+            member.runtime.stop()
+            metrics.FISHING_SHARD_PLAYERS.set(len(self.members), shard=self.shard)
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _reply(self, reply_channel, payload):
+        try:
+            await self.channel_layer.send(
+                reply_channel, {'type': 'shard.state', 'shard': self.shard, 'payload': payload},
+            )
+        except ChannelFull:
+            logger.warning('Шард %s: канал %s переполнен, кадр отброшен', self.shard, reply_channel)
+
+    async def _reap_loop(self):
+        """Убирает игроков без heartbeat (шлюз упал, не отправив shard.leave)."""
+        ttl = heartbeat_seconds() * 3
+        while True:
+            await asyncio.sleep(heartbeat_seconds())
+            deadline = time.monotonic() - ttl
+            for player_id in [pid for pid, m in self.members.items() if m.seen < deadline]:
+                self._drop(player_id)
+            try:
+                await sync_to_async(metrics.push_snapshot, thread_sensitive=False)()
+            except Exception:
+                logger.warning('Шард %s: не удалось сохранить метрики', self.shard, exc_info=True)
+
+
+async def _discard(message):
+    pass
+
+
+_embedded = {}
+
+
+def start_embedded_workers():
+    """Запускает воркеры всех шардов в текущем event loop (FISHING_SHARDS_EMBEDDED)."""
+    loop = asyncio.get_running_loop()
+    layer = get_channel_layer()
+    for name in all_shards():
+        task = _embedded.get(name)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            continue
+        app = FishingShardWorker.as_asgi()
+        _embedded[name] = loop.create_task(
+            app({'type': 'channel', 'channel': name}, partial(layer.receive, name), _discard),
+        )
@@ -0,0 +1,15 @@
+"""Сигналы рыбалки."""
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from apps.fishing.models import FishingSession
+
+
+@receiver(post_delete, sender=FishingSession, dispatch_uid='fishing.forget_session_rng')
+def _session_deleted(instance, **kwargs):
+    """Сессия закончилась — её поток случайных чисел больше не нужен."""
+    from config.container import container
+    from config.rng import RandomService
+
+    container.resolve(RandomService).forget_session(instance.pk)
@@ -0,0 +1,250 @@
+"""Офлайн-симулятор баланса: Монте-Карло по фикстурам без БД.
+
+Каталог (локации, рыба локаций, виды, катушки, лески, наживки) читается
+из fixtures/*.json в массивы. Для пары «локация × снасть» разыгрываются
+забросы сразу пачкой на NumPy: ожидание поклёвки (геометрическое по
+шансу за тик), выбор вида, вес, вываживание и продажа улова. Формулы —
+из apps.fishing.formulas, те же, что у сервисов; точки заброса — в тех же
+процентах водоёма, что шлёт клиент, глубина в них — apps.world.depth.cast_depth.
+
+Модель игрока упрощена: подсекает вовремя, во время вываживания
+подматывает, пока натяжение ниже доли safety от порога обрыва, иначе
+ждёт. Доход в час — по «рыболовам»: забросы идут подряд, цена вида
+падает по мере продажи собственного улова (FishPriceDynamic за день).
+"""
+
+import glob
+import json
+import os
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+from apps.fishing import formulas
+from apps.fishing.models import GameTime
+from apps.world.depth import CAST_SCALE, build_raster, cast_depth
+
+FIXTURES_GLOB = os.path.join(settings.BASE_DIR, 'fixtures', '*.json')
+PHASES = tuple(GameTime.TimeOfDay.values)
+MAX_FIGHT_STEPS = 500
+
+
+@dataclass
+class Catalog:
+    """Справочники из фикстур: {pk: fields}, рыба локаций — {location: [(fish, spawn_weight)]}."""
+
+    species: dict = field(default_factory=dict)
+    locations: dict = field(default_factory=dict)
+    location_fish: dict = field(default_factory=dict)
+    reels: dict = field(default_factory=dict)
+    lines: dict = field(default_factory=dict)
+    baits: dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Tackle:
+    """Снасть симуляции: pk катушки, лески и наживки (None — без неё)."""
+
+    reel: int = None
+    line: int = None
+    bait: int = None
+
+
+@dataclass
+class BalanceReport:
+    location: int
+    tackle: Tackle
+    casts: int
+    bite_chance: float
+    hooked: int
+    caught: int
+    line_breaks: int
+    escaped: int
+    species_mix: dict
+    income_per_hour: list  # по рыболовам, по возрастанию
+
+    @property
+    def catch_rate(self) -> float:
+        return self.caught / self.hooked if self.hooked else 0.0
+
+    @property
+    def line_break_rate(self) -> float:
+        return self.line_breaks / self.hooked if self.hooked else 0.0
+
+
+_MODELS = {
+    'tackle.fishspecies': 'species',
+    'world.location': 'locations',
+    'tackle.reel': 'reels',
+    'tackle.line': 'lines',
+    'tackle.bait': 'baits',
+}
+
+
+def load_catalog(paths=None) -> Catalog:
+    """Справочники из файлов фикстур (по умолчанию fixtures/*.json)."""
+    catalog = Catalog()
+    for path in paths or sorted(glob.glob(FIXTURES_GLOB)):
+        with open(path, encoding='utf-8') as fh:
+            objects = json.load(fh)
+        for obj in objects:
+            model, fields = obj['model'], obj['fields']
+            if model == 'world.locationfish':
+                catalog.location_fish.setdefault(fields['location'], []).append(
+                    (fields['fish'], fields.get('spawn_weight', 1.0)),
+                )
+            elif model in _MODELS:
+                getattr(catalog, _MODELS[model])[obj['pk']] = fields
+    return catalog
+
+
+def default_tackles(catalog) -> list:
+    """Катушка и леска одного уровня (по порядку pk) × каждая наживка."""
+    tiers = list(zip(sorted(catalog.reels), sorted(catalog.lines)))
+    return [Tackle(reel, line, bait) for reel, line in tiers for bait in sorted(catalog.baits)]
+
+
+def phase_by_hour():
+    """Фаза суток для каждого игрового часа — как у GameTime."""
+    return [PHASES.index(GameTime(current_hour=hour).time_of_day) for hour in range(24)]
+
+
+def simulate(
+    catalog, location_id, tackle, *, casts, rng, anglers=100, hour=None,
+    depth_setting=1.5, rank=1, karma=0, hunger=100, safety=0.75,
+    tick_seconds=1.5, action_seconds=1.0,
+):
+    """Разыгрывает casts забросов на локации; None, если рыбы на локации нет."""
+    import numpy as np
+
+    fish = catalog.location_fish.get(location_id)
+    if not fish:
+        return None
+    anglers = max(1, min(anglers, casts))
+    casts -= casts % anglers
+    species = [catalog.species[pk] for pk, _ in fish]
+    spawn = np.array([weight for _, weight in fish], dtype=float)
+    activity = np.array([
+        [(s.get('active_time') or {}).get(phase, formulas.DEFAULT_ACTIVITY) for phase in PHASES]
+        for s in species
+    ])
+    depth_min = np.array([s.get('preferred_depth_min', 0.5) for s in species])
+    depth_max = np.array([s.get('preferred_depth_max', 5.0) for s in species])
+    rarity_mult = np.array([formulas.RARITY_MULT.get(s.get('rarity'), 1.0) for s in species])
+    weight_min = np.array([s['weight_min'] for s in species])
+    weight_max = np.array([s['weight_max'] for s in species])
+    price_per_kg = np.array([float(s['sell_price_per_kg']) for s in species])
+
+    targets = set(catalog.baits[tackle.bait]['target_species']) if tackle.bait else set()
+    bait_match = np.array([pk in targets for pk, _ in fish])
+    reel = catalog.reels.get(tackle.reel)
+    reel_power = reel['drag_power'] if reel else formulas.DEFAULT_REEL_POWER
+    line = catalog.lines.get(tackle.line)
+    limit = formulas.line_limit(line['breaking_strength']) if line else formulas.DEFAULT_LINE_LIMIT
+
+    # Фаза суток и глубина наживки в точке заброса.
+    hours = np.full(casts, hour) if hour is not None else rng.integers(0, 24, casts)
+    phase = np.array(phase_by_hour())[hours]
+    raster = build_raster(catalog.locations[location_id].get('depth_map'))
+    points = rng.uniform(0.0, CAST_SCALE, (casts, 2))
+    bottom = np.fromiter((cast_depth(raster, x, y) for x, y in points), float, casts)
+    depth = np.minimum(depth_setting, bottom)
+    suited = (depth_min <= depth[:, None]) & (depth[:, None] <= depth_max)
+
+    # Поклёвка.
+    modifiers = (
+        activity[:, phase].mean(axis=0)
+        * formulas.depth_bite_modifier(suited.mean(axis=1))
+        * formulas.bait_bite_modifier(bool(bait_match.any()))
+        * formulas.rank_bite_modifier(rank)
+        * formulas.karma_bite_modifier(karma)
+        * formulas.hunger_bite_modifier(hunger)
+    )
+    chance = formulas.bite_chance(modifiers)
+    wait_ticks = rng.geometric(chance)
+
+    # Вид: веса spawn × фаза × наживка × глубина, выбор по накопленным весам.
+    weights = (
+        spawn * activity.T[phase]
+        * np.where(bait_match, formulas.BAIT_MATCH_WEIGHT, 1.0)
+        * formulas.depth_select_modifier(depth[:, None], depth_min, depth_max)
+    )
+    cumulative = weights.cumsum(axis=1)
+    hooked = cumulative[:, -1] > 0
+    picks = (cumulative < rng.random(casts)[:, None] * cumulative[:, -1:]).sum(axis=1)
+    picks = picks.clip(max=len(fish) - 1)
+    fish_weight = np.round(formulas.fish_weight(
+        weight_min[picks], weight_max[picks], rng.beta(*formulas.WEIGHT_BETA, casts),
+    ), 3)
+
+    # Вываживание: все забросы сразу, закончившиеся бои замораживаются.
+    strength = formulas.normalized_strength(fish_weight, rarity_mult[picks])
+    distance = rng.uniform(*formulas.START_DISTANCE, casts)
+    tension = np.full(casts, float(formulas.START_TENSION))
+    active = hooked.copy()
+    caught = np.zeros(casts, dtype=bool)
+    broken = np.zeros(casts, dtype=bool)
+    steps = np.zeros(casts)
+    for _ in range(MAX_FIGHT_STEPS):
+        if not active.any():
+            break
+        reel_in = tension < safety * limit
+        new_distance = np.where(reel_in, (distance - formulas.pull_distance(
+            reel_power, rng.uniform(*formulas.REEL_IN_PULL, casts),
+        )).clip(min=0), distance)
+        new_tension = np.where(reel_in, tension + formulas.action_tension(
+            1, strength, rng.uniform(*formulas.REEL_IN_TENSION, casts),
+        ), (tension - formulas.WAIT_RELIEF).clip(min=0))
+        jerk = rng.random(casts) < formulas.JERK_CHANCE
+        jerk_distance, jerk_tension = formulas.fish_jerk(
+            new_distance, new_tension, strength,
+            rng.uniform(*formulas.JERK_DISTANCE, casts), rng.uniform(*formulas.JERK_TENSION, casts),
+        )
+        new_distance = np.where(jerk, jerk_distance, new_distance)
+        new_tension, new_strength = formulas.fish_rest(np.where(jerk, jerk_tension, new_tension), strength)
+
+        distance = np.where(active, new_distance, distance)
+        tension = np.where(active, new_tension, tension)
+        strength = np.where(active, new_strength, strength)
+        steps += active
+        broken |= active & (tension >= limit)
+        caught |= active & ~broken & (distance <= 0)
+        active &= ~(broken | caught)
+
+    # Доход: забросы рыболова подряд, цена вида падает по мере продаж.
+    seconds = (
+        wait_ticks * tick_seconds + hooked * rng.uniform(*formulas.NIBBLE_SECONDS, casts)
+        + steps * action_seconds
+    ).reshape(anglers, -1)
+    sold = np.where(caught, fish_weight, 0.0).reshape(anglers, -1)
+    kinds = picks.reshape(anglers, -1)
+    sold_before = np.zeros_like(sold)
+    for idx in np.unique(picks[caught]):
+        own = np.where(kinds == idx, sold, 0.0)
+        sold_before += np.where(kinds == idx, own.cumsum(axis=1) - own, 0.0)
+    income = sold * price_per_kg[kinds] * formulas.price_modifier(sold_before)
+    elapsed = seconds.cumsum(axis=1)
+    in_hour = elapsed <= 3600
+    full_hour = elapsed[:, -1] >= 3600
+    per_hour = np.where(
+        full_hour, (income * in_hour).sum(axis=1),
+        income.sum(axis=1) / elapsed[:, -1] * 3600,
+    )
+
+    landed = picks[caught]
+    mix = {
+        fish[idx][0]: round(float((landed == idx).mean()), 4)
+        for idx in np.unique(landed)
+    }
+    return BalanceReport(
+        location=location_id,
+        tackle=tackle,
+        casts=casts,
+        bite_chance=float(chance.mean()),
+        hooked=int(hooked.sum()),
+        caught=int(caught.sum()),
+        line_breaks=int(broken.sum()),
+        escaped=int((hooked & ~caught & ~broken).sum()),
+        species_mix=dict(sorted(mix.items(), key=lambda item: -item[1])),
+        income_per_hour=sorted(float(v) for v in per_hour),
+    )
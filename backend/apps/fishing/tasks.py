@@ -1,8 +1,6 @@
 """Celery-задачи рыбалки."""
 
 from celery import shared_task
-from django.conf import settings
-from django.db.models import F
 from django.utils import timezone
 
 
@@ -20,18 +18,6 @@ def advance_game_time():
     gt.save()
 
 
-@shared_task
-def hunger_tick():
-    """Снизить сытость у активных игроков."""
-    from apps.accounts.models import Player
-
-    decrease = settings.GAME_SETTINGS['HUNGER_DECREASE']
-    Player.objects.filter(
-        current_location__isnull=False, hunger__gt=0,
-    ).update(hunger=F('hunger') - decrease)
-    Player.objects.filter(hunger__lt=0).update(hunger=0)
-
-
 @shared_task
 def cleanup_expired_groundbait():
     """Удалить истёкшие прикормочные пятна."""
@@ -1,6 +1,7 @@
 """Тесты API рыбалки — мульти-удочки."""
 
-from datetime import timedelta
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
 
 import pytest
 from django.contrib.contenttypes.models import ContentType
@@ -97,6 +98,18 @@ class TestCast:
         })
         assert resp2.status_code == 400
 
+    def test_cast_point_outside_water(self, api_client, player, location, player_rod):
+        """Точка заброса — проценты водоёма 0..100."""
+        player.current_location = location
+        player.save(update_fields=['current_location'])
+
+        resp = api_client.post(self.URL, {
+            'rod_id': player_rod.pk,
+            'point_x': 150.0,
+            'point_y': 20.0,
+        })
+        assert resp.status_code == 400
+
 
 # ─────────────────────────── Status ─────────────────────────
 
@@ -303,3 +316,206 @@ class TestGameTime:
         assert 'time_of_day' in resp.data
         assert resp.data['hour'] == game_time.current_hour
         assert resp.data['day'] == game_time.current_day
+
+
+# ─────────────────────────── Metrics ────────────────────────
+
+@pytest.mark.django_db
+class TestMetrics:
+    URL = '/metrics'
+
+    @pytest.fixture(autouse=True)
+    def _debug(self, settings):
+        settings.DEBUG = True
+
+    def _sample(self, text, prefix):
+        for line in text.splitlines():
+            if line.startswith(prefix):
+                return float(line.rsplit(' ', 1)[1])
+        return 0.0
+
+    def test_use_case_latency_exported(self, api_client):
+        before = self._sample(
+            api_client.get(self.URL).content.decode(),
+            'use_case_duration_seconds_count{use_case="FishingStatusUseCase"}',
+        )
+        api_client.get('/api/fishing/status/')
+
+        resp = api_client.get(self.URL)
+        assert resp.status_code == 200
+        assert resp['Content-Type'].startswith('text/plain; version=0.0.4')
+        text = resp.content.decode()
+        assert '# TYPE use_case_duration_seconds histogram' in text
+        assert self._sample(
+            text, 'use_case_duration_seconds_count{use_case="FishingStatusUseCase"}',
+        ) == before + 1
+
+    def test_worker_snapshots_merged(self, api_client):
+        from config import metrics
+
+        snapshot = {
+            'celery_tasks_total': {
+                'type': 'counter', 'help': 'Завершённые задачи Celery',
+                'labels': ['task', 'state'],
+                'samples': [[['apps.fishing.tasks.advance_game_time', 'SUCCESS'], 3]],
+            },
+        }
+        from django.core.cache import cache
+        cache.set(metrics.WORKER_KEY.format('worker-1:1'), snapshot)
+        cache.set(metrics.WORKERS_KEY, ['worker-1:1'])
+        try:
+            text = api_client.get(self.URL).content.decode()
+        finally:
+            cache.delete_many([metrics.WORKERS_KEY, metrics.WORKER_KEY.format('worker-1:1')])
+        assert self._sample(
+            text, 'celery_tasks_total{task="apps.fishing.tasks.advance_game_time",state="SUCCESS"}',
+        ) >= 3
+
+    def test_gauges_kept_per_process(self, api_client):
+        """Gauge не суммируются между процессами: у каждого своя метка process."""
+        from django.core.cache import cache
+        from config import metrics
+
+        def snapshot(value):
+            return {'db_pool_saturation': {
+                'type': 'gauge', 'help': 'Доля занятых соединений от max_size',
+                'labels': ['alias'], 'samples': [[['default'], value]],
+            }}
+
+        workers = ['web-1:1', 'web-2:2']
+        cache.set(metrics.WORKER_KEY.format(workers[0]), snapshot(0.5))
+        cache.set(metrics.WORKER_KEY.format(workers[1]), snapshot(0.75))
+        cache.set(metrics.WORKERS_KEY, workers)
+        try:
+            text = api_client.get(self.URL).content.decode()
+        finally:
+            cache.delete_many([metrics.WORKERS_KEY, *(metrics.WORKER_KEY.format(w) for w in workers)])
+        assert self._sample(text, 'db_pool_saturation{alias="default",process="web-1:1"}') == 0.5
+        assert self._sample(text, 'db_pool_saturation{alias="default",process="web-2:2"}') == 0.75
+
+    def test_web_process_pushes_snapshot(self, settings, monkeypatch):
+        """Поток start_pusher сохраняет снимок процесса daphne, повторный запуск не плодит потоки."""
+        import threading
+        from config import metrics
+
+        pushed = threading.Event()
+        settings.METRICS_PUSH_SECONDS = 0.01
+        monkeypatch.setattr(metrics, '_pusher', None)
+        monkeypatch.setattr(metrics, 'push_snapshot', pushed.set)
+        metrics.start_pusher()
+        try:
+            thread = metrics._pusher[1]
+            metrics.start_pusher()
+            assert metrics._pusher[1] is thread
+            assert pushed.wait(1)
+        finally:
+            metrics.stop_pusher()
+        thread.join(1)
+        assert not thread.is_alive()
+
+    def test_dead_worker_snapshot_dropped(self, api_client):
+        """Id процесса с истёкшим снимком убирается из индекса воркеров."""
+        from django.core.cache import cache
+        from config import metrics
+
+        cache.set(metrics.WORKERS_KEY, ['worker-2:2'])
+        api_client.get(self.URL)
+        assert cache.get(metrics.WORKERS_KEY) == []
+
+    def test_token_required(self, client, settings):
+        settings.METRICS_TOKEN = 'secret'
+        assert client.get(self.URL).status_code == 403
+        resp = client.get(self.URL, HTTP_AUTHORIZATION='Bearer secret')
+        assert resp.status_code == 200
+
+    def test_denied_without_token_when_not_debug(self, client, settings):
+        settings.DEBUG = False
+        settings.METRICS_TOKEN = ''
+        assert client.get(self.URL).status_code == 403
+
+
+# ─────────────────────────── Fast JSON ──────────────────────
+
+class _WrappedBackend:
+    """Бэкенд-плагин для теста: stdlib, помечающий вывод."""
+
+    def dumps(self, obj, default):
+        from config.fastjson import StdlibBackend
+        return b'[' + StdlibBackend().dumps(obj, default) + b']'
+
+    def loads(self, data):
+        import json
+        return json.loads(data)[0]
+
+
+@pytest.fixture(params=['stdlib', 'orjson'])
+def json_backend(request, settings):
+    from config import fastjson
+    if request.param == 'orjson' and fastjson.orjson is None:
+        pytest.skip('orjson не установлен')
+    settings.JSON_BACKEND = request.param
+    fastjson.reset_backend()
+    yield request.param
+    fastjson.reset_backend()
+
+
+class TestFastJSON:
+    """config.fastjson: совпадение со штатными энкодерами DRF и Django."""
+
+    PAYLOAD = {
+        'money': Decimal('12.50'),
+        'at': datetime(2024, 5, 1, 12, 30, tzinfo=dt_timezone.utc),
+        'day': date(2024, 5, 1),
+        'ids': {1: 'a'},
+        'text': 'Карась\u2028',
+    }
+
+    def test_renderer_matches_drf(self, json_backend):
+        import json
+        from rest_framework.renderers import JSONRenderer
+        from config.fastjson import FastJSONRenderer
+        expected = json.loads(JSONRenderer().render(self.PAYLOAD))
+        body = FastJSONRenderer().render(self.PAYLOAD)
+        assert json.loads(body) == expected
+        assert expected['money'] == 12.5
+        assert b'\\u2028' in body
+
+    def test_consumer_encodes_decimal_as_string(self, json_backend):
+        import asyncio
+        import json
+        from apps.fishing.consumers import FishingConsumer
+        text = asyncio.run(FishingConsumer.encode_json(self.PAYLOAD))
+        data = json.loads(text)
+        assert data['money'] == '12.50'
+        assert data['at'].startswith('2024-05-01T12:30:00') and data['at'].endswith('Z')
+        assert asyncio.run(FishingConsumer.decode_json(text)) == data
+
+    def test_lazy_strings(self, json_backend):
+        import json
+        from django.utils.translation import gettext_lazy
+        from config.fastjson import FastJSONRenderer
+        assert json.loads(FastJSONRenderer().render({'e': gettext_lazy('Hello')})) == {'e': 'Hello'}
+
+    def test_parser_error(self, json_backend):
+        import io
+        from rest_framework.exceptions import ParseError
+        from config.fastjson import FastJSONParser
+        assert FastJSONParser().parse(io.BytesIO('{"a": "б"}'.encode())) == {'a': 'б'}
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{oops'))
+
+    def test_custom_backend(self, settings):
+        from config import fastjson
+        settings.JSON_BACKEND = 'apps.fishing.tests._WrappedBackend'
+        fastjson.reset_backend()
+        try:
+            assert fastjson.dumps({'a': 1}) == b'[{"a":1}]'
+            assert fastjson.loads(b'[{"a":1}]') == {'a': 1}
+        finally:
+            fastjson.reset_backend()
+
+    @pytest.mark.django_db
+    def test_api_response(self, api_client, json_backend):
+        resp = api_client.get('/api/fishing/status/')
+        assert resp.status_code == 200
+        assert resp['Content-Type'] == 'application/json'
@@ -383,7 +383,7 @@ class TestReleaseMechanics:
 class TestFightFullCycle:
     """Тесты полного цикла вываживания."""
 
-    @patch('apps.fishing.services.fight_engine._fish_action', lambda f: None)
+    @patch('apps.fishing.services.fight_engine._fish_action', lambda f, rng: None)
     def test_fight_to_catch(self, api_client, fishing_session_fighting):
         """Подмотка до вытаскивания: distance → 0 = caught."""
         fight = FightState.objects.get(session=fishing_session_fighting)
@@ -842,7 +842,7 @@ class TestRetrieveMechanics:
 class TestFullFishingCycle:
     """Интеграционный тест: полный цикл ловли."""
 
-    @patch('apps.fishing.services.fight_engine._fish_action', lambda f: None)
+    @patch('apps.fishing.services.fight_engine._fish_action', lambda f, rng: None)
     @patch.object(BiteCalculatorService, 'try_bite', return_value=True)
     @patch.object(FishSelectorService, 'select_fish')
     @patch.object(FishSelectorService, 'generate_fish_weight', return_value=0.8)
@@ -908,7 +908,7 @@ class TestFullFishingCycle:
         assert CaughtFish.objects.filter(player=player, species=fish_species).exists()
         assert not FishingSession.objects.filter(pk=session_id).exists()
 
-    @patch('apps.fishing.services.fight_engine._fish_action', lambda f: None)
+    @patch('apps.fishing.services.fight_engine._fish_action', lambda f, rng: None)
     @patch.object(BiteCalculatorService, 'try_bite', return_value=True)
     @patch.object(FishSelectorService, 'select_fish')
     @patch.object(FishSelectorService, 'generate_fish_weight', return_value=2.0)
@@ -365,3 +365,620 @@ class TestFightEngine:
         fight.refresh_from_db()
         # Сила рыбы должна уменьшиться
         assert fight.fish_strength <= initial_strength
+
+
+# ──────────────────────── query budget ────────────────────────
+
+@pytest.mark.django_db
+class TestFishingQueryBudget:
+    """Регрессии числа запросов на горячем пути тика."""
+
+    def setup_method(self):
+        from apps.home.services import MoonshineService
+        services = (TimeService(), PotionService(), MoonshineService())
+        self.bite = BiteCalculatorService(*services)
+        self.selector = FishSelectorService(*services)
+
+    def test_bite_chance(self, assert_max_queries, player, location, player_rod, location_fish, game_time):
+        with assert_max_queries(7):
+            self.bite.calculate_bite_chance(player, location, player_rod)
+
+    def test_select_fish(self, assert_max_queries, location, player_rod, location_fish, game_time):
+        with assert_max_queries(6):
+            self.selector.select_fish(location, player_rod)
+
+    def test_reel_in(self, assert_max_queries, fishing_session_fighting):
+        fight = FightState.objects.get(session=fishing_session_fighting)
+        with assert_max_queries(4):
+            FightEngineService().reel_in(fight)
+
+    def test_depth_at_cast_point_is_free(self, assert_max_queries, player, player_rod, location_fish,
+                                         fishing_session_waiting, game_time):
+        """Глубина в точке заброса не добавляет запросов: растр едет со строкой локации."""
+        session = FishingSession.objects.select_related(
+            'location', 'rod__bait', 'rod__player',
+        ).get(pk=fishing_session_waiting.pk)
+        with assert_max_queries(7):
+            self.bite.calculate_bite_chance(player, session.location, session.rod, session)
+        with assert_max_queries(6):
+            self.selector.select_fish(session.location, session.rod, session)
+
+
+@pytest.mark.django_db
+class TestCastPointDepth:
+    """Глубина дна в точке заброса влияет на шанс поклёвки."""
+
+    def test_bite_chance_follows_depth(self, player, location, player_rod, location_fish, fish_species, game_time):
+        from apps.home.services import MoonshineService
+
+        # Верх локации мелкий (0.8 м), низ глубокий (4 м); карась держится на 0.5–1 м.
+        location.depth_map = {'grid': [[0.8, 0.8], [4.0, 4.0]]}
+        location.save(update_fields=['depth_map'])
+        fish_species.preferred_depth_min, fish_species.preferred_depth_max = 0.5, 1.0
+        fish_species.save()
+        player_rod.depth_setting = 3.0
+        player_rod.save(update_fields=['depth_setting'])
+
+        bite = BiteCalculatorService(TimeService(), PotionService(), MoonshineService())
+        chances = {}
+        for slot, y in enumerate((0.0, 100.0), start=1):
+            session = FishingSession.objects.create(
+                player=player, location=location, rod=player_rod, slot=slot,
+                state=FishingSession.State.WAITING, cast_x=50.0, cast_y=y,
+            )
+            session = FishingSession.objects.select_related('location', 'rod').get(pk=session.pk)
+            chances[y] = bite.calculate_bite_chance(player, session.location, session.rod, session)
+
+        # Мелко: наживка у дна на 0.8 м — в зоне карася; глубоко: на 3 м — нет.
+        assert chances[0.0] / chances[100.0] == pytest.approx(1.2 / 0.8)
+
+    def test_bait_depth_at_real_cast_points(self, player, location, player_rod):
+        """Клиентские точки 0..100: в центре чаши наживка стоит на настройке снасти, у берега — на дне."""
+        from apps.world.depth import bait_depth
+
+        location.depth_map = {'avg': 3.0, 'min': 0.5, 'max': 6.0}
+        location.save(update_fields=['depth_map'])
+        player_rod.depth_setting = 4.0
+        player_rod.save(update_fields=['depth_setting'])
+
+        def cast(slot, x, y):
+            session = FishingSession.objects.create(
+                player=player, location=location, rod=player_rod, slot=slot,
+                state=FishingSession.State.WAITING, cast_x=x, cast_y=y,
+            )
+            return FishingSession.objects.select_related('location', 'rod').get(pk=session.pk)
+
+        assert bait_depth(cast(1, 50.0, 50.0)) == pytest.approx(4.0)
+        assert bait_depth(cast(2, 0.0, 0.0)) == pytest.approx(0.5)
+
+
+@pytest.mark.django_db
+class TestStateProjections:
+    """Проекции тика совпадают с выводом REST-сериализаторов."""
+
+    def _sessions(self, player):
+        from apps.fishing.use_cases.status import SELECT_RELATED
+        return list(
+            FishingSession.objects.filter(player=player)
+            .select_related(*SELECT_RELATED).order_by('slot')
+        )
+
+    def test_session_matches_serializer(self, player, fishing_session_waiting, fishing_session_bite):
+        from apps.fishing.projections import SessionProjection
+        from apps.fishing.serializers import FishingSessionSerializer
+        fishing_session_bite.slot = 2
+        fishing_session_bite.save(update_fields=['slot'])
+        sessions = self._sessions(player)
+        assert len(sessions) == 2
+        for session in sessions:
+            expected = dict(FishingSessionSerializer(session).data)
+            assert SessionProjection.from_session(session).to_dict() == expected
+
+    def test_fight_matches_serializer(self, fishing_session_fighting):
+        from apps.fishing.projections import FightProjection
+        from apps.fishing.serializers import FightStateSerializer
+        fight = FightState.objects.get(session=fishing_session_fighting)
+        projection = FightProjection.from_fight(fight)
+        assert projection.to_dict() == dict(FightStateSerializer(fight).data)
+        assert projection.to_tuple()[0] == fishing_session_fighting.pk
+
+    def test_projection_has_slots(self):
+        from apps.fishing.projections import FightProjection
+        fight = FightProjection(1, 0.0, 20.0, 100.0, 10.0)
+        assert not hasattr(fight, '__dict__')
+
+    def test_state_payload(self, player, fishing_session_fighting, game_time, assert_max_queries):
+        from apps.fishing.projections import state_payload
+        sessions = self._sessions(player)
+        fights = {s.pk: s.fight for s in sessions}
+        with assert_max_queries(0):
+            payload = state_payload(sessions, fights, game_time)
+        assert list(payload['fights']) == [str(fishing_session_fighting.pk)]
+        assert payload['sessions'][0]['state'] == FishingSession.State.FIGHTING
+        assert payload['game_time']['hour'] == game_time.current_hour
+
+
+class TestFishingShards:
+    """Кольцо шардов и обмен шлюз ↔ воркер через InMemoryChannelLayer."""
+
+    SHARDS = ['fishing-0', 'fishing-1', 'fishing-2', 'fishing-3']
+
+    @pytest.fixture
+    def shard_settings(self, settings):
+        settings.FISHING_SHARDS = list(self.SHARDS)
+        settings.FISHING_SHARD_PINS = {}
+        settings.FISHING_SHARD_BY = 'location'
+        settings.CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+        return settings
+
+    def test_ring_is_balanced_and_stable(self):
+        from apps.fishing.shards import HashRing
+        keys = [f'location:{i}' for i in range(2000)]
+        ring = HashRing(self.SHARDS)
+        owners = {key: ring.node_for(key) for key in keys}
+        assert owners == {key: HashRing(self.SHARDS).node_for(key) for key in keys}
+        for shard in self.SHARDS:
+            assert 0.15 < list(owners.values()).count(shard) / len(keys) < 0.35
+
+        grown = HashRing(self.SHARDS + ['fishing-4'])
+        moved = [key for key in keys if grown.node_for(key) != owners[key]]
+        # Переезжают только ключи, доставшиеся новому узлу (~1/5).
+        assert all(grown.node_for(key) == 'fishing-4' for key in moved)
+        assert len(moved) < len(keys) * 0.3
+
+    def test_shard_for_pins_and_fallbacks(self, shard_settings):
+        from apps.fishing.shards import get_ring, shard_for
+        shard_settings.FISHING_SHARD_PINS = {'location:5': 'fishing-hot', 'base:2': 'fishing-1'}
+        assert shard_for(5, 1, 10) == 'fishing-hot'
+        assert shard_for(6, 2, 10) == 'fishing-1'
+        assert shard_for(7, 1, 10) == get_ring().node_for('location:7')
+        assert shard_for(None, 3, 10) == get_ring().node_for('base:3')
+        assert shard_for(None, None, 10) == get_ring().node_for('player:10')
+
+        shard_settings.FISHING_SHARD_BY = 'base'
+        assert shard_for(7, 3, 10) == get_ring().node_for('base:3')
+
+    def test_worker_command_serves_pinned_channels(self, shard_settings):
+        from io import StringIO
+        from django.core.management import call_command
+        shard_settings.FISHING_SHARD_PINS = {'location:5': 'fishing-hot', 'base:2': 'fishing-1'}
+        out = StringIO()
+        call_command('run_fishing_shards', '--list', stdout=out)
+        assert out.getvalue().split() == [*self.SHARDS, 'fishing-hot']
+
+    def test_worker_command_selects_channels(self, shard_settings):
+        from io import StringIO
+        from django.core.management import CommandError, call_command
+        shard_settings.FISHING_SHARD_PINS = {'location:5': 'fishing-hot'}
+
+        def listed(*args):
+            out = StringIO()
+            call_command('run_fishing_shards', *args, '--list', stdout=out)
+            return out.getvalue().split()
+
+        assert listed('fishing-1') == ['fishing-1']
+        assert listed('--pins-only') == ['fishing-hot']
+        with pytest.raises(CommandError, match='fishing-9'):
+            call_command('run_fishing_shards', 'fishing-9')
+        with pytest.raises(CommandError, match='--all'):
+            call_command('run_fishing_shards')
+
+    def test_worker_command_refuses_claimed_channel(self, shard_settings, monkeypatch):
+        """Второй процесс на тот же канал не стартует; свободный канал занимается и освобождается."""
+        from django.core.management import CommandError, call_command
+        from apps.fishing import shards
+        from apps.fishing.management.commands import run_fishing_shards
+
+        served = []
+        monkeypatch.setattr(run_fishing_shards, 'call_command', lambda name, *channels: served.append(channels))
+        assert shards.claim_channels(['fishing-0'], 'other-host:1') == []
+
+        with pytest.raises(CommandError, match='fishing-0'):
+            call_command('run_fishing_shards', 'fishing-0', 'fishing-1')
+        assert shards.claim_channels(['fishing-1'], 'probe:1') == []
+        shards.release_channels(['fishing-1'], 'probe:1')
+
+        call_command('run_fishing_shards', 'fishing-1')
+        assert served == [('fishing-1',)]
+        assert shards.claim_channels(['fishing-1'], 'probe:1') == []
+
+    def test_worker_round_trip(self, shard_settings, monkeypatch):
+        import asyncio
+        from types import SimpleNamespace
+        from channels.layers import get_channel_layer
+        from apps.fishing import shards
+
+        runtimes = []
+
+        class EchoRuntime:
+            def __init__(self, player, send):
+                self.player, self.send, self.stopped = player, send, False
+                runtimes.append(self)
+
+            async def start(self):
+                await self.send({'type': 'state', 'player': self.player.pk})
+
+            async def handle(self, content):
+                await self.send({'type': 'echo', **content})
+
+            def stop(self):
+                self.stopped = True
+
+        async def load_player(player_id):
+            return SimpleNamespace(pk=player_id)
+
+        monkeypatch.setattr(shards, 'PlayerRuntime', EchoRuntime)
+        monkeypatch.setattr(shards, 'load_player', load_player)
+
+        async def scenario():
+            layer = get_channel_layer()
+            shards.start_embedded_workers()
+            reply = await layer.new_channel()
+            shard = shards.shard_for(3, 1, 42)
+            base = {'player_id': 42, 'reply_channel': reply}
+
+            async def receive():
+                return await asyncio.wait_for(layer.receive(reply), 2)
+
+            await layer.send(shard, {'type': 'shard.join', **base})
+            first = await receive()
+            await layer.send(shard, {'type': 'shard.join', **base})
+            await layer.send(shard, {'type': 'shard.action', **base, 'content': {'action': 'cast'}})
+            second = await receive()
+            await layer.send(shard, {'type': 'shard.leave', **base})
+            await asyncio.sleep(0.05)
+            for task in shards._embedded.values():
+                task.cancel()
+            return shard, first, second
+
+        shard, first, second = asyncio.run(scenario())
+        assert first == {'type': 'shard.state', 'shard': shard, 'payload': {'type': 'state', 'player': 42}}
+        assert second['payload'] == {'type': 'echo', 'action': 'cast'}
+        # Повторный join — heartbeat, а не новый runtime.
+        assert len(runtimes) == 1
+        assert runtimes[0].stopped
+
+
+class TestTickBackpressure:
+    """Лимит одновременных тиков, приоритеты и растяжение интервала."""
+
+    def test_priority_from_states(self):
+        from apps.fishing.ticks import HOT, IDLE, WAITING, tick_priority
+        assert tick_priority([{'state': 'waiting'}, {'state': 'fighting'}]) == HOT
+        assert tick_priority([{'state': 'waiting'}]) == WAITING
+        assert tick_priority([{'state': 'idle'}]) == IDLE
+        assert tick_priority([]) == IDLE
+
+    def test_limiter_serves_hot_first_and_times_out(self):
+        import asyncio
+        from apps.fishing.ticks import HOT, IDLE, WAITING, TickLimiter
+
+        async def scenario():
+            limiter = TickLimiter(1)
+            assert await limiter.acquire(IDLE)
+            order = []
+
+            async def waiter(name, priority, timeout=None):
+                if await limiter.acquire(priority, timeout):
+                    order.append(name)
+                    limiter.release()
+                else:
+                    order.append(f'{name}:timeout')
+
+            tasks = [
+                asyncio.create_task(waiter('idle', IDLE)),
+                asyncio.create_task(waiter('waiting', WAITING)),
+                asyncio.create_task(waiter('hot', HOT)),
+                asyncio.create_task(waiter('late', IDLE, timeout=0.01)),
+            ]
+            await asyncio.sleep(0.05)
+            limiter.release()
+            await asyncio.gather(*tasks)
+            return order, limiter.inflight
+
+        order, inflight = asyncio.run(scenario())
+        assert order == ['late:timeout', 'hot', 'waiting', 'idle']
+        assert inflight == 0
+
+    def test_interval_stretches_and_relaxes(self):
+        from apps.fishing.ticks import TickInterval
+        interval = TickInterval(base=1.0, maximum=3.0)
+        interval.observe(0.9)
+        assert interval.current == 1.5
+        interval.observe(0.1, saturated=True)
+        interval.observe(0.1, saturated=True)
+        assert interval.current == 3.0
+        for _ in range(10):
+            interval.observe(0.1)
+        assert interval.current == 1.0 and not interval.stretched
+
+    def test_slow_tick_is_not_overlapped(self, settings):
+        import asyncio
+        from types import SimpleNamespace
+        from apps.fishing.runtime import PlayerRuntime
+        from config import metrics
+
+        settings.FISHING_TICK_SECONDS = 0.01
+        settings.FISHING_TICK_MAX_SECONDS = 0.02
+        skipped_before = metrics.FISHING_TICKS_SKIPPED._values.get(('busy',), 0)
+        running, peak, sent = [], [], []
+
+        async def send(payload):
+            sent.append(payload)
+
+        async def scenario():
+            runtime = PlayerRuntime(SimpleNamespace(pk=1), send)
+
+            async def slow_tick():
+                running.append(1)
+                peak.append(len(running))
+                await asyncio.sleep(0.1)
+                running.pop()
+                return {'type': 'state', 'sessions': [{'state': 'fighting'}]}
+
+            runtime._do_tick = slow_tick
+            runtime._tick_task = asyncio.create_task(runtime._tick_loop())
+            await asyncio.sleep(0.25)
+            runtime.stop()
+            await asyncio.sleep(0)
+            return runtime
+
+        runtime = asyncio.run(scenario())
+        assert max(peak) == 1
+        assert 1 <= len(sent) <= 3
+        assert metrics.FISHING_TICKS_SKIPPED._values.get(('busy',), 0) > skipped_before
+        assert runtime._interval.stretched
+        assert runtime._priority == 0
+
+
+@pytest.mark.django_db
+class TestTickVersusActions:
+    """Тик не перезаписывает действия игрока, сделанные после загрузки сессий."""
+
+    def _tick_with(self, monkeypatch, player, action):
+        """Тик, у которого действие игрока вклинивается между загрузкой сессий и переходами."""
+        from apps.fishing.models import GameTime
+        from apps.fishing.use_cases.status import FishingStatusUseCase
+        from config.container import container
+
+        get_instance = GameTime.get_instance
+
+        def interleaved():
+            action()
+            return get_instance()
+
+        monkeypatch.setattr(GameTime, 'get_instance', interleaved)
+        return container.resolve(FishingStatusUseCase).execute(player)
+
+    def test_bite_timeout_keeps_strike(self, monkeypatch, player, fishing_session_bite, game_time):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        session = fishing_session_bite
+        FishingSession.objects.filter(pk=session.pk).update(bite_time=timezone.now() - timedelta(minutes=5))
+
+        def strike():
+            FishingSession.objects.filter(pk=session.pk).update(state=FishingSession.State.FIGHTING)
+            FightEngineService().create_fight(session, session.hooked_weight, session.hooked_species)
+
+        result = self._tick_with(monkeypatch, player, strike)
+
+        session.refresh_from_db()
+        assert session.state == FishingSession.State.FIGHTING
+        assert session.hooked_species is not None
+        assert [s.state for s in result.sessions] == [FishingSession.State.FIGHTING]
+        assert session.pk in result.fights
+
+    def test_kept_session_is_not_reinserted(self, monkeypatch, player, fishing_session_waiting, fish_species,
+                                            game_time):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        session = fishing_session_waiting
+        FishingSession.objects.filter(pk=session.pk).update(
+            state=FishingSession.State.NIBBLE, nibble_time=timezone.now() - timedelta(minutes=1),
+            nibble_duration=1.0, hooked_species=fish_species, hooked_weight=1.0, hooked_length=20.0,
+        )
+
+        result = self._tick_with(monkeypatch, player, lambda: FishingSession.objects.filter(pk=session.pk).delete())
+
+        assert not FishingSession.objects.filter(pk=session.pk).exists()
+        assert result.sessions == []
+
+    def test_tick_waits_for_action(self):
+        import asyncio
+        from types import SimpleNamespace
+        from apps.fishing.runtime import PlayerRuntime
+
+        events = []
+
+        async def send(payload):
+            pass
+
+        async def scenario():
+            runtime = PlayerRuntime(SimpleNamespace(pk=1), send)
+
+            async def strike(content):
+                events.append('strike')
+                await asyncio.sleep(0.05)
+                events.append('strike done')
+
+            async def tick():
+                events.append('tick')
+                return {'type': 'state', 'sessions': []}
+
+            runtime._handlers['strike'] = strike
+            runtime._do_tick = tick
+            action = asyncio.create_task(runtime.handle({'action': 'strike'}))
+            await asyncio.sleep(0.01)
+            await runtime._run_tick()
+            await action
+
+        asyncio.run(scenario())
+        assert events == ['strike', 'strike done', 'tick']
+
+
+# ──────────────────────── потоки случайных чисел ────────────────────────
+
+class TestRandomStreams:
+    """RandomService: потоки по seed, запись и воспроизведение."""
+
+    def test_unseeded_is_random_module(self):
+        import random
+        from config.rng import RandomService
+
+        assert RandomService(seed=None, mode='').session(1) is random
+
+    def test_seeded_streams_do_not_depend_on_interleaving(self):
+        from config.rng import RandomService
+
+        a, b = RandomService(seed=42), RandomService(seed=42)
+        first = [a.session(1).random() for _ in range(3)]
+        b.session(2).random()
+        b.player(1).uniform(0, 1)
+        assert [b.session(1).random() for _ in range(3)] == first
+        assert RandomService(seed=43).session(1).random() != first[0]
+
+    def test_evicted_stream_continues(self, settings):
+        """Вытесненный по RNG_MAX_STREAMS поток продолжает, а не повторяет первые значения."""
+        from config.rng import RandomService
+
+        settings.RNG_MAX_STREAMS = 1
+        reference = RandomService(seed=5)
+        expected = [reference.session(1).random() for _ in range(4)]
+
+        rng = RandomService(seed=5)
+        drawn = [rng.session(1).random(), rng.session(1).random()]
+        rng.session(2).random()  # вытесняет session:1
+        drawn += [rng.session(1).random(), rng.session(1).random()]
+        assert drawn == expected
+
+    @pytest.mark.django_db
+    def test_stream_forgotten_with_session(self, fishing_session_waiting, monkeypatch):
+        """Удаление FishingSession забывает её поток."""
+        from config.container import container
+        from config.rng import RandomService
+
+        rng = container.resolve(RandomService)
+        monkeypatch.setattr(rng, 'seed', 1)
+        key = f'session:{fishing_session_waiting.pk}'
+        rng.session(fishing_session_waiting.pk).random()
+        assert key in rng._streams
+        fishing_session_waiting.delete()
+        assert key not in rng._streams and key not in rng._parked
+
+    def test_record_and_replay(self, tmp_path):
+        from config.rng import RandomService, ReplayExhausted
+
+        log = str(tmp_path / 'rng.jsonl')
+
+        def draw(rng):
+            return (
+                rng.session(7).uniform(10, 30), rng.session(7).choices('abc', weights=[1, 2, 3])[0],
+                rng.player(3).randint(1, 100), rng.session(7).betavariate(2, 5),
+            )
+
+        recorded = draw(RandomService(seed=None, mode='record', log_path=log))
+        replay = RandomService(seed=None, mode='replay', log_path=log)
+        assert draw(replay) == recorded
+        with pytest.raises(ReplayExhausted):
+            replay.session(7).random()
+
+    @pytest.mark.django_db
+    def test_fight_engine_is_reproducible(self, fishing_session_waiting, fish_species):
+        from config.rng import RandomService
+
+        distances = []
+        for _ in range(2):
+            svc = FightEngineService(RandomService(seed=1))
+            fight = svc.create_fight(fishing_session_waiting, fish_weight=1.5, fish_species=fish_species)
+            svc.reel_in(fight)
+            distances.append(fight.distance)
+            fight.delete()
+        assert distances[0] == distances[1]
+
+
+# ──────────────────────── формулы и симулятор баланса ────────────────────────
+
+class TestBalanceFormulas:
+    """Формулы дают одно и то же на числах и массивах NumPy."""
+
+    def test_scalar_and_array_agree(self):
+        np = pytest.importorskip('numpy')
+        from apps.fishing import formulas
+
+        weights = [0.05, 1.0, 12.5]
+        strengths = formulas.normalized_strength(np.array(weights), 2.0)
+        assert list(strengths) == pytest.approx([formulas.normalized_strength(w, 2.0) for w in weights])
+        karma = [-2000, -100, 0, 300, 5000]
+        assert list(formulas.karma_bite_modifier(np.array(karma))) == pytest.approx(
+            [formulas.karma_bite_modifier(k) for k in karma],
+        )
+        sold = [0.0, 100.0, 1000.0]
+        assert list(formulas.price_modifier(np.array(sold))) == pytest.approx([1.0, 0.8, 0.5])
+
+    def test_models_use_formulas(self):
+        from apps.fishing.services.fight_engine import _normalized_strength
+        from apps.tackle.models import FishPriceDynamic
+
+        assert FishPriceDynamic.modifier_for(100.0) == pytest.approx(0.8)
+        assert _normalized_strength(0.0, 'legendary') == 1.0
+        assert _normalized_strength(1000.0, 'common') == 10.0
+
+
+class TestSimulateBalance:
+    """Команда simulate_balance по фикстурам, без БД."""
+
+    def test_report(self):
+        pytest.importorskip('numpy')
+        import json
+        from io import StringIO
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command(
+            'simulate_balance', '--casts', '400', '--anglers', '20', '--location', '1',
+            '--reel', '1', '--line', '1', '--bait', '1', '--bait', '5', '--seed', '7', '--json',
+            stdout=out,
+        )
+        rows = json.loads(out.getvalue())
+        assert [row['bait'] for row in rows] == [1, 5]
+        for row in rows:
+            assert 0 < row['bite_chance'] <= 0.5
+            assert 0 <= row['line_break_rate'] <= 1 - row['catch_rate'] + 1e-9
+            assert sum(row['species_mix'].values()) == pytest.approx(1.0, abs=1e-3)
+            income = row['income_per_hour']
+            assert 0 < income['p10'] <= income['p50'] <= income['p90']
+
+    def test_seed_is_reproducible(self):
+        pytest.importorskip('numpy')
+        from io import StringIO
+        from django.core.management import call_command
+
+        runs = []
+        for _ in range(2):
+            out = StringIO()
+            call_command('simulate_balance', '--casts', '200', '--location', '2', '--seed', '3', '--json', stdout=out)
+            runs.append(out.getvalue())
+        assert runs[0] == runs[1]
+
+    def test_cast_points_in_client_units(self, monkeypatch):
+        """Точки заброса — проценты 0..100, как у сервисов; глубина — та же cast_depth."""
+        np = pytest.importorskip('numpy')
+        from apps.fishing import simulation
+
+        points = []
+        real_cast_depth = simulation.cast_depth
+
+        def recording(raster, x, y):
+            points.append((x, y))
+            return real_cast_depth(raster, x, y)
+
+        monkeypatch.setattr(simulation, 'cast_depth', recording)
+        catalog = simulation.load_catalog()
+        tackle = simulation.default_tackles(catalog)[0]
+        simulation.simulate(catalog, 1, tackle, casts=200, rng=np.random.default_rng(1))
+        xs = [c for point in points for c in point]
+        assert len(points) == 200
+        assert 0 <= min(xs) and max(xs) <= 100
+        assert max(xs) > 50
@@ -0,0 +1,126 @@
+"""Планирование тиков рыбалки под нагрузкой.
+
+TickLimiter ограничивает число тиков, одновременно ждущих БД в процессе
+(settings.FISHING_MAX_INFLIGHT_TICKS): остальные ждут слота в порядке
+приоритета — сначала игроки с поклёвкой или вываживанием, затем
+ожидающие поклёвки, затем без активных сессий. Не дождавшийся слота за
+интервал тик пропускается. TickInterval растягивает интервал игрока,
+пока тики медленные или лимит исчерпан, и возвращает его к базовому.
+"""
+
+import asyncio
+import heapq
+import itertools
+import weakref
+
+from django.conf import settings
+
+from config import metrics
+
+HOT, WAITING, IDLE = 0, 1, 2
+
+HOT_STATES = frozenset({'nibble', 'bite', 'fighting'})
+
+DEFAULT_TICK_SECONDS = 1.5
+DEFAULT_TICK_MAX_SECONDS = 6.0
+# Тик дольше этой доли интервала считается признаком перегрузки.
+SLOW_TICK_RATIO = 0.5
+STRETCH_FACTOR = 1.5
+RELAX_FACTOR = 0.75
+
+
+def tick_priority(sessions) -> int:
+    """Приоритет по состояниям сессий из кадра state."""
+    states = {s['state'] for s in sessions}
+    if states & HOT_STATES:
+        return HOT
+    if 'waiting' in states:
+        return WAITING
+    return IDLE
+
+
+class TickLimiter:
+    """Семафор с приоритетной очередью ожидания (на event loop)."""
+
+    def __init__(self, limit):
+        self.limit = max(1, limit)
+        self.inflight = 0
+        self._waiters = []
+        self._seq = itertools.count()
+
+    @property
+    def saturated(self) -> bool:
+        return self.inflight >= self.limit
+
+    async def acquire(self, priority=IDLE, timeout=None) -> bool:
+        """True — слот получен; False — не дождались за timeout."""
+        if self.inflight < self.limit and not self._waiters:
+            self._take()
+            return True
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        try:
+            await asyncio.wait({future}, timeout=timeout)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            future.cancel()
+            raise
+        if future.done() and not future.cancelled():
+            return True
+        future.cancel()
+        return False
+
+    def release(self):
+        # Слот передаётся первому живому ожидающему, inflight не меняется.
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(True)
+                return
+        self.inflight -= 1
+        metrics.FISHING_TICKS_INFLIGHT.dec()
+
+    def _take(self):
+        self.inflight += 1
+        metrics.FISHING_TICKS_INFLIGHT.inc()
+
+
+_limiters = weakref.WeakKeyDictionary()
+
+
+def get_limiter() -> TickLimiter:
+    """Лимитер текущего event loop."""
+    loop = asyncio.get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        limit = getattr(settings, 'FISHING_MAX_INFLIGHT_TICKS', settings.DB_EXECUTOR_THREADS // 2)
+        limiter = _limiters[loop] = TickLimiter(limit)
+    return limiter
+
+
+class TickInterval:
+    """Интервал тиков игрока: растёт при перегрузке, возвращается к базовому."""
+
+    __slots__ = ('base', 'maximum', 'current')
+
+    def __init__(self, base=None, maximum=None):
+        self.base = base or getattr(settings, 'FISHING_TICK_SECONDS', DEFAULT_TICK_SECONDS)
+        self.maximum = max(self.base, maximum or getattr(
+            settings, 'FISHING_TICK_MAX_SECONDS', DEFAULT_TICK_MAX_SECONDS,
+        ))
+        self.current = self.base
+
+    @property
+    def stretched(self) -> bool:
+        return self.current > self.base
+
+    def stretch(self):
+        self.current = min(self.current * STRETCH_FACTOR, self.maximum)
+
+    def observe(self, duration, saturated=False):
+        """Учитывает длительность завершённого тика."""
+        if saturated or duration > self.current * SLOW_TICK_RATIO:
+            self.stretch()
+        else:
+            self.current = max(self.base, self.current * RELAX_FACTOR)
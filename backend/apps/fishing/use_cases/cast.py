@@ -7,6 +7,7 @@ from django.utils import timezone
 
 from apps.fishing.models import FishingSession
 from apps.inventory.models import PlayerRod
+from apps.world.depth import CAST_SCALE
 
 MAX_RODS = settings.GAME_SETTINGS.get('MAX_ACTIVE_RODS', 3)
 
@@ -27,6 +28,10 @@ class CastUseCase:
         if not player.current_location:
             raise ValueError('Вы не на локации.')
 
+        point_x, point_y = float(point_x), float(point_y)
+        if not all(0 <= p <= CAST_SCALE for p in (point_x, point_y)):
+            raise ValueError(f'Точка заброса задаётся в процентах: 0..{CAST_SCALE:g}.')
+
         try:
             rod = PlayerRod.objects.select_related(
                 'rod_type', 'reel', 'line', 'hook', 'float_tackle', 'bait',
@@ -65,13 +65,15 @@ class KeepFishUseCase:
             location=session.location,
         )
 
-        player.add_experience(caught.experience_reward)
+        # Опыт, бонус самогона и награды достижений копятся в памяти
+        # и сохраняются одним UPDATE игрока (player.flush ниже).
+        player.reward(experience=caught.experience_reward)
 
         # Бонус опыта от самогона
         exp_boost = self._moonshine.get_buff_effect_value(player, 'experience_boost')
         if exp_boost:
             bonus = int(caught.experience_reward * exp_boost)
-            player.add_experience(bonus)
+            player.reward(experience=bonus)
 
         record = self._records.check_record(
             player, session.hooked_species, session.hooked_weight,
@@ -84,7 +86,8 @@ class KeepFishUseCase:
         completed_quests = self._quests.update_quest_progress(
             player, session.hooked_species, session.hooked_weight, session.location,
         )
-        new_achievements = self._records.check_achievements(player)
+        new_achievements = self._records.check_achievements(player, flush=False)
+        player.flush()
         star_drop = self._potions.drop_marine_star(player)
 
         # Расходуем наживку
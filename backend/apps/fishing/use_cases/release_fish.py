@@ -27,11 +27,9 @@ class ReleaseFishUseCase:
             raise ValueError('Данные о рыбе повреждены.')
 
         karma_bonus = max(1, int(session.hooked_weight))
-        player.karma += karma_bonus
-        player.save(update_fields=['karma'])
-
         exp = int(session.hooked_species.experience_per_kg * session.hooked_weight * 0.5)
-        player.add_experience(exp)
+        player.reward(karma=karma_bonus, experience=exp)
+        player.flush()
 
         # Расходуем наживку
         rod = session.rod
@@ -1,13 +1,14 @@
 """Use case: статус всех рыболовных сессий (polling)."""
 
-import random
 from dataclasses import dataclass
 
 from django.utils import timezone
 
+from apps.fishing import formulas
 from apps.fishing.models import FightState, FishingSession, GameTime
 from apps.fishing.services.bite_calculator import BiteCalculatorService
 from apps.fishing.services.fish_selector import FishSelectorService
+from config.rng import RandomService
 
 SELECT_RELATED = (
     'location', 'rod__rod_type', 'rod__reel', 'rod__line',
@@ -29,9 +30,11 @@ class FishingStatusUseCase:
         self,
         bite_calculator: BiteCalculatorService,
         fish_selector: FishSelectorService,
+        rng: RandomService,
     ):
         self._bite = bite_calculator
         self._fish = fish_selector
+        self._rng = rng
 
     def execute(self, player) -> FishingStatusResult:
         """Возвращает статус всех сессий игрока."""
@@ -48,49 +51,55 @@ class FishingStatusUseCase:
 
         now = timezone.now()
 
+        # Переходы условные: UPDATE ... WHERE state=<ожидаемое>. Если действие
+        # игрока (подсечка, садок) успело раньше, тик не перезаписывает его
+        # и не вставляет удалённую сессию заново — она перечитывается из БД.
+        stale = set()
+
         # Фаза A: Expire BITE → WAITING (таймаут bite_duration)
         for session in sessions:
             if session.state == FishingSession.State.BITE and session.bite_time:
                 timeout = session.bite_duration or 30.0
                 if (now - session.bite_time).total_seconds() > timeout:
-                    session.state = FishingSession.State.WAITING
-                    session.hooked_species = None
-                    session.hooked_weight = None
-                    session.hooked_length = None
-                    session.bite_time = None
-                    session.bite_duration = None
-                    session.nibble_time = None
-                    session.nibble_duration = None
-                    session.save()
+                    if not self._transition(
+                        session, FishingSession.State.WAITING,
+                        hooked_species=None, hooked_weight=None, hooked_length=None,
+                        bite_time=None, bite_duration=None,
+                        nibble_time=None, nibble_duration=None,
+                    ):
+                        stale.add(session.pk)
 
         # Фаза B: Transition NIBBLE → BITE (таймаут nibble_duration)
         for session in sessions:
             if session.state == FishingSession.State.NIBBLE and session.nibble_time:
                 timeout = session.nibble_duration or 3.0
                 if (now - session.nibble_time).total_seconds() > timeout:
-                    session.state = FishingSession.State.BITE
-                    session.bite_time = timezone.now()
-                    session.bite_duration = random.uniform(20.0, 40.0)
-                    session.nibble_time = None
-                    session.nibble_duration = None
-                    session.save()
+                    if not self._transition(
+                        session, FishingSession.State.BITE,
+                        bite_time=timezone.now(),
+                        bite_duration=self._rng.session(session.pk).uniform(20.0, 40.0),
+                        nibble_time=None, nibble_duration=None,
+                    ):
+                        stale.add(session.pk)
 
         # Фаза C: Try nibble (WAITING → NIBBLE)
-        deleted_ids = set()
         for session in sessions:
-            if session.state == FishingSession.State.WAITING:
+            if session.state == FishingSession.State.WAITING and session.pk not in stale:
                 if self._bite.try_bite(player, session.location, session.rod, session):
-                    fish = self._fish.select_fish(session.location, session.rod)
+                    fish = self._fish.select_fish(session.location, session.rod, session)
                     if fish:
-                        weight = self._fish.generate_fish_weight(fish, player)
-                        length = self._fish.generate_fish_length(fish, weight)
-                        session.state = FishingSession.State.NIBBLE
-                        session.nibble_time = timezone.now()
-                        session.nibble_duration = random.uniform(1.0, 3.0)
-                        session.hooked_species = fish
-                        session.hooked_weight = weight
-                        session.hooked_length = length
-                        session.save()
+                        weight = self._fish.generate_fish_weight(fish, player, session)
+                        length = self._fish.generate_fish_length(fish, weight, session)
+                        if not self._transition(
+                            session, FishingSession.State.NIBBLE,
+                            nibble_time=timezone.now(),
+                            nibble_duration=self._rng.session(session.pk).uniform(*formulas.NIBBLE_SECONDS),
+                            hooked_species=fish, hooked_weight=weight, hooked_length=length,
+                        ):
+                            stale.add(session.pk)
+
+        if stale:
+            sessions = self._reload(sessions, stale)
 
         # Собираем fights
         fights = {}
@@ -101,7 +110,27 @@ class FishingStatusUseCase:
                 except FightState.DoesNotExist:
                     pass
 
-        # Убираем удалённые сессии из итогового списка
-        sessions = [s for s in sessions if s.pk not in deleted_ids]
-
         return FishingStatusResult(sessions=sessions, fights=fights, game_time=gt)
+
+    @staticmethod
+    def _transition(session, state, **fields) -> bool:
+        """Переводит сессию из её текущего состояния в state; False, если состояние уже сменилось."""
+        updated = FishingSession.objects.filter(pk=session.pk, state=session.state).update(
+            state=state, **fields,
+        )
+        if not updated:
+            return False
+        session.state = state
+        for name, value in fields.items():
+            setattr(session, name, value)
+        return True
+
+    @staticmethod
+    def _reload(sessions, stale) -> list:
+        """Сессии, изменённые в обход тика, — из БД; удалённые выпадают."""
+        fresh = FishingSession.objects.filter(pk__in=stale).select_related(*SELECT_RELATED).in_bulk()
+        return [
+            fresh[s.pk] if s.pk in stale else s
+            for s in sessions
+            if s.pk not in stale or s.pk in fresh
+        ]
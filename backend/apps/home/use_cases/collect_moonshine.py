@@ -37,8 +37,8 @@ class CollectMoonshineUseCase:
         # Мгновенный эффект — восстановление сытости
         if recipe.effect_type == 'hunger_restore':
             restored = int(recipe.effect_value)
-            player.hunger = min(100, player.hunger + restored)
-            player.save(update_fields=['hunger'])
+            player.feed(restored)
+            player.save(update_fields=player.HUNGER_FIELDS)
             session.delete()
             return CollectMoonshineResult(
                 recipe_name=recipe.name,
@@ -1,7 +1,5 @@
 """Celery-задачи рыбнадзора."""
 
-import random
-
 from celery import shared_task
 
 
@@ -14,16 +12,26 @@ def fish_inspection():
     и с вероятностью 10% проводит проверку каждого.
     """
     from apps.accounts.models import Player
+    from apps.world.services import OccupancyService
     from config.container import container
+    from config.rng import RandomService
 
     from .services import InspectionService
 
     svc = container.resolve(InspectionService)
 
-    active_players = Player.objects.filter(
-        current_location__isnull=False,
-    )
-
-    for player in active_players:
-        if random.random() < 0.20:
-            svc.inspect_player(player)
+    # Кто на локациях — из OccupancyService, без обхода таблицы игроков;
+    # из БД читаются только выбранные для проверки. Пока хранилище не
+    # засеяно (сброс Redis, первый деплой) — список берётся из БД.
+    occupancy = container.resolve(OccupancyService)
+    if occupancy.seeded:
+        present = occupancy.present_player_ids()
+    else:
+        present = list(
+            Player.objects.filter(current_location__isnull=False)
+            .order_by('pk').values_list('pk', flat=True),
+        )
+    rng = container.resolve(RandomService).stream('inspection')
+    chosen = [player_id for player_id in present if rng.random() < 0.20]
+    for player in Player.objects.filter(pk__in=chosen, current_location__isnull=False):
+        svc.inspect_player(player)
@@ -296,3 +296,23 @@ class TestInspectPlayer:
         inspection = self.svc.inspect_player(player)
 
         assert inspection.violation_found is False
+
+
+@pytest.mark.django_db
+class TestInspectionQueryBudget:
+    """Регрессии числа запросов InspectionService."""
+
+    def test_inspect_full_creel(self, assert_max_queries, player, fish_species, location):
+        """Число запросов не зависит от размера садка."""
+        counts = []
+        for size in (1, 10):
+            CaughtFish.objects.filter(player=player).delete()
+            for _ in range(size):
+                CaughtFish.objects.create(
+                    player=player, species=fish_species,
+                    weight=1.0, length=20.0, location=location,
+                )
+            with assert_max_queries(2) as stats:
+                InspectionService().inspect_player(player)
+            counts.append(stats.count)
+        assert counts[0] == counts[1]
@@ -2,6 +2,9 @@
 
 from rest_framework import serializers
 
+from apps.tackle.images import thumbnail_urls
+from apps.tackle.serializers import ThumbnailsField
+
 from .models import CaughtFish, InventoryItem, PlayerRod
 
 
@@ -9,10 +12,11 @@ class InventoryItemSerializer(serializers.ModelSerializer):
     item_type = serializers.CharField(source='content_type.model', read_only=True)
     item_name = serializers.SerializerMethodField()
     item_image = serializers.SerializerMethodField()
+    item_thumbs = serializers.SerializerMethodField()
 
     class Meta:
         model = InventoryItem
-        fields = ['id', 'item_type', 'object_id', 'item_name', 'item_image', 'quantity']
+        fields = ['id', 'item_type', 'object_id', 'item_name', 'item_image', 'item_thumbs', 'quantity']
 
     def get_item_name(self, obj):
         if obj.content_type.model_class() is None:
@@ -33,6 +37,13 @@ class InventoryItemSerializer(serializers.ModelSerializer):
             return item.image.url
         return None
 
+    def get_item_thumbs(self, obj):
+        """URL WebP-миниатюр предмета."""
+        if obj.content_type.model_class() is None:
+            return None
+        image = getattr(obj.item, 'image', None)
+        return thumbnail_urls(image, self.context.get('request')) if image else None
+
 
 class PlayerRodSerializer(serializers.ModelSerializer):
     rod_type_name = serializers.CharField(source='rod_type.name', read_only=True)
@@ -76,13 +87,14 @@ class CaughtFishSerializer(serializers.ModelSerializer):
     species_name = serializers.CharField(source='species.name_ru', read_only=True)
     species_rarity = serializers.CharField(source='species.rarity', read_only=True)
     species_image = serializers.ImageField(source='species.image', read_only=True)
+    species_thumbs = ThumbnailsField(source='species.image')
     sell_price = serializers.ReadOnlyField()
     experience_reward = serializers.ReadOnlyField()
 
     class Meta:
         model = CaughtFish
         fields = [
-            'id', 'species', 'species_name', 'species_rarity', 'species_image',
+            'id', 'species', 'species_name', 'species_rarity', 'species_image', 'species_thumbs',
             'weight', 'length', 'location', 'caught_at',
             'is_sold', 'is_released', 'is_record', 'sell_price', 'experience_reward',
         ]
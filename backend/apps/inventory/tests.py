@@ -1,7 +1,11 @@
 """Тесты API инвентаря."""
 
 import pytest
+from decimal import Decimal
+
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from apps.inventory.models import CaughtFish, InventoryItem, PlayerRod
 
@@ -31,6 +35,32 @@ class TestInventory:
         assert item['item_type'] == 'rodtype'
         assert item['quantity'] == 2
 
+    def test_query_count_does_not_grow_with_items(self, api_client, player, rod_type, hook, bait):
+        """GFK резолвится пачкой: число запросов не зависит от размера инвентаря."""
+        from apps.tackle.models import Hook
+
+        for obj in (rod_type, hook, bait):
+            InventoryItem.objects.create(
+                player=player, content_type=ContentType.objects.get_for_model(obj),
+                object_id=obj.pk, quantity=1,
+            )
+        with CaptureQueriesContext(connection) as small:
+            resp = api_client.get(self.URL)
+        assert len(resp.data['results']) == 3
+
+        ct_hook = ContentType.objects.get_for_model(Hook)
+        for i in range(20):
+            extra = Hook.objects.create(name=f'Крючок {i}', size=i, price=Decimal('1.00'))
+            InventoryItem.objects.create(
+                player=player, content_type=ct_hook, object_id=extra.pk, quantity=1,
+            )
+        with CaptureQueriesContext(connection) as large:
+            resp = api_client.get(self.URL)
+
+        assert len(resp.data['results']) == 23
+        assert resp.data['results'][-1]['item_name'] == 'Крючок 19 #19'
+        assert len(large) == len(small)
+
 
 # ─────────────────────────── Player Rods ────────────────────
 
@@ -189,7 +219,7 @@ class TestEat:
         )
 
         player.hunger = 50
-        player.save(update_fields=['hunger'])
+        player.save(update_fields=player.HUNGER_FIELDS)
 
         resp = api_client.post(self.URL, {'food_id': food.pk})
 
@@ -30,7 +30,7 @@ class EatUseCase:
         else:
             inv.save(update_fields=['quantity'])
 
-        player.hunger = min(100, player.hunger + food.satiety)
-        player.save(update_fields=['hunger'])
+        hunger = player.feed(food.satiety)
+        player.save(update_fields=player.HUNGER_FIELDS)
 
-        return player.hunger
+        return hunger
@@ -0,0 +1,61 @@
+"""Утилиты инвентаря — пакетный резолв GenericForeignKey."""
+
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+
+
+def resolve_generic_objects(pairs):
+    """
+    Загружает объекты по парам (content_type_id, object_id).
+
+    Пары группируются по типу, каждая модель читается одним in_bulk.
+    Возвращает dict {(content_type_id, object_id): объект}; отсутствующие
+    объекты и типы без модели в результат не попадают.
+    """
+    ids_by_ct = defaultdict(set)
+    for ct_id, obj_id in pairs:
+        if ct_id is not None and obj_id is not None:
+            ids_by_ct[ct_id].add(obj_id)
+
+    resolved = {}
+    for ct_id, ids in ids_by_ct.items():
+        model = ContentType.objects.get_for_id(ct_id).model_class()
+        if model is None:
+            continue
+        for pk, obj in model._base_manager.in_bulk(ids).items():
+            resolved[(ct_id, pk)] = obj
+    return resolved
+
+
+def prefetch_generic_items(objects, field_name='item'):
+    """
+    Пакетно резолвит GenericForeignKey у списка объектов.
+
+    Найденные объекты кладутся в кэш GFK, поэтому последующие обращения
+    к obj.item (в сериализаторах) не делают запросов. Возвращает список.
+    """
+    objects = list(objects)
+    if not objects:
+        return objects
+
+    gfk = objects[0]._meta.get_field(field_name)
+    ct_attname = gfk.model._meta.get_field(gfk.ct_field).attname
+    keys = [(getattr(obj, ct_attname), getattr(obj, gfk.fk_field)) for obj in objects]
+
+    resolved = resolve_generic_objects(keys)
+    for obj, key in zip(objects, keys):
+        gfk.set_cached_value(obj, resolved.get(key))
+    return objects
+
+
+class GenericItemPrefetchMixin:
+    """Mixin для ListAPIView: резолвит GFK `item` у страницы одним запросом на тип."""
+
+    generic_item_field = 'item'
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            page = prefetch_generic_items(page, self.generic_item_field)
+        return page
@@ -21,6 +21,7 @@ from .use_cases.disassemble_rod import DisassembleRodUseCase
 from .use_cases.eat import EatUseCase
 from .use_cases.equip_rod import EquipRodUseCase
 from .use_cases.unequip_rod import UnequipRodUseCase
+from .utils import GenericItemPrefetchMixin
 
 
 def _resolve(use_case_cls):
@@ -29,13 +30,15 @@ def _resolve(use_case_cls):
     return container.resolve(use_case_cls)
 
 
-class InventoryView(generics.ListAPIView):
+class InventoryView(GenericItemPrefetchMixin, generics.ListAPIView):
     """Инвентарь игрока."""
 
     serializer_class = InventoryItemSerializer
 
     def get_queryset(self):
-        return InventoryItem.objects.filter(player=self.request.user.player)
+        return InventoryItem.objects.filter(
+            player=self.request.user.player,
+        ).select_related('content_type').order_by('pk')
 
 
 class PlayerRodsView(generics.ListAPIView):
@@ -7,3 +7,6 @@ class PotionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.potions'
     verbose_name = 'Зелья'
+
+    def ready(self):
+        from . import services  # noqa: F401 — сигналы сброса каталога звёзд
@@ -1,23 +1,74 @@
 """Сервисы зелий — дроп звёзд, проверка эффектов."""
 
-import random
+from bisect import bisect_right
+
+from django.db.models import F
+
+from config.catalog import VersionedCatalog
+from config.rng import RandomService
+
+from .models import MarineStar
+
+STAR_CATALOG_VERSION_KEY = 'potions:stars:version'
+
+
+class StarCatalog:
+    """
+    Снимок каталога MarineStar для дропа одним броском.
+
+    Раньше каждая звезда бросалась отдельно по порядку, первая удачная
+    выпадала: P(i) = p_i * П(1 - p_j), j < i. cumulative хранит суммы этих
+    вероятностей, поэтому одно random() и bisect дают то же распределение.
+    """
+
+    def __init__(self, stars):
+        self.stars = stars
+        self.cumulative = []
+        total, miss = 0.0, 1.0
+        for star in stars:
+            chance = min(max(star.drop_chance, 0.0), 1.0)
+            total += miss * chance
+            miss *= 1.0 - chance
+            self.cumulative.append(total)
+
+    def draw(self, roll):
+        """Звезда для броска roll ∈ [0, 1) или None."""
+        idx = bisect_right(self.cumulative, roll)
+        return self.stars[idx] if idx < len(self.stars) else None
+
+
+star_catalog = VersionedCatalog(
+    STAR_CATALOG_VERSION_KEY, lambda: StarCatalog(list(MarineStar.objects.order_by('pk'))),
+)
+star_catalog.watch(MarineStar)
+
+
+def get_star_catalog() -> StarCatalog:
+    """Каталог звёзд процесса; пересобирается при смене версии в кэше."""
+    return star_catalog.get()
 
 
 class PotionService:
     """Сервис зелий: дроп звёзд, проверка активных эффектов."""
 
+    def __init__(self, rng: RandomService = None):
+        self._rng = rng or RandomService()
+
     def drop_marine_star(self, player):
         """Попытка дропа морской звезды при поимке рыбы. Возвращает dict или None."""
-        from .models import MarineStar, PlayerStar
+        from .models import PlayerStar
 
-        stars = list(MarineStar.objects.all())
-        for star in stars:
-            if random.random() < star.drop_chance:
-                ps, _ = PlayerStar.objects.get_or_create(player=player, star=star)
-                ps.quantity += 1
-                ps.save(update_fields=['quantity'])
-                return {'star_color': star.color, 'star_name': star.name}
-        return None
+        star = get_star_catalog().draw(self._rng.player(player.pk).random())
+        if star is None:
+            return None
+        updated = PlayerStar.objects.filter(player=player, star=star).update(quantity=F('quantity') + 1)
+        if not updated:
+            _, created = PlayerStar.objects.get_or_create(
+                player=player, star=star, defaults={'quantity': 1},
+            )
+            if not created:
+                PlayerStar.objects.filter(player=player, star=star).update(quantity=F('quantity') + 1)
+        return {'star_color': star.color, 'star_name': star.name}
 
     def has_active_potion(self, player, effect_type):
         """Проверяет, есть ли у игрока активное зелье нужного типа."""
@@ -127,3 +127,34 @@ class TestCraftPotion:
     def test_craft_not_found(self, api_client):
         resp = api_client.post('/api/potions/craft/', {'potion_id': 9999})
         assert resp.status_code == 404
+
+    def test_craft_spends_last_stars(self, player_with_stars, potion_rank, game_time):
+        from apps.potions.use_cases.craft_potion import CraftPotionUseCase
+        PlayerStar.objects.filter(player=player_with_stars, star__color='blue').update(quantity=1)
+        CraftPotionUseCase().execute(player_with_stars, potion_rank.pk)
+        assert list(
+            PlayerStar.objects.filter(player=player_with_stars).values_list('star__color', 'quantity'),
+        ) == [('red', 4)]
+
+    def test_craft_stars_spent_concurrently(self, player_with_stars, potion_luck, game_time):
+        from apps.potions.use_cases.craft_potion import CraftPotionUseCase
+
+        class RacingCraft(CraftPotionUseCase):
+            @staticmethod
+            def _spend(player, potion, owned):
+                # Параллельный крафт успел потратить звёзды после проверки.
+                PlayerStar.objects.filter(player=player, star__color='red').update(quantity=1)
+                CraftPotionUseCase._spend(player, potion, owned)
+
+        with pytest.raises(ValueError, match='уже потрачены'):
+            RacingCraft().execute(player_with_stars, potion_luck.pk)
+        player_with_stars.refresh_from_db()
+        assert player_with_stars.karma == 200
+        assert not PlayerPotion.objects.filter(player=player_with_stars).exists()
+
+    def test_craft_query_count(self, assert_max_queries, player_with_stars, potion_luck, game_time):
+        from apps.potions.use_cases.craft_potion import CraftPotionUseCase
+        # Зелье, звёзды, карма, звезда, удаление пустых, GameTime, PlayerPotion
+        # и SAVEPOINT/RELEASE atomic() внутри тестовой транзакции.
+        with assert_max_queries(9):
+            CraftPotionUseCase().execute(player_with_stars, potion_luck.pk)
@@ -282,3 +282,61 @@ class TestGetPotionEffectValue:
         # Их эффект применяется сразу
         value = self.svc.get_potion_effect_value(player, 'rank_boost')
         assert value is None
+
+
+@pytest.mark.django_db
+class TestPotionsQueryBudget:
+    """Регрессии числа запросов PotionService."""
+
+    def setup_method(self):
+        self.svc = PotionService()
+
+    def test_effect_lookup(self, assert_max_queries, player, potion_luck, game_time):
+        with assert_max_queries(1):
+            self.svc.get_potion_effect_value(player, 'luck')
+
+    @patch('random.random')
+    def test_drop_marine_star(self, mock_random, assert_max_queries, player, marine_star_red, marine_star_blue):
+        mock_random.return_value = 0.01
+        with assert_max_queries(6):
+            self.svc.drop_marine_star(player)
+
+    @patch('random.random')
+    def test_drop_marine_star_warm(self, mock_random, assert_max_queries, player, marine_star_red):
+        mock_random.return_value = 0.01
+        self.svc.drop_marine_star(player)
+        # Каталог в памяти процесса, звезда уже есть — один UPDATE.
+        with assert_max_queries(1):
+            self.svc.drop_marine_star(player)
+        assert PlayerStar.objects.get(player=player, star=marine_star_red).quantity == 2
+
+
+@pytest.mark.django_db
+class TestStarCatalog:
+    """Кэшированный каталог звёзд с накопленными вероятностями."""
+
+    def test_cumulative_matches_sequential_rolls(self, marine_star_red, marine_star_blue):
+        from apps.potions.services import get_star_catalog
+        catalog = get_star_catalog()
+        assert [s.color for s in catalog.stars] == ['red', 'blue']
+        assert catalog.cumulative == pytest.approx([0.05, 0.05 + 0.95 * 0.03])
+        assert catalog.draw(0.0).color == 'red'
+        assert catalog.draw(0.05).color == 'blue'
+        assert catalog.draw(0.0785) is None
+
+    def test_rebuilt_on_change(self, marine_star_red):
+        from apps.potions.services import get_star_catalog
+        assert get_star_catalog().draw(0.5) is None
+        marine_star_red.drop_chance = 1.0
+        marine_star_red.save(update_fields=['drop_chance'])
+        assert get_star_catalog().draw(0.5) == marine_star_red
+
+    def test_rebuilt_after_max_age(self, marine_star_red, monkeypatch):
+        """Изменения в обход сигналов (update()) подхватываются по возрасту снимка."""
+        from apps.potions.models import MarineStar
+        from apps.potions.services import get_star_catalog, star_catalog
+        assert get_star_catalog().draw(0.5) is None
+        MarineStar.objects.filter(pk=marine_star_red.pk).update(drop_chance=1.0)
+        assert get_star_catalog().draw(0.5) is None
+        monkeypatch.setattr(star_catalog, '_max_age', -1)
+        assert get_star_catalog().draw(0.5) == marine_star_red
@@ -2,6 +2,10 @@
 
 from dataclasses import dataclass
 
+from django.db import transaction
+from django.db.models import F
+
+from apps.accounts.models import Player
 from apps.fishing.models import GameTime
 
 from ..models import PlayerPotion, PlayerStar, Potion
@@ -32,26 +36,50 @@ class CraftPotionUseCase:
                 f'Недостаточно кармы. Нужно: {potion.karma_cost}, есть: {player.karma}.',
             )
 
+        # Все звёзды игрока одним запросом: {цвет: (pk, количество)}
+        owned = {
+            color: (pk, quantity)
+            for pk, color, quantity in PlayerStar.objects.filter(
+                player=player,
+            ).values_list('pk', 'star__color', 'quantity')
+        }
         for color, qty in potion.required_stars.items():
-            ps = PlayerStar.objects.filter(player=player, star__color=color).first()
-            if not ps or ps.quantity < qty:
-                have = ps.quantity if ps else 0
+            have = owned.get(color, (None, 0))[1]
+            if have < qty:
                 raise ValueError(
                     f'Недостаточно звёзд ({color}). Нужно: {qty}, есть: {have}.',
                 )
 
-        # Списываем ресурсы
-        player.karma -= potion.karma_cost
-        player.save(update_fields=['karma'])
-
+        with transaction.atomic():
+            self._spend(player, potion, owned)
+            return self._activate(player, potion)
+
+    @staticmethod
+    def _spend(player, potion, owned):
+        """
+        Условные UPDATE с F(): если карму или звёзды успели потратить
+        параллельно, строка не обновится и транзакция откатится.
+        """
+        if not Player.objects.filter(
+            pk=player.pk, karma__gte=potion.karma_cost,
+        ).update(karma=F('karma') - potion.karma_cost):
+            raise ValueError('Недостаточно кармы: она уже потрачена.')
+
+        spent = []
         for color, qty in potion.required_stars.items():
-            ps = PlayerStar.objects.get(player=player, star__color=color)
-            ps.quantity -= qty
-            if ps.quantity <= 0:
-                ps.delete()
-            else:
-                ps.save(update_fields=['quantity'])
+            if qty <= 0:
+                continue
+            pk = owned[color][0]
+            if not PlayerStar.objects.filter(
+                pk=pk, quantity__gte=qty,
+            ).update(quantity=F('quantity') - qty):
+                raise ValueError(f'Недостаточно звёзд ({color}): они уже потрачены.')
+            spent.append(pk)
+        if spent:
+            PlayerStar.objects.filter(pk__in=spent, quantity__lte=0).delete()
+        player.karma -= potion.karma_cost
 
+    def _activate(self, player, potion) -> CraftPotionResult:
         # Одноразовые зелья — мгновенный эффект
         if potion.is_one_time:
             return self._apply_instant(player, potion)
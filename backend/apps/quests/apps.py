@@ -5,3 +5,6 @@ class QuestsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.quests'
     verbose_name = 'Квесты'
+
+    def ready(self):
+        from . import availability  # noqa: F401 — сигналы сброса графа квестов
@@ -0,0 +1,105 @@
+"""Доступность квестов: граф каталога в памяти и битсеты прогресса игроков.
+
+Каталог квестов почти не меняется, поэтому он собирается в QuestGraph
+один раз на процесс: сериализованные квесты в порядке показа, маски по
+порогам min_rank и маски «открывает» по prerequisite_quest. Бит квеста —
+его pk, поэтому битсеты игроков не зависят от пересборки графа.
+
+Прогресс игрока — два числа-битсета в кэше: взятые квесты и выполненные
+(completed/claimed). Доступные = ранг & ~взятые & (корни | открытые
+выполненными). Запрос доски квестов — одно чтение кэша.
+
+Граф — config.catalog.VersionedCatalog: версия в кэше меняется при
+сохранении/удалении Quest, процесс пересобирает граф, увидев новую.
+"""
+
+from bisect import bisect_right
+
+from django.core.cache import cache
+
+from config.catalog import VersionedCatalog
+
+from .models import PlayerQuest, Quest
+
+VERSION_KEY = 'quests:catalog:version'
+PROGRESS_KEY = 'quests:progress_bits:{player_id}'
+PROGRESS_TIMEOUT = 3600
+
+DONE_STATUSES = (PlayerQuest.Status.COMPLETED, PlayerQuest.Status.CLAIMED)
+
+
+class QuestGraph:
+    """Неизменяемый снимок каталога квестов."""
+
+    def __init__(self, quests):
+        from .serializers import QuestSerializer
+
+        self.ordered = [(q.pk, QuestSerializer(q).data) for q in quests]
+        self.roots = 0
+        self.unlocks = {}
+        by_rank = {}
+        for q in quests:
+            bit = 1 << q.pk
+            by_rank[q.min_rank] = by_rank.get(q.min_rank, 0) | bit
+            if q.prerequisite_quest_id is None:
+                self.roots |= bit
+            else:
+                self.unlocks[q.prerequisite_quest_id] = self.unlocks.get(q.prerequisite_quest_id, 0) | bit
+
+        # Пороги min_rank по возрастанию и накопленные маски «доступно с разряда».
+        self.ranks = sorted(by_rank)
+        self.rank_masks = []
+        acc = 0
+        for rank in self.ranks:
+            acc |= by_rank[rank]
+            self.rank_masks.append(acc)
+
+    def rank_mask(self, rank) -> int:
+        idx = bisect_right(self.ranks, rank) - 1
+        return self.rank_masks[idx] if idx >= 0 else 0
+
+    def unlocked_by(self, done) -> int:
+        mask = self.roots
+        while done:
+            low = done & -done
+            mask |= self.unlocks.get(low.bit_length() - 1, 0)
+            done ^= low
+        return mask
+
+    def available(self, rank, taken, done) -> list:
+        """Сериализованные доступные квесты в порядке показа."""
+        mask = self.rank_mask(rank) & ~taken & self.unlocked_by(done)
+        return [data for pk, data in self.ordered if mask >> pk & 1]
+
+
+def _build_graph() -> QuestGraph:
+    return QuestGraph(list(Quest.objects.select_related(
+        'target_species', 'target_location', 'reward_apparatus_part',
+    ).order_by('order', 'min_rank', 'pk')))
+
+
+catalog = VersionedCatalog(VERSION_KEY, _build_graph)
+catalog.watch(Quest)
+
+
+def _progress_bits(player_id):
+    taken = done = 0
+    for quest_id, status in PlayerQuest.objects.filter(
+        player_id=player_id,
+    ).values_list('quest_id', 'status'):
+        taken |= 1 << quest_id
+        if status in DONE_STATUSES:
+            done |= 1 << quest_id
+    return taken, done
+
+
+def available_quests(player) -> list:
+    """Доступные игроку квесты (данные QuestSerializer)."""
+    progress_key = PROGRESS_KEY.format(player_id=player.pk)
+    cached = cache.get_many([VERSION_KEY, progress_key])
+    graph = catalog.get(cached.get(VERSION_KEY))
+    bits = cached.get(progress_key)
+    if bits is None:
+        bits = _progress_bits(player.pk)
+        cache.set(progress_key, bits, PROGRESS_TIMEOUT)
+    return graph.available(player.rank, *bits)
@@ -1,63 +1,121 @@
 """Сервис обновления прогресса квестов при поимке рыбы."""
 
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.core.cache import cache
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.lookups import GreaterThanOrEqual
 from django.utils import timezone
 
-from .models import PlayerQuest
+from .models import PlayerQuest, Quest
+
+COUNT_TYPES = (Quest.QuestType.CATCH_FISH, Quest.QuestType.CATCH_SPECIES)
 
 
 class QuestService:
-    """Сервис квестов: обновление прогресса, проверка завершения."""
+    """
+    Сервис квестов: обновление прогресса, проверка завершения.
+
+    Активные квесты игрока сведены в индекс триггеров
+    {(вид | None, локация | None, тип): ((player_quest_id, цель), ...)},
+    None — «любой». Улов проверяет не больше 4 ключей на тип, поэтому
+    стоимость не зависит от числа взятых квестов. Индекс кэшируется на
+    игрока и сбрасывается при взятии, завершении и получении награды.
+    """
+
+    CACHE_KEY = 'quests:triggers:{player_id}'
+    CACHE_TIMEOUT = 3600
 
     def update_quest_progress(self, player, species, weight, location):
         """
         Обновляет прогресс всех активных квестов игрока при поимке рыбы.
         Возвращает список завершённых квестов.
         """
-        completed = []
-        active_quests = PlayerQuest.objects.filter(
-            player=player, status=PlayerQuest.Status.ACTIVE,
-        ).select_related('quest', 'quest__target_species', 'quest__target_location')
-
-        for pq in active_quests:
-            quest = pq.quest
-
-            # Проверяем локацию если задана
-            if quest.target_location and quest.target_location_id != location.pk:
-                continue
-
-            if quest.quest_type == 'catch_fish':
-                # Поймать N рыб (любых или конкретного вида)
-                if quest.target_species and quest.target_species_id != species.pk:
-                    continue
-                pq.progress += 1
-
-            elif quest.quest_type == 'catch_weight':
-                # Набрать суммарный вес
-                if quest.target_species and quest.target_species_id != species.pk:
-                    continue
-                pq.progress_weight += float(weight)
-
-            elif quest.quest_type == 'catch_species':
-                # Поймать конкретный вид (любой размер)
-                if quest.target_species_id != species.pk:
-                    continue
-                pq.progress += 1
-
-            # Проверяем завершение
-            if self._is_quest_complete(pq):
-                pq.status = PlayerQuest.Status.COMPLETED
-                pq.completed_at = timezone.now()
-                completed.append(pq)
-
-            pq.save()
+        index = self.get_trigger_index(player.pk)
+        if not index:
+            return []
+
+        count_targets, weight_targets = {}, {}
+        for species_key in (species.pk, None):
+            for location_key in (location.pk, None):
+                for quest_type in COUNT_TYPES:
+                    count_targets.update(index.get((species_key, location_key, quest_type), ()))
+                weight_targets.update(
+                    index.get((species_key, location_key, Quest.QuestType.CATCH_WEIGHT), ()),
+                )
+        if not count_targets and not weight_targets:
+            return []
+
+        now = timezone.now()
+        if count_targets:
+            self._apply(count_targets, 'progress', 1, now)
+        if weight_targets:
+            self._apply(weight_targets, 'progress_weight', float(weight), now)
 
+        completed = list(
+            PlayerQuest.objects.filter(
+                pk__in=[*count_targets, *weight_targets],
+                status=PlayerQuest.Status.COMPLETED, completed_at=now,
+            ).select_related('quest')
+        )
+        if completed:
+            self.invalidate(player.pk)
         return completed
 
-    def _is_quest_complete(self, pq):
-        """Проверяет, выполнен ли квест."""
-        quest = pq.quest
-        if quest.quest_type in ('catch_fish', 'catch_species'):
-            return pq.progress >= quest.target_count
-        elif quest.quest_type == 'catch_weight':
-            return pq.progress_weight >= float(quest.target_weight)
-        return False
+    @staticmethod
+    def _apply(targets, field, amount, now):
+        """
+        Один UPDATE: field += amount, а квесты, достигшие цели, сразу
+        помечаются завершёнными (условие считается по значению до UPDATE).
+        """
+        by_target = defaultdict(list)
+        for pq_id, target in targets.items():
+            by_target[target].append(pq_id)
+        done = reduce(or_, (
+            Q(GreaterThanOrEqual(F(field) + amount, target), pk__in=ids)
+            for target, ids in by_target.items()
+        ))
+        PlayerQuest.objects.filter(
+            pk__in=list(targets), status=PlayerQuest.Status.ACTIVE,
+        ).update(**{
+            field: F(field) + amount,
+            'status': Case(
+                When(done, then=Value(PlayerQuest.Status.COMPLETED)), default=F('status'),
+            ),
+            'completed_at': Case(When(done, then=Value(now)), default=F('completed_at')),
+        })
+
+    def get_trigger_index(self, player_id) -> dict:
+        """Индекс триггеров активных квестов игрока; кэшируется."""
+        key = self.CACHE_KEY.format(player_id=player_id)
+        index = cache.get(key)
+        if index is None:
+            index = self._build_index(player_id)
+            cache.set(key, index, self.CACHE_TIMEOUT)
+        return index
+
+    def invalidate(self, player_id):
+        """Сбрасывает индекс триггеров и битсеты доступности (взятие, завершение, награда)."""
+        from .availability import PROGRESS_KEY
+        cache.delete_many([
+            self.CACHE_KEY.format(player_id=player_id),
+            PROGRESS_KEY.format(player_id=player_id),
+        ])
+
+    @staticmethod
+    def _build_index(player_id) -> dict:
+        index = defaultdict(list)
+        rows = PlayerQuest.objects.filter(
+            player_id=player_id, status=PlayerQuest.Status.ACTIVE,
+        ).values_list(
+            'pk', 'quest__quest_type', 'quest__target_species_id',
+            'quest__target_location_id', 'quest__target_count', 'quest__target_weight',
+        )
+        for pq_id, quest_type, species_id, location_id, count, weight in rows:
+            if quest_type == Quest.QuestType.CATCH_SPECIES and species_id is None:
+                continue  # вид не задан — такой квест не засчитывается никогда
+            target = float(weight) if quest_type == Quest.QuestType.CATCH_WEIGHT else count
+            index[(species_id, location_id, quest_type)].append((pq_id, target))
+        return {key: tuple(entries) for key, entries in index.items()}
@@ -43,6 +43,46 @@ class TestAvailableQuests:
         assert len(resp.data['results']) == 0
 
 
+@pytest.mark.django_db
+class TestQuestAvailabilityGraph:
+    """Граф каталога и битсеты прогресса (apps.quests.availability)."""
+
+    def _names(self, player):
+        from apps.quests.availability import available_quests
+        return [q['name'] for q in available_quests(player)]
+
+    def test_prerequisite_chain_and_accept(self, api_client, quest, player):
+        follow_up = Quest.objects.create(
+            name='Продолжение', description='Тест', quest_type='catch_fish',
+            prerequisite_quest=quest, order=1,
+        )
+        assert self._names(player) == [quest.name]
+
+        resp = api_client.post('/api/quests/accept/', {'quest_id': quest.pk})
+        assert resp.status_code == 201
+        assert self._names(player) == []
+
+        from apps.quests.services import QuestService
+        PlayerQuest.objects.filter(player=player, quest=quest).update(status='completed')
+        QuestService().invalidate(player.pk)
+        assert self._names(player) == [follow_up.name]
+
+    def test_warm_cache_needs_no_sql(self, quest, player, assert_max_queries):
+        from apps.quests.availability import available_quests
+        expected = available_quests(player)
+        with assert_max_queries(0):
+            assert available_quests(player) == expected
+        assert expected[0]['reward_money'] == '100.00'
+
+    def test_catalog_change_rebuilds_graph(self, quest, player):
+        assert self._names(player) == [quest.name]
+        quest.min_rank = 99
+        quest.save(update_fields=['min_rank'])
+        assert self._names(player) == []
+        Quest.objects.create(name='Новый', description='Тест', quest_type='catch_fish')
+        assert self._names(player) == ['Новый']
+
+
 @pytest.mark.django_db
 class TestPlayerQuests:
     """GET /api/quests/my/ -- квесты игрока."""
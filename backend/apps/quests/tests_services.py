@@ -301,3 +301,85 @@ class TestUpdateQuestProgress:
         pq.refresh_from_db()
 
         assert pq.completed_at is not None
+
+
+@pytest.mark.django_db
+class TestQuestsQueryBudget:
+    """Регрессии числа запросов QuestService."""
+
+    def setup_method(self):
+        self.svc = QuestService()
+
+    def test_update_progress_multiple_quests(self, assert_max_queries, player, fish_species, location):
+        for i in range(3):
+            quest = Quest.objects.create(
+                name=f'Квест {i}', description='Тест',
+                quest_type='catch_fish', target_count=10,
+            )
+            PlayerQuest.objects.create(player=player, quest=quest)
+        with assert_max_queries(4):
+            self.svc.update_quest_progress(player, fish_species, 1.0, location)
+
+    def test_update_progress_independent_of_quest_count(self, assert_max_queries, player, fish_species, location):
+        from apps.world.models import Location
+        other = Location.objects.create(
+            base=location.base, name='Другая', description='Тест', depth_map=location.depth_map,
+        )
+        for i in range(30):
+            quest = Quest.objects.create(
+                name=f'Чужая локация {i}', description='Тест',
+                quest_type='catch_weight', target_weight=100, target_location=other,
+            )
+            PlayerQuest.objects.create(player=player, quest=quest)
+        quest = Quest.objects.create(
+            name='Любая рыба', description='Тест', quest_type='catch_fish', target_count=1,
+        )
+        PlayerQuest.objects.create(player=player, quest=quest)
+        self.svc.get_trigger_index(player.pk)
+        # Индекс из кэша, UPDATE по количеству, выборка завершённых.
+        with assert_max_queries(2):
+            completed = self.svc.update_quest_progress(player, fish_species, 1.0, location)
+        assert [pq.quest_id for pq in completed] == [quest.pk]
+        assert not PlayerQuest.objects.filter(quest__target_location=other).exclude(progress_weight=0).exists()
+
+
+@pytest.mark.django_db
+class TestQuestTriggerIndex:
+    """Индекс триггеров квестов и его сброс."""
+
+    def setup_method(self):
+        self.svc = QuestService()
+
+    def test_index_keys(self, player, fish_species, location):
+        quest = Quest.objects.create(
+            name='Вид', description='Тест', quest_type='catch_species',
+            target_species=fish_species, target_count=2,
+        )
+        weight = Quest.objects.create(
+            name='Вес', description='Тест', quest_type='catch_weight',
+            target_weight=5, target_location=location,
+        )
+        Quest.objects.create(name='Без вида', description='Тест', quest_type='catch_species')
+        pq = PlayerQuest.objects.create(player=player, quest=quest)
+        pq_weight = PlayerQuest.objects.create(player=player, quest=weight)
+        PlayerQuest.objects.create(player=player, quest=Quest.objects.get(name='Без вида'))
+
+        assert self.svc.get_trigger_index(player.pk) == {
+            (fish_species.pk, None, 'catch_species'): ((pq.pk, 2),),
+            (None, location.pk, 'catch_weight'): ((pq_weight.pk, 5.0),),
+        }
+
+    def test_accept_and_completion_invalidate(self, player, fish_species, location):
+        from apps.quests.use_cases.accept_quest import AcceptQuestUseCase
+        quest = Quest.objects.create(
+            name='Одна рыба', description='Тест', quest_type='catch_fish', target_count=1,
+        )
+        assert self.svc.get_trigger_index(player.pk) == {}
+
+        AcceptQuestUseCase(self.svc).execute(player, quest.pk)
+        assert self.svc.get_trigger_index(player.pk) != {}
+
+        completed = self.svc.update_quest_progress(player, fish_species, 1.0, location)
+        assert len(completed) == 1
+        assert self.svc.get_trigger_index(player.pk) == {}
+        assert self.svc.update_quest_progress(player, fish_species, 1.0, location) == []
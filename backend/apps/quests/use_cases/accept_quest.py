@@ -1,11 +1,15 @@
 """Use case: взять квест."""
 
 from ..models import PlayerQuest, Quest
+from ..services import QuestService
 
 
 class AcceptQuestUseCase:
     """Принять квест с проверками разряда и предварительного квеста."""
 
+    def __init__(self, quest_service: QuestService):
+        self._quests = quest_service
+
     def execute(self, player, quest_id: int) -> PlayerQuest:
         """Raises: Quest.DoesNotExist, ValueError."""
         try:
@@ -27,4 +31,6 @@ class AcceptQuestUseCase:
         if PlayerQuest.objects.filter(player=player, quest=quest).exists():
             raise ValueError('Квест уже взят.')
 
-        return PlayerQuest.objects.create(player=player, quest=quest)
+        pq = PlayerQuest.objects.create(player=player, quest=quest)
+        self._quests.invalidate(player.pk)
+        return pq
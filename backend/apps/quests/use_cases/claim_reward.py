@@ -3,6 +3,7 @@
 from dataclasses import dataclass
 
 from ..models import PlayerQuest
+from ..services import QuestService
 
 
 @dataclass
@@ -19,6 +20,9 @@ class ClaimRewardResult:
 class ClaimQuestRewardUseCase:
     """Получить награду за завершённый квест."""
 
+    def __init__(self, quest_service: QuestService):
+        self._quests = quest_service
+
     def execute(self, player, player_quest_id: int) -> ClaimRewardResult:
         """Raises: PlayerQuest.DoesNotExist, ValueError."""
         try:
@@ -33,10 +37,12 @@ class ClaimQuestRewardUseCase:
 
         quest = pq.quest
 
-        player.money += quest.reward_money
-        player.karma += quest.reward_karma
-        player.add_experience(quest.reward_experience)
-        player.save(update_fields=['money', 'karma', 'rank', 'experience'])
+        player.reward(
+            money=quest.reward_money,
+            experience=quest.reward_experience,
+            karma=quest.reward_karma,
+        )
+        player.flush()
 
         # Выдача детали аппарата
         apparatus_part_name = None
@@ -49,6 +55,7 @@ class ClaimQuestRewardUseCase:
 
         pq.status = PlayerQuest.Status.CLAIMED
         pq.save(update_fields=['status'])
+        self._quests.invalidate(player.pk)
 
         return ClaimRewardResult(
             quest_name=quest.name,
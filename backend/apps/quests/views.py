@@ -1,10 +1,10 @@
 """Views квестов."""
 
-from django.db import models
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .availability import available_quests
 from .models import PlayerQuest, Quest
 from .serializers import AcceptQuestSerializer, PlayerQuestSerializer, QuestSerializer
 from .use_cases.accept_quest import AcceptQuestUseCase
@@ -18,28 +18,20 @@ def _resolve(use_case_cls):
 
 
 class AvailableQuestsView(generics.ListAPIView):
-    """Доступные квесты для игрока (не взятые, с подходящим рангом)."""
+    """Доступные квесты для игрока (не взятые, с подходящим рангом).
+
+    Считаются по графу каталога и битсетам игрока (apps.quests.availability)
+    без SQL, пока кэш тёплый.
+    """
 
     serializer_class = QuestSerializer
 
-    def get_queryset(self):
-        player = self.request.user.player
-        taken_ids = PlayerQuest.objects.filter(player=player).values_list('quest_id', flat=True)
-        # Квесты, prerequisite которых выполнен (или prerequisite=None)
-        completed_ids = set(PlayerQuest.objects.filter(
-            player=player,
-            status__in=[PlayerQuest.Status.COMPLETED, PlayerQuest.Status.CLAIMED],
-        ).values_list('quest_id', flat=True))
-        qs = Quest.objects.filter(
-            min_rank__lte=player.rank,
-        ).exclude(pk__in=taken_ids).select_related(
-            'target_species', 'target_location', 'reward_apparatus_part',
-        )
-        # Фильтруем: показываем только если prerequisite=None или prerequisite выполнен
-        return qs.filter(
-            models.Q(prerequisite_quest__isnull=True) |
-            models.Q(prerequisite_quest_id__in=completed_ids)
-        )
+    def list(self, request, *args, **kwargs):
+        data = available_quests(request.user.player)
+        page = self.paginate_queryset(data)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(data)
 
 
 class PlayerQuestsView(generics.ListAPIView):
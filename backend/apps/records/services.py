@@ -28,10 +28,13 @@ class RecordService:
             return record
         return None
 
-    def check_achievements(self, player):
+    def check_achievements(self, player, flush=True):
         """
         Проверяет и выдаёт достижения игроку.
         Возвращает список новых достижений.
+
+        flush=False — награды остаются в памяти (player.reward), игрока
+        сохраняет вызывающий use case.
         """
         unlocked = []
         existing = set(
@@ -42,14 +45,14 @@ class RecordService:
             if self._check_condition(player, achievement):
                 pa = PlayerAchievement.objects.create(player=player, achievement=achievement)
                 # Начислить награду
-                if achievement.reward_money:
-                    player.money += achievement.reward_money
-                if achievement.reward_experience:
-                    player.add_experience(achievement.reward_experience)
+                player.reward(
+                    money=achievement.reward_money,
+                    experience=achievement.reward_experience,
+                )
                 unlocked.append(pa)
 
-        if unlocked:
-            player.save(update_fields=['money'])
+        if flush:
+            player.flush()
 
         return unlocked
 
@@ -114,3 +114,77 @@ class TestNewspaper:
         assert 'top_players' in resp.data
         assert 'top_records' in resp.data
         assert 'stats' in resp.data
+
+
+@pytest.fixture
+def replica():
+    """Реплика-двойник: alias 'replica' на том же соединении, что и default."""
+    from django.db import connections
+    connections.settings['replica'] = connections.settings['default']
+    connections['replica'] = connections['default']
+    yield 'replica'
+    del connections['replica']
+    del connections.settings['replica']
+
+
+@pytest.fixture
+def read_aliases(monkeypatch):
+    """Список alias, выбранных роутером для чтений."""
+    from config.routers import ReplicaRouter
+    aliases = []
+    original = ReplicaRouter.db_for_read
+
+    def spy(self, model, **hints):
+        alias = original(self, model, **hints)
+        aliases.append(alias)
+        return alias
+
+    monkeypatch.setattr(ReplicaRouter, 'db_for_read', spy)
+    return aliases
+
+
+@pytest.mark.django_db
+class TestReadReplicaRouting:
+    """Роутинг чтений: EVENTUAL-view на реплику, после записи — primary."""
+
+    def test_eventual_view_reads_replica(self, api_client, replica, read_aliases):
+        resp = api_client.get('/api/records/')
+        assert resp.status_code == 200
+        assert read_aliases and set(read_aliases) == {'replica'}
+
+    def test_strong_view_reads_primary(self, api_client, replica, read_aliases):
+        resp = api_client.get('/api/achievements/')
+        assert resp.status_code == 200
+        assert read_aliases and set(read_aliases) == {'default'}
+
+    def test_without_replica_reads_primary(self, api_client, read_aliases):
+        resp = api_client.get('/api/newspaper/')
+        assert resp.status_code == 200
+        assert set(read_aliases) == {'default'}
+
+    def test_read_after_write_stays_on_primary(self, player, replica):
+        from config.routers import EVENTUAL, reads_from
+        with reads_from(EVENTUAL):
+            assert FishRecord.objects.all().db == 'replica'
+            player.save(update_fields=['money'])
+            assert FishRecord.objects.all().db == 'default'
+
+    def test_replica_instance_written_to_primary(self, player, replica):
+        from apps.accounts.models import Player
+        from config.routers import EVENTUAL, reads_from
+        with reads_from(EVENTUAL):
+            stale = Player.objects.get(pk=player.pk)
+        assert stale._state.db == 'replica'
+        stale.money = 5
+        stale.save(update_fields=['money'])
+        assert stale._state.db == 'default'
+
+    def test_client_pinned_to_primary_after_write(self, api_client, location, replica, read_aliases):
+        from django.core.cache import cache
+        cache.clear()
+        resp = api_client.post(f'/api/locations/{location.pk}/enter/')
+        assert resp.status_code == 200
+        read_aliases.clear()
+        resp = api_client.get('/api/records/')
+        assert resp.status_code == 200
+        assert read_aliases and set(read_aliases) == {'default'}
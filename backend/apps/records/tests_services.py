@@ -152,6 +152,31 @@ class TestCheckAchievements:
         assert player.money == initial_money + Decimal('100.00')
         assert player.experience == initial_exp + 50
 
+    def test_rewards_saved_with_one_update(self, player, fish_species, location):
+        """Награды нескольких достижений пишутся одним UPDATE игрока."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        for name in ('Первый улов', 'Ещё улов'):
+            Achievement.objects.create(
+                name=name, description='', category='catch',
+                condition_type='fish_count', condition_value=1,
+                reward_money=Decimal('10.00'), reward_experience=600,
+            )
+        CaughtFish.objects.create(
+            player=player, species=fish_species,
+            weight=1.0, length=20.0, location=location,
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            unlocked = self.svc.check_achievements(player)
+
+        assert len(unlocked) == 2
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "accounts_player"')]
+        assert len(updates) == 1
+        player.refresh_from_db()
+        assert (player.rank, player.experience) == (2, 200)
+
     def test_species_count_achievement(self, player, location):
         """Достижение за количество видов рыбы."""
         achievement = Achievement.objects.create(
@@ -361,3 +386,24 @@ class TestCheckAchievements:
 
         unlocked = self.svc.check_achievements(player)
         assert len(unlocked) == 2
+
+
+@pytest.mark.django_db
+class TestRecordsQueryBudget:
+    """Регрессии числа запросов RecordService."""
+
+    def setup_method(self):
+        self.svc = RecordService()
+
+    def test_check_record(self, assert_max_queries, player, fish_species, location):
+        with assert_max_queries(2):
+            self.svc.check_record(player, fish_species, 1.5, 25.0, location)
+
+    def test_check_achievements(self, assert_max_queries, player, fish_species, location):
+        for i, cond in enumerate(['fish_count', 'total_weight', 'rank', 'karma']):
+            Achievement.objects.create(
+                name=f'Ачивка {i}', description='Тест',
+                condition_type=cond, condition_value=1000,
+            )
+        with assert_max_queries(4):
+            self.svc.check_achievements(player)
@@ -7,6 +7,7 @@ from rest_framework.views import APIView
 
 from apps.accounts.models import Player
 from apps.inventory.models import CaughtFish
+from config.routers import EVENTUAL
 
 from .models import Achievement, FishRecord, PlayerAchievement
 from .serializers import AchievementSerializer, FishRecordSerializer, PlayerAchievementSerializer
@@ -15,6 +16,7 @@ from .serializers import AchievementSerializer, FishRecordSerializer, PlayerAchi
 class FishRecordListView(generics.ListAPIView):
     """Таблица рекордов (все виды)."""
 
+    read_consistency = EVENTUAL
     serializer_class = FishRecordSerializer
     queryset = FishRecord.objects.select_related('species', 'player', 'location').order_by('-weight')
 
@@ -62,6 +64,8 @@ class PlayerJournalView(generics.ListAPIView):
 class NewspaperView(APIView):
     """Газета: рекорды недели, топ рыбаков, статистика."""
 
+    read_consistency = EVENTUAL
+
     def get(self, request):
         # Рекордсмены недели
         weekly_champions = FishRecord.objects.filter(
@@ -0,0 +1,91 @@
+"""Сервис динамического ценообразования рыбы."""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import router, transaction
+
+from apps.tackle.models import FishPriceDynamic
+
+CENT = Decimal('0.01')
+
+
+class FishPricingService:
+    """
+    Пакетный расчёт цен рыбы с учётом FishPriceDynamic.
+
+    Рыба группируется по (вид, локация): проданный за день вес читается
+    одним запросом, снижение цены применяется внутри пачки по порядку,
+    итог записывается одним upsert. Таблица модификаторов по локации
+    кэшируется для предпросмотра цен в магазине.
+    """
+
+    CACHE_KEY = 'shop:price_modifiers:{location_id}'
+    CACHE_TIMEOUT = 300
+
+    def quote(self, fish_list):
+        """
+        Считает цены для списка рыбы без записи продаж.
+
+        Возвращает (список цен в порядке fish_list, {(species_id, location_id): кг}).
+        """
+        sold = self._sold_weights(fish_list)
+        running = dict(sold)
+        added = defaultdict(float)
+        prices = []
+        for fish in fish_list:
+            key = (fish.species_id, fish.location_id)
+            if fish.location_id is None:
+                modifier = 1.0
+            else:
+                modifier = FishPriceDynamic.modifier_for(running.get(key, 0.0))
+                running[key] = running.get(key, 0.0) + fish.weight
+                added[key] += fish.weight
+            price = (
+                fish.species.sell_price_per_kg
+                * Decimal(str(fish.weight))
+                * Decimal(str(modifier))
+            ).quantize(CENT)
+            prices.append(price)
+        return prices, dict(added)
+
+    def record(self, weights):
+        """Записывает проданный вес одним upsert; кэш затронутых локаций сбрасывается после коммита."""
+        if not weights:
+            return
+        FishPriceDynamic.record_sales(weights)
+        location_ids = {location_id for _, location_id in weights}
+        transaction.on_commit(
+            lambda: self.invalidate(location_ids),
+            using=router.db_for_write(FishPriceDynamic),
+        )
+
+    def get_modifiers(self, location_id) -> dict:
+        """Модификаторы {species_id: float} для локации; кэшируется."""
+        key = self.CACHE_KEY.format(location_id=location_id)
+        modifiers = cache.get(key)
+        if modifiers is None:
+            modifiers = {
+                species_id: FishPriceDynamic.modifier_for(weight)
+                for species_id, weight in FishPriceDynamic.objects.filter(
+                    location_id=location_id,
+                ).values_list('species_id', 'sold_weight_today')
+            }
+            cache.set(key, modifiers, self.CACHE_TIMEOUT)
+        return modifiers
+
+    def invalidate(self, location_ids):
+        """Удаляет закэшированные таблицы модификаторов."""
+        cache.delete_many([self.CACHE_KEY.format(location_id=pk) for pk in location_ids])
+
+    def _sold_weights(self, fish_list) -> dict:
+        """Текущий sold_weight_today для всех пар (вид, локация) пачки — один запрос."""
+        keys = {(f.species_id, f.location_id) for f in fish_list if f.location_id is not None}
+        if not keys:
+            return {}
+        rows = FishPriceDynamic.objects.filter(
+            species_id__in={s for s, _ in keys},
+            location_id__in={loc for _, loc in keys},
+        ).values_list('species_id', 'location_id', 'sold_weight_today')
+        return {(s, loc): w for s, loc, w in rows if (s, loc) in keys}
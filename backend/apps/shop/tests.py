@@ -2,11 +2,13 @@
 
 import pytest
 from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
 from apps.accounts.models import Player
 from apps.inventory.models import CaughtFish, InventoryItem
-from apps.tackle.models import Hook
+from apps.tackle.models import FishPriceDynamic, Hook
 
 
 # ── Shop category list ────────────────────────────────────────────────
@@ -164,3 +166,78 @@ class TestSellFish:
             'fish_ids': [fish.pk],
         }, format='json')
         assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestSellFishPricing:
+
+    def _creel(self, player, species, location, weights):
+        return [
+            CaughtFish.objects.create(
+                player=player, species=species, weight=w, length=20.0, location=location,
+            )
+            for w in weights
+        ]
+
+    def test_in_batch_decay(self, api_client, player, location, fish_species):
+        """Цена падает уже внутри пачки: вторая рыба считается после первой."""
+        fish = self._creel(player, fish_species, location, [100.0, 100.0])
+        resp = api_client.post('/api/shop/sell-fish/', {
+            'fish_ids': [f.pk for f in fish],
+        }, format='json')
+        assert resp.status_code == status.HTTP_200_OK
+        # 100 кг × 10 × 1.0 + 100 кг × 10 × 0.8
+        assert resp.data['money_earned'] == 1800.0
+
+        dyn = FishPriceDynamic.objects.get(species=fish_species, location=location)
+        assert dyn.sold_weight_today == 200.0
+
+    def test_upsert_accumulates(self, api_client, player, location, fish_species):
+        """Повторная продажа прибавляет вес к существующей записи."""
+        FishPriceDynamic.objects.create(
+            species=fish_species, location=location, sold_weight_today=50.0,
+        )
+        fish = self._creel(player, fish_species, location, [10.0])
+        resp = api_client.post('/api/shop/sell-fish/', {'fish_ids': [fish[0].pk]}, format='json')
+        assert resp.data['money_earned'] == 90.0  # модификатор 0.9
+        assert FishPriceDynamic.objects.get(
+            species=fish_species, location=location,
+        ).sold_weight_today == 60.0
+
+    def test_query_count_independent_of_creel_size(self, api_client, player, location, fish_species):
+        """Число запросов не растёт с размером садка."""
+        small = self._creel(player, fish_species, location, [1.0])
+        with CaptureQueriesContext(connection) as q_small:
+            api_client.post('/api/shop/sell-fish/', {'fish_ids': [f.pk for f in small]}, format='json')
+
+        large = self._creel(player, fish_species, location, [1.0] * 30)
+        with CaptureQueriesContext(connection) as q_large:
+            resp = api_client.post('/api/shop/sell-fish/', {'fish_ids': [f.pk for f in large]}, format='json')
+        assert resp.data['fish_sold'] == 30
+        assert len(q_large) == len(q_small)
+
+    def test_price_preview_cached_and_invalidated(
+        self, api_client, player, location, fish_species, django_capture_on_commit_callbacks,
+    ):
+        """Предпросмотр берёт модификаторы из кэша; продажа сбрасывает кэш после коммита."""
+        from django.core.cache import cache
+        cache.clear()
+
+        fish = self._creel(player, fish_species, location, [50.0])
+        resp = api_client.get(f'/api/shop/fish-prices/?location={location.pk}')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['prices'][0]['modifier'] == 1.0
+
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get(f'/api/shop/fish-prices/?location={location.pk}')
+        assert not any('tackle_fishpricedynamic' in q['sql'] for q in queries)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            api_client.post('/api/shop/sell-fish/', {'fish_ids': [fish[0].pk]}, format='json')
+        resp = api_client.get(f'/api/shop/fish-prices/?location={location.pk}')
+        assert resp.data['prices'] == []  # до коммита в кэше прежняя таблица
+
+        for callback in callbacks:
+            callback()
+        resp = api_client.get(f'/api/shop/fish-prices/?location={location.pk}')
+        assert resp.data['prices'][0]['modifier'] == pytest.approx(0.9)
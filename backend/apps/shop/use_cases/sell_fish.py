@@ -3,8 +3,13 @@
 from dataclasses import dataclass
 from decimal import Decimal
 
+from django.db import transaction
+from django.db.models import F
+
+from apps.accounts.models import Player
 from apps.inventory.models import CaughtFish
-from apps.tackle.models import FishPriceDynamic
+
+from ..services import FishPricingService
 
 
 @dataclass
@@ -19,32 +24,34 @@ class SellFishResult:
 class SellFishUseCase:
     """Продажа рыбы из садка."""
 
+    def __init__(self, pricing: FishPricingService):
+        self.pricing = pricing
+
     def execute(self, player, fish_ids: list[int]) -> SellFishResult:
         """Raises: ValueError."""
-        fish_qs = CaughtFish.objects.filter(
-            player=player, pk__in=fish_ids,
-            is_sold=False, is_released=False,
-        ).select_related('species', 'location')
-
-        if not fish_qs.exists():
+        fish_list = list(
+            CaughtFish.objects.filter(
+                player=player, pk__in=fish_ids,
+                is_sold=False, is_released=False,
+            ).select_related('species').order_by('pk')
+        )
+        if not fish_list:
             raise ValueError('Рыба не найдена в садке.')
 
-        fish_list = list(fish_qs)
-        total_money = Decimal('0')
-
-        for fish in fish_list:
-            # Динамический модификатор цены по локации
-            modifier = Decimal(str(FishPriceDynamic.get_modifier(fish.species, fish.location)))
-            price = (fish.species.sell_price_per_kg * Decimal(str(fish.weight)) * modifier).quantize(
-                Decimal('0.01')
-            )
-            total_money += price
-            # Регистрируем продажу для обновления динамики
-            FishPriceDynamic.record_sale(fish.species, fish.location, fish.weight)
-
-        fish_qs.update(is_sold=True)
-        player.money += total_money
-        player.save(update_fields=['money'])
+        with transaction.atomic():
+            # Повторная отправка той же пачки не продаст рыбу дважды.
+            sold = CaughtFish.objects.filter(
+                pk__in=[f.pk for f in fish_list], is_sold=False,
+            ).update(is_sold=True)
+            if sold != len(fish_list):
+                raise ValueError('Рыба не найдена в садке.')
+
+            prices, weights = self.pricing.quote(fish_list)
+            total_money = sum(prices, Decimal('0'))
+            self.pricing.record(weights)
+
+            Player.objects.filter(pk=player.pk).update(money=F('money') + total_money)
+            player.money = Player.objects.values_list('money', flat=True).get(pk=player.pk)
 
         return SellFishResult(
             fish_sold=len(fish_list),
@@ -16,8 +16,10 @@ from apps.tackle.serializers import (
     HookSerializer, LineSerializer, ReelSerializer, RodTypeSerializer,
     FlavoringSerializer,
 )
+from config.routers import EVENTUAL
 
 from .serializers import BuySerializer, SellFishSerializer
+from .services import FishPricingService
 from .use_cases.buy_item import BuyItemUseCase
 from .use_cases.sell_fish import SellFishUseCase
 
@@ -45,6 +47,8 @@ def _resolve(use_case_cls):
 class ShopCategoryView(APIView):
     """Список товаров по категории."""
 
+    read_consistency = EVENTUAL
+
     def get(self, request, category):
         if category not in SHOP_CATEGORIES:
             return Response(
@@ -159,3 +163,43 @@ class SellFishView(APIView):
             'money_earned': result.money_earned,
             'money_total': result.money_total,
         })
+
+
+class FishPricePreviewView(APIView):
+    """Предпросмотр цен рыбы на локации (кэшированная таблица модификаторов)."""
+
+    def get(self, request):
+        from apps.inventory.models import CaughtFish
+        from apps.tackle.models import FishSpecies
+
+        location_id = request.query_params.get('location') or request.user.player.current_location_id
+        if not location_id:
+            return Response({'error': 'Укажите location.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            location_id = int(location_id)
+        except (TypeError, ValueError):
+            return Response({'error': 'Некорректный location.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        modifiers = _resolve(FishPricingService).get_modifiers(location_id)
+        species_ids = set(
+            CaughtFish.objects.filter(
+                player=request.user.player, is_sold=False, is_released=False,
+            ).values_list('species_id', flat=True)
+        ) | set(modifiers)
+        species = FishSpecies.objects.filter(pk__in=species_ids).order_by('name_ru')
+
+        return Response({
+            'location': location_id,
+            'prices': [
+                {
+                    'species_id': sp.pk,
+                    'name': sp.name_ru,
+                    'base_price_per_kg': float(sp.sell_price_per_kg),
+                    'modifier': modifiers.get(sp.pk, 1.0),
+                    'price_per_kg': float(
+                        sp.sell_price_per_kg * Decimal(str(modifiers.get(sp.pk, 1.0)))
+                    ),
+                }
+                for sp in species
+            ],
+        })
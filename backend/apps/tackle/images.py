@@ -0,0 +1,147 @@
+"""Изображения каталога: WebP-миниатюры и инкрементальная загрузка.
+
+Миниатюры лежат рядом с оригиналами по детерминированному имени
+thumbs/<размер>/<имя без расширения>.webp. Размеры —
+settings.IMAGE_THUMBNAIL_SIZES.
+
+Какие миниатюры есть, записывает load_images в манифест
+(images_manifest.json: хэши источников и {оригинал: [размеры]}).
+thumbnail_urls берёт этот список из памяти процесса (перечитывается раз
+в THUMBS_INDEX_TTL секунд); для изображения без миниатюры размера —
+например, загруженного через админку — отдаётся URL оригинала.
+
+render_thumbnails не зависит от Django и выполняется в пуле процессов;
+запись в storage и в БД делает команда load_images в основном процессе.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+MANIFEST_NAME = 'images_manifest.json'
+DEFAULT_SIZES = {'sm': 96, 'md': 256}
+WEBP_QUALITY = 80
+THUMBS_INDEX_TTL = 60  # секунд
+
+_thumbs_index = None  # (загружен в, {оригинал: [размеры]})
+_thumbs_lock = threading.Lock()
+
+
+def thumbnail_sizes() -> dict:
+    return getattr(settings, 'IMAGE_THUMBNAIL_SIZES', DEFAULT_SIZES)
+
+
+def thumbnail_name(name: str, label: str) -> str:
+    """fish/1.png -> thumbs/sm/fish/1.webp"""
+    return f'thumbs/{label}/{os.path.splitext(name)[0]}.webp'
+
+
+def thumbnail_urls(image, request=None):
+    """{размер: URL} для FieldFile или None, если изображения нет.
+
+    Размеры без миниатюры в манифесте отдают URL оригинала.
+    """
+    if not image:
+        return None
+    rendered = thumbnails_index().get(image.name, ())
+    urls = {}
+    for label in thumbnail_sizes():
+        name = thumbnail_name(image.name, label) if label in rendered else image.name
+        url = image.storage.url(name)
+        urls[label] = request.build_absolute_uri(url) if request else url
+    return urls
+
+
+def thumbnails_index() -> dict:
+    """{оригинал: [размеры миниатюр]} из манифеста; кэшируется в процессе."""
+    global _thumbs_index
+    cached = _thumbs_index
+    if cached is not None and time.monotonic() - cached[0] < THUMBS_INDEX_TTL:
+        return cached[1]
+    with _thumbs_lock:
+        index = load_manifest()['thumbs']
+        _thumbs_index = (time.monotonic(), index)
+    return index
+
+
+def reset_thumbnails_index() -> None:
+    global _thumbs_index
+    _thumbs_index = None
+
+
+def file_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def render_thumbnails(source: str, sizes: dict) -> dict:
+    """Читает файл и возвращает {размер: WebP-байты}. Выполняется в воркере пула."""
+    from PIL import Image
+
+    result = {}
+    try:
+        img = Image.open(source)
+        img.load()
+    except OSError:
+        # Нечитаемый файл: оригинал всё равно копируется, миниатюр нет.
+        return result
+    with img:
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA')
+        for label, size in sizes.items():
+            thumb = img.copy()
+            thumb.thumbnail((size, size), Image.Resampling.LANCZOS)
+            buf = io.BytesIO()
+            thumb.save(buf, 'WEBP', quality=WEBP_QUALITY, method=4)
+            result[label] = buf.getvalue()
+    return result
+
+
+def replace_file(name: str, data: bytes, storage=default_storage) -> str:
+    """Пишет файл под точным именем (без суффиксов get_available_name)."""
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(data))
+
+
+@dataclass(frozen=True)
+class ImageTarget:
+    """Файл-источник и поле модели, в которое он загружается."""
+
+    model: type
+    pk: int
+    field: str
+    source: str
+    name: str
+    current_name: str = ''
+
+    @property
+    def key(self) -> str:
+        return f'{self.model._meta.label_lower}:{self.pk}:{self.field}'
+
+    def outputs(self) -> list:
+        return [self.name, *(thumbnail_name(self.name, label) for label in thumbnail_sizes())]
+
+
+def load_manifest(storage=default_storage) -> dict:
+    """{'files': {key: sha256}, 'thumbs': {оригинал: [размеры]}} ранее загруженных файлов."""
+    if not storage.exists(MANIFEST_NAME):
+        return {'files': {}, 'thumbs': {}}
+    with storage.open(MANIFEST_NAME) as f:
+        manifest = json.load(f)
+    if 'files' not in manifest:
+        # Прежний формат {key: sha256}: миниатюры пересоберутся при следующей загрузке.
+        manifest = {'files': manifest, 'thumbs': {}}
+    return manifest
+
+
+def save_manifest(manifest: dict, storage=default_storage) -> None:
+    replace_file(MANIFEST_NAME, json.dumps(manifest, sort_keys=True, indent=1).encode(), storage)
+    reset_thumbnails_index()
@@ -1,10 +1,32 @@
-"""Загрузка изображений из статических файлов в ImageField моделей."""
+"""Загрузка изображений из статических файлов в ImageField моделей.
+
+Идемпотентна: sha256 каждого файла сверяется с манифестом в MEDIA
+(apps.tackle.images.MANIFEST_NAME), неизменённые файлы пропускаются.
+Изменённые копируются под постоянным именем, WebP-миниатюры для них
+строятся в пуле процессов.
+"""
 
 import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import NamedTuple
 
-from django.core.files import File
+from django.core.files.storage import default_storage
 from django.core.management.base import BaseCommand
-
+from django.db import transaction
+
+from apps.tackle.images import (
+    ImageTarget,
+    file_digest,
+    load_manifest,
+    render_thumbnails,
+    replace_file,
+    save_manifest,
+    thumbnail_name,
+    thumbnail_sizes,
+)
 from apps.tackle.models import (
     Bait, FishSpecies, Flavoring, FloatTackle, Food,
     Groundbait, Hook, Line, Reel, RodType,
@@ -15,6 +37,34 @@ from apps.world.models import Base, Location
 IMAGES_DIR = '/app/public_images'
 
 
+class ImageSource(NamedTuple):
+    """Файлы {directory}/{stem}.{ext} для поля field модели model."""
+
+    model: type
+    field: str
+    directory: str
+    extensions: tuple
+    stem: str = '{pk}'
+    dest_stem: str = '{pk}'
+
+
+SOURCES = [
+    ImageSource(FishSpecies, 'image', 'fish', ('png',)),
+    ImageSource(RodType, 'image', 'rods', ('jpg',)),
+    ImageSource(Reel, 'image', 'reels', ('png',)),
+    ImageSource(Line, 'image', 'lines', ('png',)),
+    ImageSource(Hook, 'image', 'hooks', ('png',)),
+    ImageSource(FloatTackle, 'image', 'floats', ('bmp',)),
+    # Наживки — смешанные расширения
+    ImageSource(Bait, 'image', 'baits', ('png', 'jpg')),
+    ImageSource(Groundbait, 'image', 'groundbaits', ('jpg',)),
+    ImageSource(Flavoring, 'image', 'flavorings', ('jpg',)),
+    ImageSource(Food, 'image', 'food', ('png',)),
+    ImageSource(Location, 'image_day', 'locations', ('jpg',), dest_stem='loc_{pk}'),
+    ImageSource(Base, 'image', 'locations', ('jpg',), stem='base_{pk}', dest_stem='base_{pk}'),
+]
+
+
 class Command(BaseCommand):
     help = 'Загрузка изображений из public/images/ в ImageField моделей'
 
@@ -23,6 +73,14 @@ class Command(BaseCommand):
             '--images-dir', default=IMAGES_DIR,
             help='Путь к директории с изображениями',
         )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Процессов для построения миниатюр (1 — без пула)',
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Перезаписать все файлы, не сверяясь с манифестом',
+        )
 
     def handle(self, *args, **options):
         images_dir = options['images_dir']
@@ -30,95 +88,106 @@ class Command(BaseCommand):
             self.stderr.write(f'Директория не найдена: {images_dir}')
             return
 
-        total = 0
-
-        # Рыбы
-        total += self._load_by_pk(FishSpecies, os.path.join(images_dir, 'fish'), 'png')
-
-        # Снасти
-        total += self._load_by_pk(RodType, os.path.join(images_dir, 'rods'), 'jpg')
-        total += self._load_by_pk(Reel, os.path.join(images_dir, 'reels'), 'png')
-        total += self._load_by_pk(Line, os.path.join(images_dir, 'lines'), 'png')
-        total += self._load_by_pk(Hook, os.path.join(images_dir, 'hooks'), 'png')
-        total += self._load_by_pk(FloatTackle, os.path.join(images_dir, 'floats'), 'bmp')
-
-        # Наживки — смешанные расширения
-        total += self._load_baits(os.path.join(images_dir, 'baits'))
-
-        total += self._load_by_pk(Groundbait, os.path.join(images_dir, 'groundbaits'), 'jpg')
-        total += self._load_by_pk(Flavoring, os.path.join(images_dir, 'flavorings'), 'jpg')
-        total += self._load_by_pk(Food, os.path.join(images_dir, 'food'), 'png')
-
-        # Локации (image_day)
-        total += self._load_locations(os.path.join(images_dir, 'locations'))
-
-        # Базы
-        total += self._load_bases(os.path.join(images_dir, 'locations'))
-
-        self.stdout.write(self.style.SUCCESS(f'Загружено {total} изображений'))
-
-    def _load_by_pk(self, model, directory, ext):
-        """Загружает файлы {pk}.{ext} в image поле модели."""
-        if not os.path.isdir(directory):
-            self.stderr.write(f'  Пропуск: {directory} не найден')
-            return 0
-
-        count = 0
-        model_name = model.__name__
-        for obj in model.objects.all():
-            filepath = os.path.join(directory, f'{obj.pk}.{ext}')
-            if os.path.isfile(filepath):
-                with open(filepath, 'rb') as f:
-                    obj.image.save(f'{obj.pk}.{ext}', File(f), save=True)
-                count += 1
-                self.stdout.write(f'  {model_name} pk={obj.pk}: загружено')
+        timings = {}
+        start = time.perf_counter()
+        targets = self._collect(images_dir)
+        timings['поиск'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        manifest = load_manifest()
+        if options['force']:
+            manifest['files'] = {}
+        changed = []
+        for target, data in self._read(targets):
+            digest = file_digest(data)
+            if self._is_current(target, digest, manifest):
+                continue
+            changed.append((target, data, digest))
+        timings['хэши'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        thumbs = self._render([target for target, _, _ in changed], options['workers'])
+        timings['миниатюры'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for (target, data, digest), rendered in zip(changed, thumbs):
+            replace_file(target.name, data)
+            for label, webp in rendered.items():
+                replace_file(thumbnail_name(target.name, label), webp)
+            if rendered:
+                manifest['thumbs'][target.name] = sorted(rendered)
             else:
-                self.stdout.write(f'  {model_name} pk={obj.pk}: файл не найден ({filepath})')
-        return count
-
-    def _load_baits(self, directory):
-        """Наживки имеют смешанные расширения (png и jpg)."""
-        if not os.path.isdir(directory):
-            return 0
-
-        count = 0
-        for obj in Bait.objects.all():
-            for ext in ('png', 'jpg'):
-                filepath = os.path.join(directory, f'{obj.pk}.{ext}')
-                if os.path.isfile(filepath):
-                    with open(filepath, 'rb') as f:
-                        obj.image.save(f'{obj.pk}.{ext}', File(f), save=True)
-                    count += 1
-                    self.stdout.write(f'  Bait pk={obj.pk}: загружено')
-                    break
-        return count
-
-    def _load_locations(self, directory):
-        """Загружает {location_pk}.jpg в image_day поле Location."""
-        if not os.path.isdir(directory):
-            return 0
-
-        count = 0
-        for loc in Location.objects.all():
-            filepath = os.path.join(directory, f'{loc.pk}.jpg')
-            if os.path.isfile(filepath):
-                with open(filepath, 'rb') as f:
-                    loc.image_day.save(f'loc_{loc.pk}.jpg', File(f), save=True)
-                count += 1
-                self.stdout.write(f'  Location pk={loc.pk}: загружено')
-        return count
-
-    def _load_bases(self, directory):
-        """Загружает base_{base_pk}.jpg в image поле Base."""
-        if not os.path.isdir(directory):
-            return 0
-
-        count = 0
-        for base in Base.objects.all():
-            filepath = os.path.join(directory, f'base_{base.pk}.jpg')
-            if os.path.isfile(filepath):
-                with open(filepath, 'rb') as f:
-                    base.image.save(f'base_{base.pk}.jpg', File(f), save=True)
-                count += 1
-                self.stdout.write(f'  Base pk={base.pk}: загружено')
-        return count
+                manifest['thumbs'].pop(target.name, None)
+            manifest['files'][target.key] = digest
+            self.stdout.write(f'  {target.model.__name__} pk={target.pk}: загружено')
+        self._update_fields([target for target, _, _ in changed])
+        save_manifest(manifest)
+        timings['запись'] = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено {len(changed)} изображений, без изменений {len(targets) - len(changed)}',
+        ))
+        self.stdout.write('  ' + ', '.join(f'{k}: {v:.2f} с' for k, v in timings.items()))
+
+    def _collect(self, images_dir):
+        """ImageTarget для всех объектов, у которых есть файл-источник."""
+        targets = []
+        for source in SOURCES:
+            directory = os.path.join(images_dir, source.directory)
+            if not os.path.isdir(directory):
+                self.stderr.write(f'  Пропуск: {directory} не найден')
+                continue
+            field = source.model._meta.get_field(source.field)
+            for obj in source.model.objects.only('pk', source.field):
+                stem = source.stem.format(pk=obj.pk)
+                for ext in source.extensions:
+                    path = os.path.join(directory, f'{stem}.{ext}')
+                    if os.path.isfile(path):
+                        filename = f'{source.dest_stem.format(pk=obj.pk)}.{ext}'
+                        targets.append(ImageTarget(
+                            model=source.model, pk=obj.pk, field=source.field, source=path,
+                            name=field.generate_filename(obj, filename),
+                            current_name=getattr(obj, source.field).name or '',
+                        ))
+                        break
+        return targets
+
+    @staticmethod
+    def _read(targets):
+        for target in targets:
+            with open(target.source, 'rb') as f:
+                yield target, f.read()
+
+    @staticmethod
+    def _is_current(target, digest, manifest):
+        """Хэш совпадает, поле указывает на файл, миниатюры в манифесте и все выходные файлы на месте."""
+        return (
+            manifest['files'].get(target.key) == digest
+            and target.current_name == target.name
+            and target.name in manifest['thumbs']
+            and all(default_storage.exists(name) for name in target.outputs())
+        )
+
+    @staticmethod
+    def _render(targets, workers):
+        sizes = thumbnail_sizes()
+        if workers <= 1 or len(targets) <= 1:
+            return [render_thumbnails(t.source, sizes) for t in targets]
+        # spawn: воркерам не достаются соединения с БД родителя.
+        workers = min(workers, len(targets))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+            return list(pool.map(
+                render_thumbnails, [t.source for t in targets], [sizes] * len(targets),
+                chunksize=max(1, len(targets) // (workers * 4)),
+            ))
+
+    @staticmethod
+    def _update_fields(targets):
+        """Одним UPDATE на модель и поле: {pk: name} через bulk_update."""
+        grouped = defaultdict(dict)
+        for target in targets:
+            grouped[(target.model, target.field)][target.pk] = target.name
+        with transaction.atomic():
+            for (model, field), names in grouped.items():
+                objs = [model(pk=pk, **{field: name}) for pk, name in names.items()]
+                model.objects.bulk_update(objs, [field])
@@ -1,6 +1,8 @@
 """Модели снастей и рыб."""
 
-from django.db import models
+from django.db import connections, models, router
+
+from apps.fishing import formulas
 
 
 class FishSpecies(models.Model):
@@ -65,13 +67,22 @@ class FishPriceDynamic(models.Model):
     def __str__(self):
         return f'{self.species.name_ru} @ {self.location} — {self.current_modifier:.2f}x'
 
+    # Снижение модификатора за каждый проданный кг и нижняя граница.
+    DECAY_PER_KG = formulas.PRICE_DECAY_PER_KG
+    MIN_MODIFIER = formulas.MIN_PRICE_MODIFIER
+
     @property
     def current_modifier(self) -> float:
         """
         Модификатор цены: снижается на 1% за каждые 5 кг проданной рыбы.
         Минимум 50% от базовой цены.
         """
-        return max(0.50, 1.0 - self.sold_weight_today * 0.002)
+        return self.modifier_for(self.sold_weight_today)
+
+    @classmethod
+    def modifier_for(cls, sold_weight: float) -> float:
+        """Модификатор цены при заданном проданном за день весе."""
+        return formulas.price_modifier(sold_weight)
 
     @classmethod
     def get_modifier(cls, species, location) -> float:
@@ -89,13 +100,36 @@ class FishPriceDynamic(models.Model):
         """Зарегистрировать продажу рыбы — увеличить sold_weight_today."""
         if not location:
             return
-        cls.objects.update_or_create(
-            species=species, location=location,
-            defaults={},
-        )
-        cls.objects.filter(species=species, location=location).update(
-            sold_weight_today=models.F('sold_weight_today') + weight,
+        cls.record_sales({(species.pk, location.pk): weight})
+
+    @classmethod
+    def record_sales(cls, weights: dict) -> None:
+        """
+        Пакетно увеличить sold_weight_today.
+
+        weights: {(species_id, location_id): кг}. Один запрос
+        INSERT ... ON CONFLICT DO UPDATE на все пары.
+        """
+        weights = {key: w for key, w in weights.items() if key[1] is not None}
+        if not weights:
+            return
+        connection = connections[router.db_for_write(cls)]
+        meta = cls._meta
+        table = connection.ops.quote_name(meta.db_table)
+        species_col = connection.ops.quote_name(meta.get_field('species').column)
+        location_col = connection.ops.quote_name(meta.get_field('location').column)
+        weight_col = connection.ops.quote_name(meta.get_field('sold_weight_today').column)
+        values = ', '.join(['(%s, %s, %s)'] * len(weights))
+        params = [p for (species_id, location_id), w in weights.items()
+                  for p in (species_id, location_id, w)]
+        sql = (
+            f'INSERT INTO {table} ({species_col}, {location_col}, {weight_col}) '
+            f'VALUES {values} '
+            f'ON CONFLICT ({species_col}, {location_col}) DO UPDATE '
+            f'SET {weight_col} = {table}.{weight_col} + EXCLUDED.{weight_col}'
         )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
 
 
 class RodType(models.Model):
@@ -2,22 +2,37 @@
 
 from rest_framework import serializers
 
+from .images import thumbnail_urls
 from .models import Bait, FishSpecies, Flavoring, FloatTackle, Food, Groundbait, Hook, Line, Reel, RodType
 
 ROD_CLASS_LABELS = {'float': 'Поплавочное', 'bottom': 'Донное'}
 
 
+class ThumbnailsField(serializers.ReadOnlyField):
+    """{размер: URL} WebP-миниатюр изображения (см. apps.tackle.images)."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('default', None)
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return thumbnail_urls(value, self.context.get('request'))
+
+
 class FishSpeciesSerializer(serializers.ModelSerializer):
+    image_thumbs = ThumbnailsField(source='image')
+
     class Meta:
         model = FishSpecies
         fields = [
-            'id', 'name_ru', 'name_latin', 'description', 'image',
+            'id', 'name_ru', 'name_latin', 'description', 'image', 'image_thumbs',
             'weight_min', 'weight_max', 'length_min', 'length_max',
             'rarity', 'sell_price_per_kg', 'experience_per_kg',
         ]
 
 
 class RodTypeSerializer(serializers.ModelSerializer):
+    image_thumbs = ThumbnailsField(source='image')
     rod_class_display = serializers.SerializerMethodField()
     specs = serializers.SerializerMethodField()
 
@@ -39,6 +54,7 @@ class RodTypeSerializer(serializers.ModelSerializer):
 
 
 class ReelSerializer(serializers.ModelSerializer):
+    image_thumbs = ThumbnailsField(source='image')
     specs = serializers.SerializerMethodField()
 
     class Meta:
@@ -54,6 +70,7 @@ class ReelSerializer(serializers.ModelSerializer):
 
 
 class LineSerializer(serializers.ModelSerializer):
+    image_thumbs = ThumbnailsField(source='image')
     specs = serializers.SerializerMethodField()
 
     class Meta:
@@ -69,6 +86,7 @@ class LineSerializer(serializers.ModelSerializer):
 
 
 class HookSerializer(serializers.ModelSerializer):
+    image_thumbs = ThumbnailsField(source='image')
     specs = serializers.SerializerMethodField()
 
     class Meta:
@@ -82,6 +100,7 @@ class HookSerializer(serializers.ModelSerializer):
 
 
 class FloatTackleSerializer(serializers.ModelSerializer):
+    image_thumbs = ThumbnailsField(source='image')
     specs = serializers.SerializerMethodField()
 
     class Meta:
@@ -97,6 +116,7 @@ class FloatTackleSerializer(serializers.ModelSerializer):
 
 
 class BaitSerializer(serializers.ModelSerializer):
+    image_thumbs = ThumbnailsField(source='image')
     specs = serializers.SerializerMethodField()
 
     class Meta:
@@ -112,6 +132,7 @@ class BaitSerializer(serializers.ModelSerializer):
 
 
 class GroundbaitSerializer(serializers.ModelSerializer):
+    image_thumbs = ThumbnailsField(source='image')
     specs = serializers.SerializerMethodField()
 
     class Meta:
@@ -128,6 +149,7 @@ class GroundbaitSerializer(serializers.ModelSerializer):
 
 
 class FlavoringSerializer(serializers.ModelSerializer):
+    image_thumbs = ThumbnailsField(source='image')
     specs = serializers.SerializerMethodField()
 
     class Meta:
@@ -143,6 +165,7 @@ class FlavoringSerializer(serializers.ModelSerializer):
 
 
 class FoodSerializer(serializers.ModelSerializer):
+    image_thumbs = ThumbnailsField(source='image')
     specs = serializers.SerializerMethodField()
 
     class Meta:
@@ -10,6 +10,10 @@ def reset_fish_prices():
     Запускается каждый игровой день (через Celery beat).
     Обнуляет sold_weight_today для всех записей FishPriceDynamic.
     """
+    from apps.shop.services import FishPricingService
+
     from .models import FishPriceDynamic
+    location_ids = set(FishPriceDynamic.objects.values_list('location_id', flat=True))
     updated = FishPriceDynamic.objects.update(sold_weight_today=0.0)
+    FishPricingService().invalidate(location_ids)
     return f'Сброшены цены: {updated} записей'
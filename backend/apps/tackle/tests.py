@@ -0,0 +1,136 @@
+"""Тесты загрузки изображений и миниатюр."""
+
+import os
+
+import pytest
+from django.core.management import call_command
+from PIL import Image
+
+from apps.tackle.images import MANIFEST_NAME, load_manifest, thumbnail_name
+from apps.tackle.models import FishSpecies
+from apps.tackle.serializers import FishSpeciesSerializer
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / 'media')
+    return tmp_path / 'media'
+
+
+@pytest.fixture
+def images_dir(tmp_path, fish_species):
+    root = tmp_path / 'public_images'
+    (root / 'fish').mkdir(parents=True)
+    Image.new('RGB', (640, 320), 'green').save(root / 'fish' / f'{fish_species.pk}.png')
+    return root
+
+
+def _run(images_dir, **options):
+    from io import StringIO
+    out = StringIO()
+    call_command('load_images', images_dir=str(images_dir), workers=1, stdout=out, stderr=StringIO(), **options)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestLoadImages:
+    """manage.py load_images — инкрементальная загрузка с миниатюрами."""
+
+    def test_ingests_original_and_thumbnails(self, media, images_dir, fish_species):
+        out = _run(images_dir)
+        assert 'Загружено 1 изображений' in out
+
+        fish_species.refresh_from_db()
+        assert fish_species.image.name == f'fish/{fish_species.pk}.png'
+        assert os.path.isfile(media / fish_species.image.name)
+        with Image.open(media / thumbnail_name(fish_species.image.name, 'sm')) as thumb:
+            assert thumb.format == 'WEBP'
+            assert max(thumb.size) == 96
+        assert os.path.isfile(media / MANIFEST_NAME)
+
+    def test_second_run_skips_unchanged(self, media, images_dir, fish_species):
+        _run(images_dir)
+        path = media / f'fish/{fish_species.pk}.png'
+        mtime = os.path.getmtime(path)
+
+        out = _run(images_dir)
+        assert 'Загружено 0 изображений, без изменений 1' in out
+        assert os.path.getmtime(path) == mtime
+        assert not [n for n in os.listdir(media / 'fish') if n != f'{fish_species.pk}.png']
+
+    def test_changed_file_reingested(self, media, images_dir, fish_species):
+        _run(images_dir)
+        digest = load_manifest()['files'][f'tackle.fishspecies:{fish_species.pk}:image']
+        Image.new('RGB', (64, 64), 'red').save(images_dir / 'fish' / f'{fish_species.pk}.png')
+
+        out = _run(images_dir)
+        assert 'Загружено 1 изображений' in out
+        assert load_manifest()['files'][f'tackle.fishspecies:{fish_species.pk}:image'] != digest
+
+    def test_missing_thumbnail_regenerated(self, media, images_dir, fish_species):
+        _run(images_dir)
+        os.remove(media / thumbnail_name(f'fish/{fish_species.pk}.png', 'md'))
+        assert 'Загружено 1 изображений' in _run(images_dir)
+
+    @pytest.mark.slow
+    def test_process_pool(self, media, images_dir, fish_species):
+        from apps.tackle.models import FishSpecies as Species
+        other = Species.objects.create(
+            name_ru='Окунь', name_latin='Perca', rarity='common',
+            weight_min=0.1, weight_max=1, length_min=10, length_max=30,
+            sell_price_per_kg=10, experience_per_kg=5,
+        )
+        Image.new('RGBA', (300, 300), 'blue').save(images_dir / 'fish' / f'{other.pk}.png')
+        from io import StringIO
+        out = StringIO()
+        call_command('load_images', images_dir=str(images_dir), workers=2, stdout=out, stderr=StringIO())
+        assert 'Загружено 2 изображений' in out.getvalue()
+        assert os.path.isfile(media / thumbnail_name(f'fish/{other.pk}.png', 'md'))
+
+
+@pytest.mark.django_db
+class TestThumbnailUrls:
+    """URL миниатюр в сериализаторах."""
+
+    def test_species_thumbs(self, media, images_dir, fish_species):
+        _run(images_dir)
+        fish_species.refresh_from_db()
+        data = FishSpeciesSerializer(fish_species).data
+        assert data['image_thumbs'] == {
+            'sm': f'/media/thumbs/sm/fish/{fish_species.pk}.webp',
+            'md': f'/media/thumbs/md/fish/{fish_species.pk}.webp',
+        }
+
+    def test_image_saved_outside_load_images(self, media, images_dir, fish_species):
+        """Изображение без миниатюр в манифесте (загружено через админку) — URL оригинала."""
+        from django.core.files.base import ContentFile
+
+        _run(images_dir)
+        fish_species.refresh_from_db()
+        fish_species.image.save('admin.png', ContentFile(b'png'), save=True)
+        data = FishSpeciesSerializer(fish_species).data
+        assert data['image_thumbs'] == {
+            'sm': f'/media/{fish_species.image.name}',
+            'md': f'/media/{fish_species.image.name}',
+        }
+
+    def test_legacy_manifest(self, media, fish_species):
+        """Манифест прежнего формата читается; миниатюр в нём нет."""
+        from django.core.files.base import ContentFile
+        from django.core.files.storage import default_storage
+
+        default_storage.save(MANIFEST_NAME, ContentFile(b'{"tackle.fishspecies:1:image": "abc"}'))
+        assert load_manifest() == {'files': {'tackle.fishspecies:1:image': 'abc'}, 'thumbs': {}}
+        FishSpecies.objects.filter(pk=fish_species.pk).update(image='fish/1.png')
+        fish_species.refresh_from_db()
+        assert FishSpeciesSerializer(fish_species).data['image_thumbs']['sm'] == '/media/fish/1.png'
+
+    def test_no_image(self, fish_species):
+        assert FishSpeciesSerializer(fish_species).data['image_thumbs'] is None
+
+    def test_hooked_species_thumbs(self, fishing_session_bite):
+        from apps.fishing.serializers import FishingSessionSerializer
+        data = FishingSessionSerializer(fishing_session_bite).data
+        assert data['hooked_species_thumbs'] is None
+        fishing_session_bite.hooked_species = None
+        assert FishingSessionSerializer(fishing_session_bite).data['hooked_species_thumbs'] is None
@@ -2,6 +2,8 @@
 
 from rest_framework import serializers
 
+from config.serializers import CountedRelationField
+
 from .models import Team, TeamMembership
 
 
@@ -16,7 +18,7 @@ class TeamMemberSerializer(serializers.ModelSerializer):
 
 class TeamSerializer(serializers.ModelSerializer):
     leader_nickname = serializers.CharField(source='leader.nickname', read_only=True)
-    member_count = serializers.ReadOnlyField()
+    member_count = CountedRelationField('memberships')
 
     class Meta:
         model = Team
@@ -45,6 +45,21 @@ class TestTeamList:
         assert resp.status_code == 200
         assert len(resp.data) >= 1
 
+    def test_constant_queries(self, api_client, player, assert_max_queries):
+        """Число участников — аннотация Count, запросов не больше при любом числе команд."""
+        for i in range(20):
+            leader = Player.objects.create(
+                user=User.objects.create_user(username=f'lead{i}', password='x'),
+                nickname=f'Лидер{i}', current_base=player.current_base,
+            )
+            team = Team.objects.create(name=f'Команда {i}', leader=leader)
+            TeamMembership.objects.create(team=team, player=leader, role='leader')
+
+        with assert_max_queries(3):
+            resp = api_client.get('/api/teams/')
+        assert resp.status_code == 200
+        assert {t['member_count'] for t in resp.data['results']} == {1}
+
 
 @pytest.mark.django_db
 class TestCreateTeam:
@@ -4,6 +4,8 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from config.serializers import with_counts
+
 from .models import Team, TeamMembership
 from .serializers import CreateTeamSerializer, TeamDetailSerializer, TeamSerializer
 from .use_cases.create_team import CreateTeamUseCase
@@ -21,7 +23,7 @@ class TeamListView(generics.ListAPIView):
     """Список всех команд."""
 
     serializer_class = TeamSerializer
-    queryset = Team.objects.select_related('leader').all()
+    queryset = with_counts(Team.objects.select_related('leader'), 'memberships')
 
 
 class TeamDetailView(generics.RetrieveAPIView):
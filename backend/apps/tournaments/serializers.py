@@ -3,6 +3,8 @@
 from django.utils import timezone
 from rest_framework import serializers
 
+from config.serializers import CountedRelationField
+
 from .models import Tournament, TournamentEntry
 
 
@@ -26,7 +28,7 @@ class TournamentSerializer(serializers.ModelSerializer):
     target_location_name = serializers.CharField(
         source='target_location.name', read_only=True, default=None,
     )
-    participants_count = serializers.IntegerField(source='entries.count', read_only=True)
+    participants_count = CountedRelationField('entries')
 
     class Meta:
         model = Tournament
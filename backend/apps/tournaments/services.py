@@ -134,14 +134,12 @@ class TournamentService:
 
                 for entry in members:
                     player = entry.player
-                    if tournament.prize_money:
-                        player.money += (tournament.prize_money * multiplier) / member_count
-                    if tournament.prize_experience:
-                        exp = int(tournament.prize_experience * float(multiplier) / member_count)
-                        player.add_experience(exp)
-                    if tournament.prize_karma:
-                        player.karma += int(tournament.prize_karma * float(multiplier) / member_count)
-                    player.save(update_fields=['money', 'karma', 'rank', 'experience'])
+                    player.reward(
+                        money=(tournament.prize_money * multiplier) / member_count,
+                        experience=int(tournament.prize_experience * float(multiplier) / member_count),
+                        karma=int(tournament.prize_karma * float(multiplier) / member_count),
+                    )
+                    player.flush()
 
     def _award_prizes(self, tournament, top_entries):
         """Начисление призов топ-3 индивидуального турнира."""
@@ -158,13 +156,9 @@ class TournamentService:
                     continue
 
                 player = entry.player
-
-                if tournament.prize_money:
-                    player.money += tournament.prize_money * multiplier
-                if tournament.prize_experience:
-                    exp_reward = int(tournament.prize_experience * multiplier)
-                    player.add_experience(exp_reward)
-                if tournament.prize_karma:
-                    player.karma += int(tournament.prize_karma * multiplier)
-
-                player.save(update_fields=['money', 'karma', 'rank', 'experience'])
+                player.reward(
+                    money=tournament.prize_money * multiplier,
+                    experience=int(tournament.prize_experience * multiplier),
+                    karma=int(tournament.prize_karma * multiplier),
+                )
+                player.flush()
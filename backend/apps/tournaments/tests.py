@@ -58,6 +58,22 @@ class TestTournamentList:
         assert resp.status_code == 200
         assert len(resp.data['results']) >= 1
 
+    def test_constant_queries(self, api_client, player, tournament, assert_max_queries):
+        """Число участников — аннотация Count, запросов не больше при любом числе турниров."""
+        TournamentEntry.objects.create(tournament=tournament, player=player)
+        for i in range(20):
+            Tournament.objects.create(
+                name=f'Кубок {i}', tournament_type='individual', scoring='weight',
+                start_time=tournament.start_time, end_time=tournament.end_time,
+                target_location=tournament.target_location,
+            )
+
+        with assert_max_queries(3):
+            resp = api_client.get('/api/tournaments/')
+        assert resp.status_code == 200
+        counts = {t['id']: t['participants_count'] for t in resp.data['results']}
+        assert counts[tournament.pk] == 1
+
     def test_excludes_finished(self, api_client, tournament):
         tournament.is_finished = True
         tournament.save(update_fields=['is_finished'])
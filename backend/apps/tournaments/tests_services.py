@@ -378,3 +378,31 @@ class TestFinalizeTeamTournament:
         # Приз 600 * 100% / 2 = 300 на игрока
         assert p1.money == Decimal('1000.00') + Decimal('300.00')
         assert p2.money == Decimal('1000.00') + Decimal('300.00')
+
+
+@pytest.mark.django_db
+class TestTournamentsQueryBudget:
+    """Регрессии числа запросов TournamentService."""
+
+    # Очки (агрегат + UPDATE) и место (UPDATE) — по участнику; призы — топ-3,
+    # поэтому оба прогона не меньше трёх участников.
+    PER_PLAYER = 3
+
+    def _finalize(self, assert_max_queries, tournament, fish_species, location, players):
+        caught_at = tournament.start_time + timedelta(minutes=30)
+        for i in range(players):
+            p = create_player(f'qb{tournament.pk}_{i}', f'Игрок {tournament.pk}-{i}')
+            TournamentEntry.objects.create(tournament=tournament, player=p)
+            create_caught_fish(p, fish_species, 1.0 + i, 20.0, location, caught_at)
+        with assert_max_queries(100) as stats:
+            TournamentService().finalize_tournament(tournament.pk)
+        return stats.count
+
+    def test_finalize_individual(self, assert_max_queries, finished_tournament, fish_species, tournament_location):
+        """Рост числа запросов с участниками — не больше PER_PLAYER на участника."""
+        small = self._finalize(assert_max_queries, finished_tournament, fish_species, tournament_location, 3)
+        other = Tournament.objects.get(pk=finished_tournament.pk)
+        other.pk, other.is_finished = None, False
+        other.save()
+        large = self._finalize(assert_max_queries, other, fish_species, tournament_location, 6)
+        assert large - small <= 3 * self.PER_PLAYER
@@ -4,6 +4,9 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from config.routers import EVENTUAL
+from config.serializers import with_counts
+
 from .models import Tournament, TournamentEntry
 from .serializers import (
     CreateTournamentSerializer,
@@ -25,9 +28,10 @@ class TournamentListView(generics.ListAPIView):
     """Список активных (незавершённых) турниров."""
 
     serializer_class = TournamentSerializer
-    queryset = Tournament.objects.filter(
-        is_finished=False,
-    ).select_related('target_species', 'target_location').prefetch_related('entries')
+    queryset = with_counts(
+        Tournament.objects.filter(is_finished=False).select_related('target_species', 'target_location'),
+        'entries',
+    )
 
 
 class CreateTournamentView(APIView):
@@ -82,6 +86,7 @@ class JoinTournamentView(APIView):
 class TournamentResultsView(generics.ListAPIView):
     """Результаты турнира (по местам)."""
 
+    read_consistency = EVENTUAL
     serializer_class = TournamentEntrySerializer
 
     def get_queryset(self):
@@ -0,0 +1,129 @@
+"""Растр глубин локации и глубина в точке заброса.
+
+Location.depth_raster — компактный растр float32 (заголовок '<HH' —
+ширина и высота, затем значения построчно). Строится из depth_map при
+сохранении локации: {'grid': [[...], ...]} берётся как есть, а по
+{'min', 'max', 'avg'} генерируется чаша — мелко у краёв, глубже к центру,
+средняя глубина равна avg.
+
+Точка заброса (cast_x, cast_y) приходит от клиента в процентах ширины
+и высоты водоёма (0..CAST_SCALE), растр адресуется долями 0..1 — перевод
+в cast_depth. Глубина в точке — билинейная интерполяция по четырём
+соседним узлам. Разобранный растр
+кэшируется в процессе по локации, поэтому тик не делает запросов к БД:
+растр приезжает вместе со строкой Location.
+"""
+
+import struct
+import threading
+from array import array
+
+HEADER = struct.Struct('<HH')
+GENERATED_SIZE = 16
+CAST_SCALE = 100.0
+DEFAULT_DEPTH = 1.5
+
+
+class DepthRaster:
+    """Растр глубин width × height с билинейной выборкой."""
+
+    __slots__ = ('width', 'height', 'values')
+
+    def __init__(self, width, height, values):
+        if width < 1 or height < 1 or len(values) != width * height:
+            raise ValueError('Размер растра не совпадает с числом значений.')
+        self.width = width
+        self.height = height
+        self.values = values if isinstance(values, array) else array('f', values)
+
+    @classmethod
+    def from_bytes(cls, data):
+        width, height = HEADER.unpack_from(data)
+        values = array('f')
+        values.frombytes(bytes(data[HEADER.size:]))
+        return cls(width, height, values)
+
+    def to_bytes(self) -> bytes:
+        return HEADER.pack(self.width, self.height) + self.values.tobytes()
+
+    def depth_at(self, x, y) -> float:
+        """Глубина в точке (x, y) из 0..1; точки вне растра прижимаются к краю."""
+        fx = min(max(x, 0.0), 1.0) * (self.width - 1)
+        fy = min(max(y, 0.0), 1.0) * (self.height - 1)
+        x0, y0 = int(fx), int(fy)
+        x1, y1 = min(x0 + 1, self.width - 1), min(y0 + 1, self.height - 1)
+        tx, ty = fx - x0, fy - y0
+        v = self.values
+        row0, row1 = y0 * self.width, y1 * self.width
+        top = v[row0 + x0] + (v[row0 + x1] - v[row0 + x0]) * tx
+        bottom = v[row1 + x0] + (v[row1 + x1] - v[row1 + x0]) * tx
+        return top + (bottom - top) * ty
+
+
+def _bowl(size, shallow, deep, exponent):
+    values = []
+    for j in range(size):
+        for i in range(size):
+            dx = i / (size - 1) * 2 - 1
+            dy = j / (size - 1) * 2 - 1
+            r = min(1.0, (dx * dx + dy * dy) ** 0.5)
+            values.append(shallow + (deep - shallow) * (1 - r) ** exponent)
+    return values
+
+
+def build_raster(depth_map, size=GENERATED_SIZE) -> DepthRaster:
+    """Растр из depth_map локации."""
+    depth_map = depth_map or {}
+    grid = depth_map.get('grid')
+    if grid:
+        return DepthRaster(len(grid[0]), len(grid), [float(v) for row in grid for v in row])
+
+    avg = float(depth_map.get('avg', DEFAULT_DEPTH))
+    shallow = float(depth_map.get('min', avg))
+    deep = float(depth_map.get('max', avg))
+    if deep <= shallow:
+        return DepthRaster(1, 1, [avg])
+
+    # Показатель формы чаши подбирается бисекцией так, чтобы среднее было avg.
+    target = min(max(avg, shallow), deep)
+    lo, hi = 0.01, 50.0
+    for _ in range(40):
+        mid = (lo + hi) / 2
+        mean = sum(_bowl(size, shallow, deep, mid)) / (size * size)
+        if mean > target:
+            lo = mid
+        else:
+            hi = mid
+    return DepthRaster(size, size, _bowl(size, shallow, deep, (lo + hi) / 2))
+
+
+_rasters = {}
+_lock = threading.Lock()
+
+
+def get_raster(location) -> DepthRaster:
+    """Разобранный растр локации (кэш процесса, сверка по байтам растра)."""
+    data = location.depth_raster
+    cached = _rasters.get(location.pk)
+    if cached is not None and cached[0] == data:
+        return cached[1]
+    raster = DepthRaster.from_bytes(data) if data else build_raster(location.depth_map)
+    with _lock:
+        _rasters[location.pk] = (data, raster)
+    return raster
+
+
+def cast_depth(raster, x, y) -> float:
+    """Глубина растра в точке заброса (x, y) из 0..CAST_SCALE."""
+    return raster.depth_at(x / CAST_SCALE, y / CAST_SCALE)
+
+
+def depth_at(location, x, y) -> float:
+    """Глубина дна локации в точке заброса (x, y) из 0..CAST_SCALE."""
+    return cast_depth(get_raster(location), x, y)
+
+
+def bait_depth(session) -> float:
+    """Глубина наживки: настройка снасти, но не глубже дна в точке заброса."""
+    bottom = depth_at(session.location, session.cast_x, session.cast_y)
+    return min(session.rod.depth_setting, bottom)
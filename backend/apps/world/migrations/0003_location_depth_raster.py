@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+def build_rasters(apps, schema_editor):
+    from apps.world.depth import build_raster
+
+    Location = apps.get_model('world', 'Location')
+    for location in Location.objects.only('pk', 'depth_map'):
+        location.depth_raster = build_raster(location.depth_map).to_bytes()
+        location.save(update_fields=['depth_raster'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('world', '0002_location_travel_cost'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='location',
+            name='depth_raster',
+            field=models.BinaryField(blank=True, default=b'', editable=False, verbose_name='Растр глубин'),
+        ),
+        migrations.RunPython(build_rasters, migrations.RunPython.noop),
+    ]
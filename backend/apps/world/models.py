@@ -36,6 +36,8 @@ class Location(models.Model):
     image_evening = models.ImageField('Изображение (вечер)', upload_to='locations/', blank=True)
     image_night = models.ImageField('Изображение (ночь)', upload_to='locations/', blank=True)
     depth_map = models.JSONField('Карта глубин', default=dict, blank=True)
+    # Растр float32, собранный из depth_map (apps.world.depth)
+    depth_raster = models.BinaryField('Растр глубин', default=b'', blank=True, editable=False)
     min_rank = models.IntegerField('Мин. разряд', default=1)
     requires_ticket = models.BooleanField('Требует путёвку', default=False)
     travel_cost = models.DecimalField('Стоимость входа', max_digits=10, decimal_places=2, default=0)
@@ -53,6 +55,15 @@ class Location(models.Model):
     def __str__(self):
         return f'{self.base.name} — {self.name}'
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'depth_map' in update_fields:
+            from .depth import build_raster
+            self.depth_raster = build_raster(self.depth_map).to_bytes()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'depth_raster'}
+        super().save(*args, **kwargs)
+
 
 class LocationFish(models.Model):
     """Связь рыбы с локацией (с дополнительными параметрами)."""
@@ -2,6 +2,8 @@
 
 from rest_framework import serializers
 
+from config.serializers import CountedRelationField
+
 from .models import Base, Location, LocationFish
 
 
@@ -16,15 +18,26 @@ class LocationFishSerializer(serializers.ModelSerializer):
 
 class LocationSerializer(serializers.ModelSerializer):
     base_name = serializers.CharField(source='base.name', read_only=True)
+    players_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Location
         fields = [
             'id', 'base', 'base_name', 'name', 'description',
             'image_morning', 'image_day', 'image_evening', 'image_night',
-            'depth_map', 'min_rank', 'requires_ticket', 'travel_cost',
+            'depth_map', 'min_rank', 'requires_ticket', 'travel_cost', 'players_count',
         ]
 
+    def get_players_count(self, obj) -> int:
+        """Из context['players_counts'] (списки), иначе — из OccupancyService контейнера."""
+        counts = self.context.get('players_counts')
+        if counts is None:
+            from config.container import container
+
+            from .services import OccupancyService
+            counts = container.resolve(OccupancyService).counts([obj.pk])
+        return counts.get(obj.pk, 0)
+
 
 class LocationDetailSerializer(LocationSerializer):
     fish_species = LocationFishSerializer(source='location_fish', many=True, read_only=True)
@@ -34,7 +47,7 @@ class LocationDetailSerializer(LocationSerializer):
 
 
 class BaseSerializer(serializers.ModelSerializer):
-    locations_count = serializers.IntegerField(source='locations.count', read_only=True)
+    locations_count = CountedRelationField('locations')
 
     class Meta:
         model = Base
@@ -0,0 +1,253 @@
+"""Присутствие игроков на локациях.
+
+Кто стоит на локации, хранится в Redis: множество игроков локации,
+хэш «игрок → локация» и карточки игроков (id, ник, разряд) для списка.
+Список и число игроков локации, а также обход всех игроков на локациях
+(рыбнадзор) не обращаются к Postgres.
+
+Хранилище — копия Player.current_location: обновляется при входе/выходе
+с локации и переезде на базу, подключение сокета рыбалки только
+подтверждает локацию игрока. Отключение сокета ничего не меняет —
+офлайн-игрок остаётся на локации, как и в БД. Вход и выход рассылаются
+в группу чата локации (location.presence).
+
+reconcile() пересобирает хранилище из БД и ставит отметку «засеяно»:
+задача reconcile_occupancy (beat), bootstrap при старте и первое чтение
+после сброса Redis. Пока отметки нет, рыбнадзор берёт игроков из БД.
+
+Без Redis (LocMemCache в тестах и локальной разработке) данные хранятся
+в памяти процесса с той же семантикой.
+"""
+
+import json
+import threading
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from config import rediscache
+
+MEMBERS_KEY = 'world:location:{location_id}:players'
+WHERE_KEY = 'world:player_location'
+CARDS_KEY = 'world:player_cards'
+SEEDED_KEY = 'world:occupancy_seeded'
+
+
+def location_group(location_id) -> str:
+    """Группа channel layer локации (совпадает с комнатой чата локации)."""
+    return f'chat_location_{location_id}'
+
+
+def player_card(player) -> dict:
+    return {
+        'id': player.pk,
+        'nickname': player.nickname,
+        'rank': player.rank,
+        'rank_title': player.rank_title,
+    }
+
+
+class RedisOccupancyStore:
+    """Множества и хэши в Redis, ключи — через cache.make_key."""
+
+    def __init__(self, client, make_key):
+        self._redis = client
+        self._key = make_key
+
+    def _members(self, location_id):
+        return self._key(MEMBERS_KEY.format(location_id=location_id))
+
+    def move(self, player_id, location_id, card):
+        """Ставит игрока на локацию; возвращает прежнюю (или None)."""
+        old = self._redis.hget(self._key(WHERE_KEY), player_id)
+        old = int(old) if old is not None else None
+        pipe = self._redis.pipeline()
+        if old is not None and old != location_id:
+            pipe.srem(self._members(old), player_id)
+        pipe.sadd(self._members(location_id), player_id)
+        pipe.hset(self._key(WHERE_KEY), player_id, location_id)
+        pipe.hset(self._key(CARDS_KEY), player_id, json.dumps(card))
+        pipe.execute()
+        return old
+
+    def remove(self, player_id):
+        """Убирает игрока с локации; возвращает её (или None)."""
+        old = self._redis.hget(self._key(WHERE_KEY), player_id)
+        if old is None:
+            return None
+        pipe = self._redis.pipeline()
+        pipe.srem(self._members(int(old)), player_id)
+        pipe.hdel(self._key(WHERE_KEY), player_id)
+        pipe.execute()
+        return int(old)
+
+    def replace(self, placements):
+        """Заменяет всё содержимое: {player_id: (location_id, card)}; ставит отметку «засеяно»."""
+        stale = list(self._redis.scan_iter(match=self._members('*')))
+        pipe = self._redis.pipeline()
+        if stale:
+            pipe.delete(*stale)
+        pipe.delete(self._key(WHERE_KEY), self._key(CARDS_KEY))
+        for player_id, (location_id, card) in placements.items():
+            pipe.sadd(self._members(location_id), player_id)
+            pipe.hset(self._key(WHERE_KEY), player_id, location_id)
+            pipe.hset(self._key(CARDS_KEY), player_id, json.dumps(card))
+        pipe.set(self._key(SEEDED_KEY), 1)
+        pipe.execute()
+
+    def seeded(self) -> bool:
+        return bool(self._redis.exists(self._key(SEEDED_KEY)))
+
+    def counts(self, location_ids) -> dict:
+        pipe = self._redis.pipeline(transaction=False)
+        for location_id in location_ids:
+            pipe.scard(self._members(location_id))
+        return dict(zip(location_ids, pipe.execute()))
+
+    def cards(self, location_id) -> list:
+        ids = sorted(int(pid) for pid in self._redis.smembers(self._members(location_id)))
+        if not ids:
+            return []
+        raw = self._redis.hmget(self._key(CARDS_KEY), ids)
+        return [json.loads(card) for card in raw if card is not None]
+
+    def present(self) -> dict:
+        return {
+            int(pid): int(loc) for pid, loc in self._redis.hgetall(self._key(WHERE_KEY)).items()
+        }
+
+
+class MemoryOccupancyStore:
+    """То же в памяти процесса — для кэшей без Redis."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._members = {}
+        self._where = {}
+        self._cards = {}
+        self._seeded = False
+
+    def move(self, player_id, location_id, card):
+        with self._lock:
+            old = self._where.get(player_id)
+            if old is not None and old != location_id:
+                self._members.get(old, set()).discard(player_id)
+            self._members.setdefault(location_id, set()).add(player_id)
+            self._where[player_id] = location_id
+            self._cards[player_id] = card
+            return old
+
+    def remove(self, player_id):
+        with self._lock:
+            old = self._where.pop(player_id, None)
+            if old is not None:
+                self._members.get(old, set()).discard(player_id)
+            return old
+
+    def replace(self, placements):
+        with self._lock:
+            self._members, self._where, self._cards = {}, {}, {}
+            for player_id, (location_id, card) in placements.items():
+                self._members.setdefault(location_id, set()).add(player_id)
+                self._where[player_id] = location_id
+                self._cards[player_id] = card
+            self._seeded = True
+
+    def seeded(self) -> bool:
+        return self._seeded
+
+    def counts(self, location_ids) -> dict:
+        with self._lock:
+            return {lid: len(self._members.get(lid, ())) for lid in location_ids}
+
+    def cards(self, location_id) -> list:
+        with self._lock:
+            ids = sorted(self._members.get(location_id, ()))
+            return [self._cards[pid] for pid in ids if pid in self._cards]
+
+    def present(self) -> dict:
+        with self._lock:
+            return dict(self._where)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Хранилище по бэкенду кэша default (Redis или память процесса)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if rediscache.is_redis():
+                    _store = RedisOccupancyStore(rediscache.client(), rediscache.make_key)
+                else:
+                    _store = MemoryOccupancyStore()
+    return _store
+
+
+class OccupancyService:
+    """Кто на какой локации: вход/выход, сверка с БД, списки и счётчики."""
+
+    def enter(self, player, location_id):
+        """Игрок вошёл на локацию (или переподключился к ней)."""
+        card = player_card(player)
+        old = get_store().move(player.pk, location_id, card)
+        if old != location_id:
+            if old is not None:
+                self._publish(old, 'leave', {'id': player.pk, 'nickname': player.nickname})
+            self._publish(location_id, 'join', card)
+
+    def leave(self, player):
+        """Игрок ушёл с локации (выход, переезд на базу)."""
+        old = get_store().remove(player.pk)
+        if old is not None:
+            self._publish(old, 'leave', {'id': player.pk, 'nickname': player.nickname})
+
+    def connect(self, player):
+        """Сокет рыбалки открыт: подтверждает локацию игрока (чинит расхождение с БД)."""
+        if player.current_location_id:
+            self.enter(player, player.current_location_id)
+
+    def reconcile(self) -> int:
+        """Пересобирает хранилище из Player.current_location; возвращает число игроков."""
+        from apps.accounts.models import Player
+
+        players = Player.objects.filter(current_location__isnull=False).only(
+            'pk', 'nickname', 'rank', 'current_location',
+        )
+        placements = {p.pk: (p.current_location_id, player_card(p)) for p in players}
+        get_store().replace(placements)
+        return len(placements)
+
+    @property
+    def seeded(self) -> bool:
+        """Хранилище засеяно из БД (после сброса Redis — нет)."""
+        return get_store().seeded()
+
+    def _ensure_seeded(self):
+        if not get_store().seeded():
+            self.reconcile()
+
+    def players(self, location_id) -> list:
+        """Карточки игроков локации, по id."""
+        self._ensure_seeded()
+        return get_store().cards(location_id)
+
+    def counts(self, location_ids) -> dict:
+        """{location_id: число игроков} одним обращением к хранилищу."""
+        self._ensure_seeded()
+        return get_store().counts(list(location_ids))
+
+    def present_player_ids(self) -> list:
+        """id всех игроков, стоящих на какой-либо локации (без сверки с БД)."""
+        return sorted(get_store().present())
+
+    def _publish(self, location_id, event, player):
+        layer = get_channel_layer()
+        if layer is None:
+            return
+        async_to_sync(layer.group_send)(location_group(location_id), {
+            'type': 'location.presence', 'event': event, 'player': player,
+        })
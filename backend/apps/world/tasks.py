@@ -0,0 +1,17 @@
+"""Celery-задачи мира — присутствие игроков на локациях."""
+
+from celery import shared_task
+
+
+@shared_task
+def reconcile_occupancy():
+    """
+    Сверка присутствия на локациях с БД.
+    Пересобирает хранилище OccupancyService из Player.current_location:
+    чинит расхождения (упавший процесс, сброс Redis) и засевает пустое.
+    """
+    from config.container import container
+
+    from .services import OccupancyService
+    players = container.resolve(OccupancyService).reconcile()
+    return f'На локациях: {players} игроков'
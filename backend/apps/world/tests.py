@@ -5,7 +5,9 @@ from decimal import Decimal
 from rest_framework import status
 
 from apps.accounts.models import Player
+from apps.world.depth import DepthRaster, build_raster, depth_at, get_raster
 from apps.world.models import Base, Location
+from apps.world.services import OccupancyService, location_group
 
 
 # ── Base list ─────────────────────────────────────────────────────────
@@ -22,6 +24,18 @@ class TestBaseList:
         assert len(resp.data['results']) >= 1
         assert resp.data['results'][0]['name'] == base.name
 
+    def test_constant_queries(self, api_client, base, assert_max_queries):
+        """Число локаций — аннотация Count, запросов не больше при любом числе баз."""
+        for i in range(20):
+            extra = Base.objects.create(name=f'База {i}', min_rank=1, min_karma=0, travel_cost=0)
+            Location.objects.create(base=extra, name=f'Локация {i}', min_rank=1, depth_map={'avg': 2.0})
+
+        with assert_max_queries(3):
+            resp = api_client.get('/api/bases/')
+        assert resp.status_code == status.HTTP_200_OK
+        counts = {b['name']: b['locations_count'] for b in resp.data['results']}
+        assert counts['База 0'] == 1
+
 
 # ── Base locations ────────────────────────────────────────────────────
 
@@ -97,6 +111,7 @@ class TestLocationEnter:
         assert resp.status_code == status.HTTP_200_OK
         player.refresh_from_db()
         assert player.current_location == location
+        assert player.hunger_rate > 0
 
     def test_wrong_base(self, api_client, player):
         """Попытка войти на локацию другой базы — 400."""
@@ -135,6 +150,7 @@ class TestLocationLeave:
         assert resp.status_code == status.HTTP_200_OK
         player.refresh_from_db()
         assert player.current_location is None
+        assert player.hunger_rate == 0
 
 
 # ── Location players ─────────────────────────────────────────────────
@@ -145,8 +161,7 @@ class TestLocationPlayers:
 
     def test_returns_players(self, api_client, player, location):
         """Игрок на локации виден в списке."""
-        player.current_location = location
-        player.save(update_fields=['current_location'])
+        api_client.post(f'/api/locations/{location.pk}/enter/')
 
         resp = api_client.get(f'/api/locations/{location.pk}/players/')
         assert resp.status_code == status.HTTP_200_OK
@@ -160,10 +175,170 @@ class TestLocationPlayers:
             base=base, name='Другая локация',
             min_rank=1, depth_map={'avg': 3.0},
         )
-        player.current_location = other_loc
-        player.save(update_fields=['current_location'])
+        api_client.post(f'/api/locations/{location.pk}/enter/')
+        api_client.post(f'/api/locations/{other_loc.pk}/enter/')
 
         resp = api_client.get(f'/api/locations/{location.pk}/players/')
         assert resp.status_code == status.HTTP_200_OK
         nicknames = [p['nickname'] for p in resp.data]
         assert player.nickname not in nicknames
+
+    def test_leave_and_travel_remove_player(self, api_client, player, base, location):
+        api_client.post(f'/api/locations/{location.pk}/enter/')
+        api_client.post(f'/api/locations/{location.pk}/leave/')
+        assert api_client.get(f'/api/locations/{location.pk}/players/').data == []
+
+        api_client.post(f'/api/locations/{location.pk}/enter/')
+        api_client.post(f'/api/bases/{base.pk}/travel/')
+        assert api_client.get(f'/api/locations/{location.pk}/players/').data == []
+
+    def test_no_player_table_reads(self, api_client, player, location, assert_max_queries):
+        """Список читается из OccupancyService: остаётся только запрос аутентификации."""
+        api_client.post(f'/api/locations/{location.pk}/enter/')
+        OccupancyService().reconcile()
+        with assert_max_queries(1) as stats:
+            resp = api_client.get(f'/api/locations/{location.pk}/players/')
+        assert len(resp.data) == 1
+        assert not any('accounts_player' in sql for sql, _ in stats.queries)
+
+
+    def test_detail_count_uses_container_service(self, api_client, location, monkeypatch):
+        """Счётчик в ответе enter — из OccupancyService контейнера, как у списков."""
+        from config.container import container
+        svc = container.resolve(OccupancyService)
+        monkeypatch.setattr(svc, 'counts', lambda ids: {pk: 7 for pk in ids})
+
+        resp = api_client.post(f'/api/locations/{location.pk}/enter/')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['players_count'] == 7
+
+# ── Occupancy ─────────────────────────────────────────────────────────
+
+
+@pytest.mark.django_db
+class TestOccupancyService:
+
+    def test_counts_in_base_locations(self, api_client, player, base, location):
+        """Список локаций базы отдаёт число игроков на каждой."""
+        api_client.post(f'/api/locations/{location.pk}/enter/')
+        resp = api_client.get(f'/api/bases/{base.pk}/locations/')
+        counts = {loc['id']: loc['players_count'] for loc in resp.data['results']}
+        assert counts[location.pk] == 1
+
+    def test_unseeded_store_rebuilt_from_db(self, player, location):
+        """Пустое хранилище (сброс Redis, первый деплой) засевается из Player.current_location."""
+        Player.objects.filter(pk=player.pk).update(current_location=location)
+        svc = OccupancyService()
+        assert not svc.seeded
+
+        assert [card['id'] for card in svc.players(location.pk)] == [player.pk]
+        assert svc.seeded
+        assert svc.present_player_ids() == [player.pk]
+
+    def test_reconcile_drops_stale_entries(self, player, base, location):
+        """Сверка убирает игроков, которых в БД на локации уже нет."""
+        other = Location.objects.create(base=base, name='Соседняя', min_rank=1, depth_map={'avg': 1.0})
+        svc = OccupancyService()
+        svc.enter(player, other.pk)
+        Player.objects.filter(pk=player.pk).update(current_location=location)
+
+        assert svc.reconcile() == 1
+        assert svc.counts([location.pk, other.pk]) == {location.pk: 1, other.pk: 0}
+
+    def test_socket_does_not_change_presence(self, player, location):
+        """Офлайн-игрок остаётся на локации; подключение сокета подтверждает локацию из БД."""
+        svc = OccupancyService()
+        svc.reconcile()
+        player.current_location = location
+        svc.connect(player)
+        assert svc.present_player_ids() == [player.pk]
+
+        player.current_location = None
+        svc.connect(player)
+        assert svc.present_player_ids() == [player.pk]
+
+    def test_inspection_reads_db_until_seeded(self, player, location, monkeypatch):
+        """Рыбнадзор, пока хранилище не засеяно, берёт игроков на локациях из БД."""
+        from apps.inspection import tasks
+        from apps.inspection.services import InspectionService
+
+        Player.objects.filter(pk=player.pk).update(current_location=location)
+        inspected = []
+        monkeypatch.setattr(InspectionService, 'inspect_player', lambda self, p: inspected.append(p.pk))
+        monkeypatch.setattr('random.random', lambda: 0.0)
+
+        tasks.fish_inspection()
+        assert inspected == [player.pk]
+        assert not OccupancyService().seeded
+
+    def test_presence_events(self, player, base, location):
+        """Вход и выход рассылаются в группу локации."""
+        from asgiref.sync import async_to_sync
+        from channels.layers import get_channel_layer
+
+        other = Location.objects.create(base=base, name='Соседняя', min_rank=1, depth_map={'avg': 1.0})
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(location_group(location.pk), channel)
+
+        svc = OccupancyService()
+        svc.reconcile()
+        svc.enter(player, location.pk)
+        svc.enter(player, other.pk)
+
+        join = async_to_sync(layer.receive)(channel)
+        leave = async_to_sync(layer.receive)(channel)
+        assert join['type'] == 'location.presence'
+        assert (join['event'], join['player']['nickname']) == ('join', player.nickname)
+        assert (leave['event'], leave['player']['id']) == ('leave', player.pk)
+        assert svc.counts([location.pk, other.pk]) == {location.pk: 0, other.pk: 1}
+
+
+# ── Depth raster ──────────────────────────────────────────────────────
+
+
+class TestDepthRaster:
+
+    def test_generated_bowl_matches_depth_map(self):
+        """Чаша из min/max/avg: у краёв min, среднее — avg."""
+        raster = build_raster({'avg': 2.0, 'min': 0.5, 'max': 4.0})
+        assert raster.depth_at(0, 0) == pytest.approx(0.5)
+        assert sum(raster.values) / len(raster.values) == pytest.approx(2.0, abs=1e-3)
+        assert 0.5 < raster.depth_at(0.5, 0.5) <= 4.0
+
+    def test_bilinear_lookup(self):
+        raster = build_raster({'grid': [[1.0, 3.0], [5.0, 7.0]]})
+        assert raster.depth_at(0.5, 0.5) == pytest.approx(4.0)
+        assert raster.depth_at(0.25, 0.0) == pytest.approx(1.5)
+        assert raster.depth_at(2.0, -1.0) == pytest.approx(3.0)  # вне растра — край
+
+    def test_bytes_roundtrip(self):
+        raster = build_raster({'min': 0.5, 'max': 3.0, 'avg': 1.5})
+        copy = DepthRaster.from_bytes(raster.to_bytes())
+        assert (copy.width, copy.height) == (raster.width, raster.height)
+        assert copy.depth_at(0.3, 0.6) == pytest.approx(raster.depth_at(0.3, 0.6))
+
+
+@pytest.mark.django_db
+class TestLocationDepthRaster:
+
+    def test_raster_rebuilt_on_save(self, location):
+        location.depth_map = {'grid': [[2.0]]}
+        location.save(update_fields=['depth_map'])
+        location.refresh_from_db()
+        assert get_raster(location).depth_at(0.7, 0.1) == pytest.approx(2.0)
+
+    def test_cached_per_location(self, location, assert_max_queries):
+        first = get_raster(location)
+        with assert_max_queries(0):
+            assert get_raster(location) is first
+
+    def test_cast_point_in_percent(self, location):
+        """Точка заброса — проценты водоёма, как шлёт клиент: центр чаши глубже края."""
+        location.depth_map = {'avg': 3.0, 'min': 0.5, 'max': 6.0}
+        location.save(update_fields=['depth_map'])
+        raster = get_raster(location)
+        assert depth_at(location, 50, 50) == pytest.approx(raster.depth_at(0.5, 0.5))
+        assert depth_at(location, 50, 50) > 5.0
+        assert depth_at(location, 0, 0) == pytest.approx(0.5)
+        assert depth_at(location, 100, 25) == pytest.approx(raster.depth_at(1.0, 0.25))
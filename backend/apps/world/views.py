@@ -1,29 +1,25 @@
 """Views мира — базы и локации."""
 
-from rest_framework import generics, serializers, status
+from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.accounts.models import Player
+from config.serializers import with_counts
 
 from .models import Base, Location
 from .serializers import BaseSerializer, LocationDetailSerializer, LocationSerializer
+from .services import OccupancyService
 
 
-class LocationPlayerSerializer(serializers.ModelSerializer):
-    """Краткая информация об игроке на локации."""
-
-    rank_title = serializers.ReadOnlyField()
-
-    class Meta:
-        model = Player
-        fields = ['id', 'nickname', 'rank', 'rank_title']
+def _occupancy() -> OccupancyService:
+    from config.container import container
+    return container.resolve(OccupancyService)
 
 
 class BaseListView(generics.ListAPIView):
     """Список рыболовных баз."""
 
-    queryset = Base.objects.all()
+    queryset = with_counts(Base.objects.all(), 'locations')
     serializer_class = BaseSerializer
 
 
@@ -35,6 +31,17 @@ class BaseLocationsView(generics.ListAPIView):
     def get_queryset(self):
         return Location.objects.filter(base_id=self.kwargs['base_id'])
 
+    def get_serializer(self, *args, **kwargs):
+        if kwargs.get('many') and args:
+            # Число игроков страницы локаций — одним обращением к Redis.
+            locations = list(args[0])
+            kwargs['context'] = {
+                **self.get_serializer_context(),
+                'players_counts': _occupancy().counts(loc.pk for loc in locations),
+            }
+            args = (locations, *args[1:])
+        return super().get_serializer(*args, **kwargs)
+
 
 class LocationEnterView(APIView):
     """Зайти на локацию."""
@@ -64,11 +71,14 @@ class LocationEnterView(APIView):
         if location.travel_cost > 0:
             player.money -= location.travel_cost
             player.current_location = location
-            player.save(update_fields=['money', 'current_location'])
+            player.sync_hunger_rate()
+            player.save(update_fields=['money', 'current_location', *player.HUNGER_FIELDS])
         else:
             player.current_location = location
-            player.save(update_fields=['current_location'])
+            player.sync_hunger_rate()
+            player.save(update_fields=['current_location', *player.HUNGER_FIELDS])
 
+        _occupancy().enter(player, location.pk)
         return Response(LocationDetailSerializer(location).data)
 
 
@@ -78,7 +88,9 @@ class LocationLeaveView(APIView):
     def post(self, request, location_id):
         player = request.user.player
         player.current_location = None
-        player.save(update_fields=['current_location'])
+        player.sync_hunger_rate()
+        player.save(update_fields=['current_location', *player.HUNGER_FIELDS])
+        _occupancy().leave(player)
         return Response({'status': 'ok'})
 
 
@@ -110,16 +122,15 @@ class BaseTravelView(APIView):
         player.money -= base.travel_cost
         player.current_base = base
         player.current_location = None
-        player.save(update_fields=['money', 'current_base', 'current_location'])
+        player.sync_hunger_rate()
+        player.save(update_fields=['money', 'current_base', 'current_location', *player.HUNGER_FIELDS])
+        _occupancy().leave(player)
 
         return Response(BaseSerializer(base).data)
 
 
-class LocationPlayersView(generics.ListAPIView):
-    """Список игроков на локации."""
+class LocationPlayersView(APIView):
+    """Список игроков на локации (из OccupancyService, без запросов к БД)."""
 
-    serializer_class = LocationPlayerSerializer
-    pagination_class = None
-
-    def get_queryset(self):
-        return Player.objects.filter(current_location_id=self.kwargs['location_id'])
+    def get(self, request, location_id):
+        return Response(_occupancy().players(location_id))
@@ -0,0 +1 @@
+"""Микробенчмарки бэкенда. Запуск: python -m benchmarks.<имя> из каталога backend."""
@@ -0,0 +1,31 @@
+"""Общие утилиты бенчмарков."""
+
+import os
+import statistics
+import time
+
+
+def setup_django(settings_module='config.settings'):
+    """Настраивает Django без подключения к БД."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def measure(fn, number=1000, repeat=5, clock=time.perf_counter):
+    """Медианное время одного вызова fn в микросекундах (clock=time.process_time — CPU)."""
+    runs = []
+    for _ in range(repeat):
+        start = clock()
+        for _ in range(number):
+            fn()
+        runs.append((clock() - start) / number * 1e6)
+    return statistics.median(runs)
+
+
+def report(title, rows):
+    """Печатает таблицу [(название, значение, единица), ...]."""
+    print(f'\n{title}')
+    width = max(len(name) for name, _, _ in rows)
+    for name, value, unit in rows:
+        print(f'  {name:<{width}}  {value:>12.2f} {unit}')
@@ -0,0 +1,73 @@
+"""
+Бенчмарк DI-контейнера: стоимость resolve и время старта воркера.
+
+    python -m benchmarks.container
+
+«До» — transient-регистрации punq, граф собирается на каждый resolve,
+все use cases импортируются при импорте config.container.
+«После» — LazyContainer: синглтоны, кэш экземпляров, ленивая сборка.
+"""
+
+import subprocess
+import sys
+
+from ._common import measure, report, setup_django
+
+STARTUP_SNIPPET = '''
+import os, time
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+import django
+django.setup()
+start = time.perf_counter()
+import config.container as c
+{eager}
+imported = time.perf_counter()
+from apps.fishing.use_cases.status import FishingStatusUseCase
+c.container.resolve(FishingStatusUseCase)
+print(imported - start, time.perf_counter() - start)
+'''
+
+
+def _startup(eager: bool, runs: int = 7):
+    """Медиана (импорт контейнера, импорт + первый resolve) в мс, в отдельном процессе."""
+    code = STARTUP_SNIPPET.format(eager='c._build_container(c.punq.Scope.transient)' if eager else '')
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True,
+        ).stdout.split()
+        samples.append((float(out[0]) * 1000, float(out[1]) * 1000))
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    setup_django()
+    import punq
+
+    from apps.fishing.use_cases.status import FishingStatusUseCase
+    from config.container import LazyContainer, _build_container
+
+    transient = _build_container(punq.Scope.transient)
+    singleton = _build_container()
+    lazy = LazyContainer()
+    lazy.resolve(FishingStatusUseCase)
+
+    report('resolve(FishingStatusUseCase), мкс/вызов', [
+        ('до: punq transient', measure(lambda: transient.resolve(FishingStatusUseCase)), 'мкс'),
+        ('punq singleton', measure(lambda: singleton.resolve(FishingStatusUseCase)), 'мкс'),
+        ('после: LazyContainer', measure(lambda: lazy.resolve(FishingStatusUseCase), number=100000), 'мкс'),
+    ])
+
+    eager_import, eager_total = _startup(eager=True)
+    lazy_import, lazy_total = _startup(eager=False)
+    report('Старт воркера после django.setup, мс', [
+        ('до: импорт (eager)', eager_import, 'мс'),
+        ('после: импорт (lazy)', lazy_import, 'мс'),
+        ('до: импорт + первый resolve', eager_total, 'мс'),
+        ('после: импорт + первый resolve', lazy_total, 'мс'),
+    ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Нагрузочный тест пула соединений: много «тикающих» сокетов.
+
+    python -m benchmarks.db_pool --sockets 2000 --seconds 30
+    DB_POOL=0 python -m benchmarks.db_pool ...   # без пула, для сравнения
+
+Каждый сокет раз в --interval секунд выполняет запросы тика через
+config.db.database_sync_to_async. Раз в полсекунды считается число
+соединений в pg_stat_activity: мин/среднее/макс сравниваются с max_size
+пула и с прогоном DB_POOL=0. Нужен Postgres из settings; результаты
+прогонов в репозитории не зафиксированы.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from ._common import report, setup_django
+
+
+def _connection_count(dsn_kwargs):
+    import psycopg
+    with psycopg.connect(**dsn_kwargs, autocommit=True) as conn:
+        return conn.execute(
+            'SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()',
+        ).fetchone()[0] - 1  # минус собственное соединение
+
+
+async def run(sockets, seconds, interval):
+    from django.db import connection
+
+    from apps.fishing.models import FishingSession, GameTime
+    from config.db import collect_pool_stats, database_sync_to_async
+    from config.metrics import registry
+
+    @database_sync_to_async
+    def tick():
+        GameTime.get_instance()
+        FishingSession.objects.filter(state=FishingSession.State.WAITING).exists()
+
+    dsn = connection.get_connection_params()
+    dsn.pop('cursor_factory', None)
+    dsn.pop('context', None)
+    deadline = time.perf_counter() + seconds
+    ticks = 0
+    latencies = []
+
+    async def socket_loop(offset):
+        nonlocal ticks
+        await asyncio.sleep(offset)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await tick()
+            latencies.append(time.perf_counter() - start)
+            ticks += 1
+            await asyncio.sleep(interval)
+
+    async def sampler(samples):
+        while time.perf_counter() < deadline:
+            samples.append(await asyncio.to_thread(_connection_count, dsn))
+            await asyncio.sleep(0.5)
+
+    samples = []
+    await asyncio.gather(
+        sampler(samples),
+        *(socket_loop(interval * i / sockets) for i in range(sockets)),
+    )
+
+    collect_pool_stats()
+    snapshot = registry.snapshot()
+
+    def pool_value(name):
+        rows = snapshot.get(name, {}).get('samples', [])
+        return rows[0][1] if rows else 0
+
+    latencies.sort()
+    report(f'{sockets} сокетов, {seconds} с, тик раз в {interval} с', [
+        ('тиков/с', ticks / seconds, ''),
+        ('p50 тика', latencies[len(latencies) // 2] * 1000, 'мс'),
+        ('p99 тика', latencies[int(len(latencies) * 0.99)] * 1000, 'мс'),
+        ('соединений: мин', min(samples), ''),
+        ('соединений: среднее', statistics.mean(samples), ''),
+        ('соединений: макс', max(samples), ''),
+        ('соединений: stdev', statistics.pstdev(samples), ''),
+        ('пул: max_size', pool_value('db_pool_max_size'), ''),
+        ('пул: ожидание всего', pool_value('db_pool_requests_wait_ms'), 'мс'),
+        ('пул: ошибки', pool_value('db_pool_requests_errors'), ''),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sockets', type=int, default=1000)
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--interval', type=float, default=1.5)
+    args = parser.parse_args()
+
+    setup_django()
+    asyncio.run(run(args.sockets, args.seconds, args.interval))
+
+
+if __name__ == '__main__':
+    main()
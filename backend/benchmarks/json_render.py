@@ -0,0 +1,114 @@
+"""
+Бенчмарк JSON: штатные энкодеры против config.fastjson.
+
+    python -m benchmarks.json_render
+
+Полезная нагрузка — вывод настоящих FishingSessionSerializer (кадр тика:
+5 сессий) и CaughtFishSerializer (садок: 50 рыб) на несохранённых
+объектах, БД не нужна. Для каждого пути печатаются время и CPU на вызов
+и пропускная способность в МБ/с.
+"""
+
+import json
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from ._common import measure, report, setup_django
+
+
+def build_sessions(count, now=None):
+    """Несохранённые FishingSession с поклёвкой и связанными объектами (без БД)."""
+    from django.utils import timezone
+
+    from apps.fishing.models import FishingSession
+    from apps.inventory.models import PlayerRod
+    from apps.tackle.models import FishSpecies, RodType
+    from apps.world.models import Location
+
+    now = now or timezone.now()
+    location = Location(pk=1, name='Тихая заводь')
+    rod_type = RodType(pk=1, name='Поплавочная 4м', rod_class='float')
+    species = FishSpecies(
+        pk=1, name_ru='Карась', rarity='common',
+        sell_price_per_kg=Decimal('35.00'), experience_per_kg=10,
+    )
+    return [
+        FishingSession(
+            pk=i, state='bite', slot=i, location=location,
+            rod=PlayerRod(pk=i, rod_type=rod_type),
+            cast_x=12.5 + i, cast_y=40.25, cast_time=now - timedelta(seconds=40),
+            bite_time=now, hooked_species=species, hooked_weight=1.234, hooked_length=31.5,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def _payloads():
+    from django.utils import timezone
+
+    from apps.fishing.serializers import FishingSessionSerializer
+    from apps.inventory.models import CaughtFish
+    from apps.inventory.serializers import CaughtFishSerializer
+
+    now = timezone.now()
+    sessions = build_sessions(5, now)
+    species, location = sessions[0].hooked_species, sessions[0].location
+    fish = [
+        CaughtFish(
+            pk=i, species=species, weight=0.5 + i / 10, length=20 + i / 3,
+            location=location, caught_at=now - timedelta(minutes=i),
+        )
+        for i in range(1, 51)
+    ]
+    tick = {
+        'type': 'state',
+        'sessions': FishingSessionSerializer(sessions, many=True).data,
+        'game_time': {'hour': 6, 'minute': 30, 'time_of_day': 'morning'},
+    }
+    creel = CaughtFishSerializer(fish, many=True).data
+    return {'тик (5 сессий)': tick, 'садок (50 рыб)': creel}
+
+
+def _paths(backend_names):
+    from django.core.serializers.json import DjangoJSONEncoder
+    from rest_framework.renderers import JSONRenderer
+
+    from config import fastjson
+
+    paths = {
+        'DRF JSONRenderer': JSONRenderer().render,
+        'json + DjangoJSONEncoder': lambda data: json.dumps(data, cls=DjangoJSONEncoder).encode(),
+    }
+    for name in backend_names:
+        backend = fastjson._make_backend(name)
+        paths[f'FastJSONRenderer [{name}]'] = (
+            lambda data, b=backend: b.dumps(data, fastjson.drf_default)
+        )
+        paths[f'консьюмер [{name}]'] = (
+            lambda data, b=backend: b.dumps(data, fastjson.django_default).decode()
+        )
+    return paths
+
+
+def main():
+    setup_django()
+    from config import fastjson
+
+    backends = ['stdlib'] + (['orjson'] if fastjson.orjson is not None else [])
+    for title, payload in _payloads().items():
+        rows = []
+        for name, fn in _paths(backends).items():
+            size = len(fn(payload))
+            wall = measure(lambda: fn(payload), number=2000)
+            cpu = measure(lambda: fn(payload), number=2000, clock=time.process_time)
+            rows += [
+                (f'{name}: вызов', wall, 'мкс'),
+                (f'{name}: CPU', cpu, 'мкс'),
+                (f'{name}: поток', size / wall, 'МБ/с'),
+            ]
+        report(f'{title}, {size} байт', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Бенчмарк сериализации кадра тика: DRF-сериализаторы против проекций.
+
+    python -m benchmarks.tick_projection
+
+Игрок с тремя удочками (одна вываживает рыбу), объекты не сохраняются,
+БД не нужна. «До» — FishingSessionSerializer/FightStateSerializer, как
+в тике раньше; «после» — apps.fishing.projections.state_payload.
+"""
+
+import time
+
+from ._common import measure, report, setup_django
+from .json_render import build_sessions
+
+
+def main():
+    setup_django()
+    from apps.fishing.models import FightState, GameTime
+    from apps.fishing.projections import state_payload
+    from apps.fishing.serializers import FightStateSerializer, FishingSessionSerializer
+
+    sessions = build_sessions(3)
+    sessions[0].state = 'fighting'
+    fights = {
+        sessions[0].pk: FightState(
+            session=sessions[0], fish_strength=3.7, line_tension=20.0,
+            distance=25.0, rod_durability=100.0,
+        ),
+    }
+    gt = GameTime(current_hour=6, current_day=1)
+
+    def serializers_tick():
+        return {
+            'sessions': FishingSessionSerializer(sessions, many=True).data,
+            'fights': {str(sid): FightStateSerializer(f).data for sid, f in fights.items()},
+            'game_time': {
+                'hour': gt.current_hour, 'day': gt.current_day, 'time_of_day': gt.time_of_day,
+            },
+        }
+
+    def projections_tick():
+        return state_payload(sessions, fights, gt)
+
+    assert projections_tick() == serializers_tick()
+
+    rows = []
+    for name, fn in (('ModelSerializer', serializers_tick), ('проекции', projections_tick)):
+        rows += [
+            (f'{name}: тик', measure(fn, number=5000), 'мкс'),
+            (f'{name}: CPU', measure(fn, number=5000, clock=time.process_time), 'мкс'),
+        ]
+    report('Кадр тика, 3 удочки', rows)
+
+
+if __name__ == '__main__':
+    main()
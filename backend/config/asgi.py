@@ -3,7 +3,7 @@
 import os
 
 from channels.auth import AuthMiddlewareStack
-from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.routing import ChannelNameRouter, ProtocolTypeRouter, URLRouter
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
@@ -12,10 +12,19 @@ django_asgi_app = get_asgi_application()
 from apps.chat.middleware import JWTAuthMiddleware
 from apps.chat.routing import websocket_urlpatterns as chat_ws
 from apps.fishing.routing import websocket_urlpatterns as fishing_ws
+from apps.fishing.shards import FishingShardWorker, all_shards
+from config import metrics
+
+# Снимок метрик процесса для /metrics соседних процессов.
+metrics.start_pusher()
 
 application = ProtocolTypeRouter({
     'http': django_asgi_app,
     'websocket': JWTAuthMiddleware(
         URLRouter(chat_ws + fishing_ws)
     ),
+    # Воркеры шардов рыбалки: manage.py runworker <канал>...
+    'channel': ChannelNameRouter({
+        name: FishingShardWorker.as_asgi() for name in all_shards()
+    }),
 })
@@ -0,0 +1,69 @@
+"""Снимки редко меняющихся каталогов в памяти процесса.
+
+Снимок собирается один раз на процесс и пересобирается, когда меняется
+версия в кэше: receiver'ы post_save/post_delete моделей каталога пишут
+новую версию сразу и ещё раз после коммита — процесс, успевший собрать
+снимок из старых данных до коммита, увидит вторую версию. Изменения в
+обход сигналов (bulk-операции, фикстуры) подхватываются по max_age.
+"""
+
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+DEFAULT_MAX_AGE = 600
+
+
+class VersionedCatalog:
+    """Снимок builder(), версия которого хранится в кэше под key."""
+
+    def __init__(self, key, builder, max_age=DEFAULT_MAX_AGE):
+        self.key = key
+        self._builder = builder
+        self._max_age = max_age
+        self._snapshot = None
+        self._version = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def version(self, cached=None):
+        """Текущая версия; cached — уже прочитанное из кэша значение key (get_many)."""
+        if cached is not None:
+            return cached
+        cache.add(self.key, uuid.uuid4().hex, None)
+        return cache.get(self.key)
+
+    def get(self, version=None):
+        """Снимок для версии (по умолчанию — из кэша); пересобирается при смене версии."""
+        version = self.version(version)
+        if self._stale(version):
+            with self._lock:
+                if self._stale(version):
+                    self._snapshot = self._builder()
+                    self._version = version
+                    self._built_at = time.monotonic()
+        return self._snapshot
+
+    def invalidate(self):
+        cache.set(self.key, uuid.uuid4().hex, None)
+
+    def watch(self, *models):
+        """Инвалидация при сохранении и удалении экземпляров models."""
+        for model in models:
+            uid = f'{self.key}:{model._meta.label_lower}'
+            post_save.connect(self._changed, sender=model, weak=False, dispatch_uid=f'{uid}:save')
+            post_delete.connect(self._changed, sender=model, weak=False, dispatch_uid=f'{uid}:delete')
+
+    def _changed(self, **kwargs):
+        self.invalidate()
+        transaction.on_commit(self.invalidate)
+
+    def _stale(self, version) -> bool:
+        return (
+            self._snapshot is None or self._version != version
+            or time.monotonic() - self._built_at > self._max_age
+        )
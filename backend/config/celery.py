@@ -1,12 +1,17 @@
 """Конфигурация Celery."""
 
+import logging
 import os
+import time
 
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import task_postrun, task_prerun, worker_init
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
+logger = logging.getLogger(__name__)
+
 app = Celery('russian_fishing')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
@@ -19,11 +24,6 @@ app.conf.beat_schedule = {
         'task': 'apps.fishing.tasks.advance_game_time',
         'schedule': 30.0,  # секунды
     },
-    # Снижение голода - каждые 5 минут
-    'hunger-tick': {
-        'task': 'apps.fishing.tasks.hunger_tick',
-        'schedule': 300.0,  # 5 минут * 60
-    },
     # Очистка истёкших прикормочных пятен - каждый час
     'cleanup-expired-groundbait': {
         'task': 'apps.fishing.tasks.cleanup_expired_groundbait',
@@ -39,6 +39,11 @@ app.conf.beat_schedule = {
         'task': 'apps.tournaments.tasks.check_and_finalize_tournaments',
         'schedule': 600.0,  # 10 минут
     },
+    # Сверка присутствия на локациях с БД - каждые 10 минут
+    'reconcile-occupancy': {
+        'task': 'apps.world.tasks.reconcile_occupancy',
+        'schedule': 600.0,  # 10 минут
+    },
     # Рыбнадзор - каждые 30 минут
     'fish-inspection': {
         'task': 'apps.inspection.tasks.fish_inspection',
@@ -65,3 +70,34 @@ app.conf.beat_schedule = {
         'schedule': 3600.0,  # 1 час
     },
 }
+
+
+@worker_init.connect
+def _close_db_pools(**kwargs):
+    """Дочерние процессы prefork не должны наследовать пул соединений главного."""
+    from config.db import close_pools
+    close_pools()
+
+
+# Метрики задач: длительность и итог; снимок реестра уходит в кэш для /metrics.
+_task_started = {}
+
+
+@task_prerun.connect
+def _metrics_task_prerun(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _metrics_task_postrun(task_id=None, task=None, state=None, **kwargs):
+    from config import metrics
+
+    started = _task_started.pop(task_id, None)
+    name = getattr(task, 'name', 'unknown')
+    if started is not None:
+        metrics.CELERY_TASK_DURATION.observe(time.perf_counter() - started, task=name)
+    metrics.CELERY_TASKS.inc(task=name, state=state or 'UNKNOWN')
+    try:
+        metrics.push_snapshot()
+    except Exception:
+        logger.warning('Задача %s: не удалось сохранить метрики', name, exc_info=True)
@@ -1,130 +1,131 @@
-"""DI-контейнер приложения (punq)."""
-
-import punq
+"""DI-контейнер приложения (punq).
 
+Сервисы и use cases не хранят состояния между вызовами, поэтому
+регистрируются синглтонами. Модули приложений импортируются лениво —
+при первом resolve, а не при импорте config.container.
+"""
 
-def _build_container() -> punq.Container:
-    from apps.fishing.services.bite_calculator import BiteCalculatorService
-    from apps.fishing.services.fight_engine import FightEngineService
-    from apps.fishing.services.fish_selector import FishSelectorService
-    from apps.fishing.services.time_service import TimeService
-    from apps.fishing.use_cases.cast import CastUseCase
-    from apps.fishing.use_cases.change_bait import ChangeBaitUseCase
-    from apps.fishing.use_cases.fight import PullRodUseCase, ReelInUseCase
-    from apps.fishing.use_cases.groundbait import ApplyGroundbaitUseCase
-    from apps.fishing.use_cases.keep_fish import KeepFishUseCase
-    from apps.fishing.use_cases.release_fish import ReleaseFishUseCase
-    from apps.fishing.use_cases.retrieve import RetrieveRodUseCase
-    from apps.fishing.use_cases.status import FishingStatusUseCase
-    from apps.fishing.use_cases.strike import StrikeUseCase
-    from apps.bazaar.use_cases.buy_listing import BuyListingUseCase
-    from apps.bazaar.use_cases.cancel_listing import CancelListingUseCase
-    from apps.bazaar.use_cases.create_listing import CreateListingUseCase
-    from apps.cafe.use_cases.deliver_fish import DeliverFishUseCase
-    from apps.cafe.use_cases.get_orders import GetCafeOrdersUseCase
-    from apps.home.services import MoonshineService
-    from apps.home.use_cases.collect_moonshine import CollectMoonshineUseCase
-    from apps.bar.use_cases.order_drink import OrderDrinkUseCase
-    from apps.bar.use_cases.prepare_snack import PrepareSnackUseCase
-    from apps.home.use_cases.start_brewing import StartBrewingUseCase
-    from apps.inspection.services import InspectionService
-    from apps.inventory.use_cases.assemble_rod import AssembleRodUseCase
-    from apps.inventory.use_cases.change_tackle import ChangeTackleUseCase
-    from apps.inventory.use_cases.delete_rod import DeleteRodUseCase
-    from apps.inventory.use_cases.disassemble_rod import DisassembleRodUseCase
-    from apps.inventory.use_cases.eat import EatUseCase
-    from apps.inventory.use_cases.equip_rod import EquipRodUseCase
-    from apps.inventory.use_cases.unequip_rod import UnequipRodUseCase
-    from apps.potions.services import PotionService
-    from apps.potions.use_cases.craft_potion import CraftPotionUseCase
-    from apps.quests.services import QuestService
-    from apps.quests.use_cases.accept_quest import AcceptQuestUseCase
-    from apps.quests.use_cases.claim_reward import ClaimQuestRewardUseCase
-    from apps.records.services import RecordService
-    from apps.shop.use_cases.buy_item import BuyItemUseCase
-    from apps.shop.use_cases.sell_fish import SellFishUseCase
-    from apps.teams.use_cases.create_team import CreateTeamUseCase
-    from apps.teams.use_cases.join_team import JoinTeamUseCase
-    from apps.teams.use_cases.leave_team import LeaveTeamUseCase
-    from apps.tournaments.services import TournamentService
-    from apps.tournaments.use_cases.create_tournament import CreateTournamentUseCase
-    from apps.tournaments.use_cases.join_tournament import JoinTournamentUseCase
-
-    container = punq.Container()
+import threading
+from importlib import import_module
 
-    # Сервисы без зависимостей
-    container.register(TimeService)
-    container.register(PotionService)
-    container.register(MoonshineService)
-    container.register(FightEngineService)
-    container.register(RecordService)
-    container.register(QuestService)
-    container.register(TournamentService)
-    container.register(InspectionService)
+import punq
 
+from config import metrics
+
+# Сервисы без зависимостей
+SERVICES = [
+    'config.rng.RandomService',
+    'apps.fishing.services.time_service.TimeService',
+    'apps.potions.services.PotionService',
+    'apps.home.services.MoonshineService',
+    'apps.fishing.services.fight_engine.FightEngineService',
+    'apps.records.services.RecordService',
+    'apps.quests.services.QuestService',
+    'apps.tournaments.services.TournamentService',
+    'apps.inspection.services.InspectionService',
+    'apps.shop.services.FishPricingService',
+    'apps.world.services.OccupancyService',
     # Сервисы с зависимостями
-    container.register(BiteCalculatorService)
-    container.register(FishSelectorService)
-
-    # Use cases — fishing
-    container.register(CastUseCase)
-    container.register(RetrieveRodUseCase)
-    container.register(ReleaseFishUseCase)
-    container.register(KeepFishUseCase)
-    container.register(ReelInUseCase)
-    container.register(PullRodUseCase)
-    container.register(StrikeUseCase)
-    container.register(FishingStatusUseCase)
-    container.register(ApplyGroundbaitUseCase)
-    container.register(ChangeBaitUseCase)
-
-    # Use cases — inventory
-    container.register(AssembleRodUseCase)
-    container.register(DisassembleRodUseCase)
-    container.register(ChangeTackleUseCase)
-    container.register(EquipRodUseCase)
-    container.register(UnequipRodUseCase)
-    container.register(EatUseCase)
-    container.register(DeleteRodUseCase)
-
-    # Use cases — tournaments
-    container.register(CreateTournamentUseCase)
-    container.register(JoinTournamentUseCase)
-
-    # Use cases — potions
-    container.register(CraftPotionUseCase)
-
-    # Use cases — quests
-    container.register(AcceptQuestUseCase)
-    container.register(ClaimQuestRewardUseCase)
-
-    # Use cases — teams
-    container.register(CreateTeamUseCase)
-    container.register(JoinTeamUseCase)
-    container.register(LeaveTeamUseCase)
-
-    # Use cases — shop
-    container.register(BuyItemUseCase)
-    container.register(SellFishUseCase)
-
-    # Use cases — bazaar
-    container.register(CreateListingUseCase)
-    container.register(BuyListingUseCase)
-    container.register(CancelListingUseCase)
-
-    # Use cases — cafe
-    container.register(GetCafeOrdersUseCase)
-    container.register(DeliverFishUseCase)
-
-    # Use cases — home
-    container.register(StartBrewingUseCase)
-    container.register(CollectMoonshineUseCase)
-
-    # Use cases — bar
-    container.register(OrderDrinkUseCase)
-    container.register(PrepareSnackUseCase)
-
+    'apps.fishing.services.bite_calculator.BiteCalculatorService',
+    'apps.fishing.services.fish_selector.FishSelectorService',
+]
+
+USE_CASES = [
+    # fishing
+    'apps.fishing.use_cases.cast.CastUseCase',
+    'apps.fishing.use_cases.retrieve.RetrieveRodUseCase',
+    'apps.fishing.use_cases.release_fish.ReleaseFishUseCase',
+    'apps.fishing.use_cases.keep_fish.KeepFishUseCase',
+    'apps.fishing.use_cases.fight.ReelInUseCase',
+    'apps.fishing.use_cases.fight.PullRodUseCase',
+    'apps.fishing.use_cases.strike.StrikeUseCase',
+    'apps.fishing.use_cases.status.FishingStatusUseCase',
+    'apps.fishing.use_cases.groundbait.ApplyGroundbaitUseCase',
+    'apps.fishing.use_cases.change_bait.ChangeBaitUseCase',
+    # inventory
+    'apps.inventory.use_cases.assemble_rod.AssembleRodUseCase',
+    'apps.inventory.use_cases.disassemble_rod.DisassembleRodUseCase',
+    'apps.inventory.use_cases.change_tackle.ChangeTackleUseCase',
+    'apps.inventory.use_cases.equip_rod.EquipRodUseCase',
+    'apps.inventory.use_cases.unequip_rod.UnequipRodUseCase',
+    'apps.inventory.use_cases.eat.EatUseCase',
+    'apps.inventory.use_cases.delete_rod.DeleteRodUseCase',
+    # tournaments
+    'apps.tournaments.use_cases.create_tournament.CreateTournamentUseCase',
+    'apps.tournaments.use_cases.join_tournament.JoinTournamentUseCase',
+    # potions
+    'apps.potions.use_cases.craft_potion.CraftPotionUseCase',
+    # quests
+    'apps.quests.use_cases.accept_quest.AcceptQuestUseCase',
+    'apps.quests.use_cases.claim_reward.ClaimQuestRewardUseCase',
+    # teams
+    'apps.teams.use_cases.create_team.CreateTeamUseCase',
+    'apps.teams.use_cases.join_team.JoinTeamUseCase',
+    'apps.teams.use_cases.leave_team.LeaveTeamUseCase',
+    # shop
+    'apps.shop.use_cases.buy_item.BuyItemUseCase',
+    'apps.shop.use_cases.sell_fish.SellFishUseCase',
+    # bazaar
+    'apps.bazaar.use_cases.create_listing.CreateListingUseCase',
+    'apps.bazaar.use_cases.buy_listing.BuyListingUseCase',
+    'apps.bazaar.use_cases.cancel_listing.CancelListingUseCase',
+    # cafe
+    'apps.cafe.use_cases.get_orders.GetCafeOrdersUseCase',
+    'apps.cafe.use_cases.deliver_fish.DeliverFishUseCase',
+    # home
+    'apps.home.use_cases.start_brewing.StartBrewingUseCase',
+    'apps.home.use_cases.collect_moonshine.CollectMoonshineUseCase',
+    # bar
+    'apps.bar.use_cases.order_drink.OrderDrinkUseCase',
+    'apps.bar.use_cases.prepare_snack.PrepareSnackUseCase',
+]
+
+
+def _import(path: str):
+    module, _, name = path.rpartition('.')
+    return getattr(import_module(module), name)
+
+
+def _build_container(scope: punq.Scope = punq.Scope.singleton) -> punq.Container:
+    """Собирает punq-контейнер; scope=transient воспроизводит старое поведение."""
+    container = punq.Container()
+    for path in SERVICES + USE_CASES:
+        container.register(_import(path), scope=scope)
     return container
 
 
-container = _build_container()
+class LazyContainer:
+    """
+    Обёртка над punq.Container: сборка при первом resolve и кэш экземпляров.
+
+    Повторный resolve того же класса — поиск в dict, без обхода графа punq.
+    execute() у use cases оборачивается метриками (config.metrics).
+    """
+
+    def __init__(self):
+        self._container = None
+        self._instances = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, service):
+        try:
+            return self._instances[service]
+        except KeyError:
+            pass
+        with self._lock:
+            if self._container is None:
+                self._container = _build_container()
+            instance = self._container.resolve(service)
+            if service.__name__.endswith('UseCase'):
+                instance = metrics.instrument_use_case(instance)
+            self._instances[service] = instance
+        return instance
+
+    def reset(self):
+        """Сбрасывает контейнер; следующий resolve соберёт его заново."""
+        with self._lock:
+            self._container = None
+            self._instances.clear()
+
+
+container = LazyContainer()
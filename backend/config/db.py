@@ -0,0 +1,94 @@
+"""Доступ к БД из async-кода и пул соединений psycopg 3.
+
+database_sync_to_async здесь — вариант channels с отдельным пулом потоков
+размера DB_EXECUTOR_THREADS. Пул соединений (settings.DB_POOL) рассчитан
+на то же число потоков, поэтому потоку консьюмера соединение достаётся
+без ожидания, а число соединений процесса с Postgres ограничено max_size
+пула, а не числом сокетов.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from channels.db import DatabaseSyncToAsync
+from django.conf import settings
+from django.db import connections
+
+from config import metrics
+
+_executor = None
+
+
+def db_executor() -> ThreadPoolExecutor:
+    """Общий пул потоков для обращений консьюмеров к БД."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.DB_EXECUTOR_THREADS, thread_name_prefix='db',
+        )
+    return _executor
+
+
+def database_sync_to_async(func):
+    """Как channels.db.database_sync_to_async, но в ограниченном пуле db_executor()."""
+    return DatabaseSyncToAsync(func, thread_sensitive=False, executor=db_executor())
+
+
+def _pools():
+    """Пулы соединений по алиасам БД: {alias: ConnectionPool} (без пула — не входят)."""
+    pools = {}
+    for alias in connections:
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is not None:
+            pools[alias] = pool
+    return pools
+
+
+def close_pools():
+    """
+    Закрывает пулы соединений процесса (Celery prefork — до fork воркеров).
+
+    Главный процесс prefork задач не выполняет, поэтому после закрытия
+    пула дочерним процессам нечего наследовать: каждый создаёт свой пул
+    при первом запросе.
+    """
+    for alias in _pools():
+        connections[alias].close_pool()
+
+
+# ── Метрики пула ──────────────────────────────────────────────
+
+POOL_SIZE = metrics.registry.gauge('db_pool_size', 'Соединений в пуле', ['alias'])
+POOL_MAX = metrics.registry.gauge('db_pool_max_size', 'Максимальный размер пула', ['alias'])
+POOL_AVAILABLE = metrics.registry.gauge('db_pool_available', 'Свободных соединений', ['alias'])
+POOL_WAITING = metrics.registry.gauge('db_pool_requests_waiting', 'Ожидают соединение', ['alias'])
+POOL_SATURATION = metrics.registry.gauge(
+    'db_pool_saturation', 'Доля занятых соединений от max_size', ['alias'],
+)
+POOL_REQUESTS = metrics.registry.gauge(
+    'db_pool_requests', 'Выдано соединений с момента старта', ['alias'],
+)
+POOL_WAIT_MS = metrics.registry.gauge(
+    'db_pool_requests_wait_ms', 'Суммарное ожидание соединения, мс', ['alias'],
+)
+POOL_ERRORS = metrics.registry.gauge(
+    'db_pool_requests_errors', 'Ошибки получения соединения (таймауты и т.п.)', ['alias'],
+)
+
+
+def collect_pool_stats():
+    """Обновляет метрики пула из ConnectionPool.get_stats(); вызывается при снимке реестра."""
+    for alias, pool in _pools().items():
+        stats = pool.get_stats()
+        size = stats.get('pool_size', 0)
+        available = stats.get('pool_available', 0)
+        POOL_SIZE.set(size, alias=alias)
+        POOL_MAX.set(pool.max_size, alias=alias)
+        POOL_AVAILABLE.set(available, alias=alias)
+        POOL_WAITING.set(stats.get('requests_waiting', 0), alias=alias)
+        POOL_SATURATION.set((size - available) / pool.max_size, alias=alias)
+        POOL_REQUESTS.set(stats.get('requests_num', 0), alias=alias)
+        POOL_WAIT_MS.set(stats.get('requests_wait_ms', 0), alias=alias)
+        POOL_ERRORS.set(stats.get('requests_errors', 0), alias=alias)
+
+
+metrics.registry.add_collector(collect_pool_stats)
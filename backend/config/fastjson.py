@@ -0,0 +1,149 @@
+"""Быстрая сериализация JSON для DRF и WebSocket.
+
+Бэкенд выбирается настройкой JSON_BACKEND: 'orjson', 'stdlib', 'auto'
+(orjson, если установлен) или dotted path к своему классу с методами
+dumps(obj, default) -> bytes и loads(data).
+
+orjson сам сериализует datetime/date/UUID/dataclass; остальное (Decimal,
+lazy-строки, timedelta, QuerySet) уходит в default-функцию того же
+энкодера, что и раньше: для DRF — rest_framework.utils.encoders, для
+консьюмеров — DjangoJSONEncoder. Отличие от stdlib одно: datetime в
+консьюмерах отдаётся с микросекундами, а не миллисекундами.
+"""
+
+import json
+import threading
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder as DRFJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson есть в requirements
+    orjson = None
+
+drf_default = DRFJSONEncoder().default
+django_default = DjangoJSONEncoder().default
+
+
+class StdlibBackend:
+    """json из стандартной библиотеки — эталон и запасной вариант."""
+
+    name = 'stdlib'
+
+    def __init__(self):
+        self._encoders = {}
+
+    def dumps(self, obj, default=django_default):
+        encoder = self._encoders.get(default)
+        if encoder is None:
+            encoder = self._encoders[default] = json.JSONEncoder(
+                default=default, ensure_ascii=False, separators=(',', ':'),
+            )
+        return encoder.encode(obj).encode('utf-8')
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonBackend:
+    """orjson: сериализация в Rust, сразу в bytes."""
+
+    name = 'orjson'
+    options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z) if orjson else 0
+
+    def dumps(self, obj, default=django_default):
+        return orjson.dumps(obj, default=default, option=self.options)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+_backend = None
+_lock = threading.Lock()
+
+
+def get_backend():
+    """Бэкенд по settings.JSON_BACKEND (создаётся один раз на процесс)."""
+    global _backend
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                _backend = _make_backend(getattr(settings, 'JSON_BACKEND', 'auto'))
+    return _backend
+
+
+def _make_backend(name):
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'stdlib'
+    if name == 'orjson':
+        if orjson is None:
+            raise ImportError('JSON_BACKEND=orjson, но пакет orjson не установлен')
+        return OrjsonBackend()
+    if name == 'stdlib':
+        return StdlibBackend()
+    return import_string(name)()
+
+
+def reset_backend():
+    """Сбрасывает выбранный бэкенд (после смены настройки в тестах)."""
+    global _backend
+    _backend = None
+
+
+def dumps(obj, default=django_default) -> bytes:
+    return get_backend().dumps(obj, default)
+
+
+def dumps_str(obj, default=django_default) -> str:
+    return get_backend().dumps(obj, default).decode('utf-8')
+
+
+def loads(data):
+    return get_backend().loads(data)
+
+
+# ── DRF ───────────────────────────────────────────────────────
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на get_backend(); с отступами (?indent, browsable API) — штатный."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = dumps(data, default=drf_default)
+        # Как в DRF: U+2028/U+2029 ломают JSON, вставленный в <script>.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser на get_backend()."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return loads(stream.read())
+        except ValueError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+# ── Channels ──────────────────────────────────────────────────
+
+class FastJSONConsumerMixin:
+    """encode_json/decode_json для AsyncJsonWebsocketConsumer на get_backend()."""
+
+    @classmethod
+    async def encode_json(cls, content):
+        return dumps_str(content)
+
+    @classmethod
+    async def decode_json(cls, text_data):
+        return loads(text_data)
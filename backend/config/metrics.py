@@ -0,0 +1,418 @@
+"""Метрики в формате Prometheus (text exposition) без внешних зависимостей.
+
+Реестр живёт в памяти процесса. Процессы сбрасывают снимок своего
+реестра в кэш (Redis) под своим ключом с коротким TTL и добавляют id в
+множество воркеров (SADD): Celery — после каждой задачи, воркеры шардов —
+в цикле heartbeat, daphne — фоновым потоком раз в METRICS_PUSH_SECONDS.
+/metrics складывает локальный реестр и живые снимки других процессов,
+id с истёкшим снимком из множества убираются. Счётчики и гистограммы
+суммируются, у gauge сумма смысла не имеет (размер пула, насыщенность) —
+их значения выводятся по процессам с меткой process.
+
+Без METRICS_TOKEN /metrics открыт только при DEBUG.
+"""
+
+import functools
+import logging
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseForbidden
+
+from config import rediscache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+WORKERS_KEY = 'metrics:workers'
+WORKER_KEY = 'metrics:worker:{}'
+WORKER_TTL = 300  # снимок умершего процесса пропадает через 5 минут
+PROCESS_LABEL = 'process'
+
+_workers_lock = threading.Lock()
+_pusher = None
+
+
+class _Metric:
+    type = ''
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name}: ожидались метки {self.labelnames}, получены {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'type': self.type,
+                'help': self.documentation,
+                'labels': list(self.labelnames),
+                'samples': [[list(k), self._copy(v)] for k, v in self._values.items()],
+            }
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+
+class Counter(_Metric):
+    """Монотонный счётчик."""
+
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Текущее значение (может уменьшаться)."""
+
+    type = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Гистограмма с фиксированными корзинами."""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            if idx < len(self.buckets):
+                state['buckets'][idx] += 1
+            state['sum'] += value
+            state['count'] += 1
+
+    def time(self, **labels):
+        """Контекстный менеджер/декоратор: наблюдает длительность блока."""
+        return _Timer(self, labels)
+
+    def snapshot(self):
+        data = super().snapshot()
+        data['bucket_bounds'] = list(self.buckets)
+        return data
+
+    @staticmethod
+    def _copy(value):
+        return {'buckets': list(value['buckets']), 'sum': value['sum'], 'count': value['count']}
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start, **self._labels)
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self:
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+class Registry:
+    """Набор метрик процесса."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f'Метрика {name} уже зарегистрирована как {metric.type}')
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def add_collector(self, fn):
+        """Функция, обновляющая метрики перед каждым снимком (например, статистика пула БД)."""
+        self._collectors.append(fn)
+
+    def snapshot(self):
+        for collector in self._collectors:
+            collector()
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {m.name: m.snapshot() for m in metrics}
+
+
+registry = Registry()
+
+
+# ── Метрики игрового процесса ─────────────────────────────────
+
+USE_CASE_DURATION = registry.histogram(
+    'use_case_duration_seconds', 'Длительность execute() use case', ['use_case'],
+)
+USE_CASE_ERRORS = registry.counter(
+    'use_case_errors_total', 'Исключения из use case', ['use_case', 'error'],
+)
+FISHING_TICKS = registry.counter('fishing_ticks_total', 'Тики FishingConsumer')
+FISHING_TICK_DURATION = registry.histogram(
+    'fishing_tick_duration_seconds', 'Длительность тика FishingConsumer',
+)
+FISHING_TICKS_SKIPPED = registry.counter(
+    'fishing_ticks_skipped_total', 'Пропущенные тики: busy — предыдущий не завершён, overload — нет слота',
+    ['reason'],
+)
+FISHING_TICKS_DELAYED = registry.counter(
+    'fishing_ticks_delayed_total', 'Отложенные тики: stretched — растянут интервал, queued — ждали слота',
+    ['reason'],
+)
+FISHING_TICKS_INFLIGHT = registry.gauge(
+    'fishing_ticks_inflight', 'Тики, выполняющиеся сейчас (лимит FISHING_MAX_INFLIGHT_TICKS)',
+)
+FISHING_BITES = registry.counter(
+    'fishing_bite_transitions_total', 'Сессии в состоянии bite/nibble по итогам тика', ['state'],
+)
+FISHING_ACTIONS = registry.counter(
+    'fishing_actions_total', 'Действия игрока в FishingConsumer', ['action'],
+)
+FISHING_SHARD_PLAYERS = registry.gauge(
+    'fishing_shard_players', 'Игроки на воркере шарда рыбалки', ['shard'],
+)
+WS_CONNECTIONS = registry.gauge(
+    'ws_connections', 'Открытые WebSocket-соединения', ['consumer', 'location'],
+)
+CHAT_FANOUT = registry.counter(
+    'chat_fanout_messages_total', 'Групповые рассылки ChatConsumer', ['kind'],
+)
+CELERY_TASK_DURATION = registry.histogram(
+    'celery_task_duration_seconds', 'Длительность задач Celery', ['task'],
+    buckets=DEFAULT_BUCKETS + (30.0, 60.0, 300.0),
+)
+CELERY_TASKS = registry.counter(
+    'celery_tasks_total', 'Завершённые задачи Celery', ['task', 'state'],
+)
+
+
+def instrument_use_case(instance):
+    """Оборачивает instance.execute таймером и счётчиком ошибок (один раз на экземпляр)."""
+    execute = getattr(instance, 'execute', None)
+    if execute is None or getattr(execute, '_metrics_wrapped', False):
+        return instance
+    cls = type(instance)
+    name = cls.__name__
+
+    @functools.wraps(execute)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            # Метод берётся с класса на каждый вызов — patch.object в тестах продолжает работать.
+            return cls.execute(instance, *args, **kwargs)
+        except Exception as e:
+            USE_CASE_ERRORS.inc(use_case=name, error=type(e).__name__)
+            raise
+        finally:
+            USE_CASE_DURATION.observe(time.perf_counter() - start, use_case=name)
+
+    wrapper._metrics_wrapped = True
+    instance.execute = wrapper
+    return instance
+
+
+# ── Снимки процессов ──────────────────────────────────────────
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def push_snapshot():
+    """Сохраняет снимок реестра процесса в кэш (Celery, воркеры шардов, поток start_pusher)."""
+    wid = worker_id()
+    cache.set(WORKER_KEY.format(wid), registry.snapshot(), WORKER_TTL)
+    if rediscache.is_redis():
+        rediscache.client().sadd(rediscache.make_key(WORKERS_KEY), wid)
+        return
+    # Кэш без множеств (LocMemCache) живёт в одном процессе — хватает блокировки.
+    with _workers_lock:
+        workers = cache.get(WORKERS_KEY) or []
+        if wid not in workers:
+            cache.set(WORKERS_KEY, workers + [wid], None)
+
+
+def start_pusher():
+    """
+    Запускает в процессе daphne поток, сохраняющий снимок раз в METRICS_PUSH_SECONDS.
+
+    Без него /metrics на нескольких процессах daphne видит только тот,
+    что обслужил запрос. Повторный вызов в том же процессе ничего не делает.
+    """
+    global _pusher
+    interval = getattr(settings, 'METRICS_PUSH_SECONDS', 30)
+    if not interval:
+        return
+    with _workers_lock:
+        if _pusher is not None and _pusher[0] == os.getpid():
+            return
+        stop = threading.Event()
+        thread = threading.Thread(target=_push_loop, args=(interval, stop), name='metrics-push', daemon=True)
+        _pusher = (os.getpid(), thread, stop)
+    thread.start()
+
+
+def stop_pusher():
+    """Останавливает поток start_pusher текущего процесса."""
+    global _pusher
+    with _workers_lock:
+        pusher, _pusher = _pusher, None
+    if pusher is not None:
+        pusher[2].set()
+
+
+def _push_loop(interval, stop):
+    while not stop.wait(interval):
+        try:
+            push_snapshot()
+        except Exception:
+            logger.warning('Не удалось сохранить снимок метрик процесса', exc_info=True)
+
+
+def _worker_snapshots(exclude):
+    """Живые снимки других процессов [(id, снимок)]; id с истёкшим снимком удаляются из индекса."""
+    if rediscache.is_redis():
+        workers = sorted(w.decode() for w in rediscache.client().smembers(rediscache.make_key(WORKERS_KEY)))
+    else:
+        workers = cache.get(WORKERS_KEY) or []
+    workers = [w for w in workers if w != exclude]
+    if not workers:
+        return []
+    found = cache.get_many([WORKER_KEY.format(w) for w in workers])
+    dead = [w for w in workers if WORKER_KEY.format(w) not in found]
+    if dead:
+        if rediscache.is_redis():
+            rediscache.client().srem(rediscache.make_key(WORKERS_KEY), *dead)
+        else:
+            with _workers_lock:
+                cache.set(WORKERS_KEY, [w for w in cache.get(WORKERS_KEY) or [] if w not in dead], None)
+    return [(w, found[WORKER_KEY.format(w)]) for w in workers if found.get(WORKER_KEY.format(w))]
+
+
+def collect():
+    """Локальный снимок + снимки воркеров из кэша: счётчики суммируются, gauge — по процессам."""
+    merged = {}
+    own = worker_id()
+    snapshots = [(own, registry.snapshot()), *_worker_snapshots(exclude=own)]
+    for process, snapshot in snapshots:
+        for name, data in snapshot.items():
+            gauge = data['type'] == 'gauge'
+            target = merged.get(name)
+            if target is None:
+                labels = [*data['labels'], PROCESS_LABEL] if gauge else data['labels']
+                target = merged[name] = {**data, 'labels': labels, 'samples': {}}
+            for labels, value in data['samples']:
+                key = tuple(labels)
+                if gauge:
+                    target['samples'][(*key, process)] = value
+                elif data['type'] == 'histogram':
+                    acc = target['samples'].setdefault(
+                        key, {'buckets': [0] * len(value['buckets']), 'sum': 0.0, 'count': 0},
+                    )
+                    acc['buckets'] = [a + b for a, b in zip(acc['buckets'], value['buckets'])]
+                    acc['sum'] += value['sum']
+                    acc['count'] += value['count']
+                else:
+                    target['samples'][key] = target['samples'].get(key, 0) + value
+    return merged
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ''
+    escaped = (
+        (k, str(v).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"'))
+        for k, v in pairs
+    )
+    return '{' + ','.join(f'{k}="{v}"' for k, v in escaped) + '}'
+
+
+def render(metrics=None) -> str:
+    """Текст в формате Prometheus exposition 0.0.4."""
+    metrics = collect() if metrics is None else metrics
+    lines = []
+    for name in sorted(metrics):
+        data = metrics[name]
+        lines.append(f'# HELP {name} {data["help"]}')
+        lines.append(f'# TYPE {name} {data["type"]}')
+        for labels, value in sorted(data['samples'].items()):
+            if data['type'] == 'histogram':
+                cumulative = 0
+                for bound, n in zip(data['bucket_bounds'], value['buckets']):
+                    cumulative += n
+                    lbl = _format_labels(data['labels'], labels, [('le', repr(float(bound)))])
+                    lines.append(f'{name}_bucket{lbl} {cumulative}')
+                lbl = _format_labels(data['labels'], labels, [('le', '+Inf')])
+                lines.append(f'{name}_bucket{lbl} {value["count"]}')
+                lbl = _format_labels(data['labels'], labels)
+                lines.append(f'{name}_sum{lbl} {value["sum"]}')
+                lines.append(f'{name}_count{lbl} {value["count"]}')
+            else:
+                lines.append(f'{name}{_format_labels(data["labels"], labels)} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """GET /metrics: Authorization: Bearer <METRICS_TOKEN>; без токена — только при DEBUG."""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        if request.headers.get('Authorization') != f'Bearer {token}':
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        return HttpResponseForbidden()
+    return HttpResponse(render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,151 @@
+"""Учёт SQL-запросов: число, время БД и повторы на запрос, use case и тик.
+
+Счётчик подключается через execute_wrapper ко всем алиасам connections.
+Итоги пишутся в лог `querybudget`: DEBUG — всегда, WARNING — при
+превышении порогов из settings.QUERY_BUDGET. По умолчанию учёт включён
+только при DEBUG (QUERY_BUDGET['ENABLED']).
+
+На запрос всегда считаются только число, время и повторы одинакового SQL
+(без нормализации); форма запроса (fingerprint) считается при отчёте по
+повторам. Полный список запросов с временем собирается, лишь когда
+detail=True — по умолчанию при DEBUG и в тестах (assert_max_queries).
+"""
+
+import functools
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('querybudget')
+
+_IN_LIST_RE = re.compile(r'\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)')
+_NUMBER_RE = re.compile(r'\b\d+\b')
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+
+
+def fingerprint(sql: str) -> str:
+    """Нормализует SQL: литералы и списки IN сворачиваются, остаётся форма запроса."""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    return _IN_LIST_RE.sub('IN (...)', sql)
+
+
+@dataclass
+class QueryStats:
+    """Накопленные запросы одного участка кода."""
+
+    label: str
+    detail: bool = False
+    count: int = 0
+    db_time: float = 0.0
+    queries: list = field(default_factory=list)  # [(sql, секунды)] при detail
+    statements: Counter = field(default_factory=Counter)
+
+    @property
+    def fingerprints(self) -> Counter:
+        """{форма запроса: раз} — нормализация по разу на различный SQL."""
+        result = Counter()
+        for sql, n in self.statements.items():
+            result[fingerprint(sql)] += n
+        return result
+
+    @property
+    def duplicates(self) -> dict:
+        """Формы запросов, выполненные больше одного раза: {fingerprint: раз}."""
+        return {fp: n for fp, n in self.fingerprints.items() if n > 1}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.db_time += elapsed
+            self.statements[sql] += 1
+            if self.detail:
+                self.queries.append((sql, elapsed))
+
+    def summary(self) -> str:
+        text = f'{self.label}: {self.count} запросов, {self.db_time * 1000:.1f} мс БД'
+        if self.duplicates:
+            text += f', повторов: {sum(self.duplicates.values()) - len(self.duplicates)}'
+        return text
+
+
+def _budget():
+    return getattr(settings, 'QUERY_BUDGET', {})
+
+
+def report(stats: QueryStats) -> None:
+    """Пишет итог в лог; WARNING при превышении порогов."""
+    budget = _budget()
+    over = (
+        stats.count > budget.get('WARN_QUERIES', 50)
+        or sum(stats.duplicates.values()) > budget.get('WARN_DUPLICATES', 10)
+    )
+    if over:
+        logger.warning(
+            '%s; повторяющиеся: %s', stats.summary(),
+            sorted(stats.duplicates.items(), key=lambda kv: -kv[1])[:5],
+        )
+    else:
+        logger.debug(stats.summary())
+
+
+@contextmanager
+def track_queries(label: str, using: str = None, log: bool = True, detail: bool = None):
+    """Считает запросы внутри блока (по всем алиасам или только using) и отдаёт QueryStats."""
+    stats = QueryStats(label, detail=settings.DEBUG if detail is None else detail)
+    with ExitStack() as stack:
+        wrapped = set()
+        for alias in [using] if using else connections:
+            connection = connections[alias]
+            if id(connection) not in wrapped:  # alias-двойник того же соединения считается один раз
+                wrapped.add(id(connection))
+                stack.enter_context(connection.execute_wrapper(stats))
+        yield stats
+    if log:
+        report(stats)
+
+
+def instrumented(label: str):
+    """Декоратор для синхронных функций (use cases, тела database_sync_to_async)."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _budget().get('ENABLED', settings.DEBUG):
+                return fn(*args, **kwargs)
+            with track_queries(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """Middleware: учёт запросов на HTTP-запрос, метка — имя view."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not _budget().get('ENABLED', settings.DEBUG):
+            return self.get_response(request)
+
+        with track_queries(request.path, log=False) as stats:
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        if match is not None:
+            stats.label = match.view_name or match._func_path
+        report(stats)
+        if settings.DEBUG:
+            response['X-Query-Count'] = str(stats.count)
+            response['X-Query-Time-Ms'] = f'{stats.db_time * 1000:.1f}'
+        return response
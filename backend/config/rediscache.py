@@ -0,0 +1,40 @@
+"""Прямой клиент Redis кэша default — для структур, которых нет в API кэша.
+
+Множества, хэши и SCAN нужны присутствию на локациях и индексу снимков
+метрик. Адрес берётся из settings.CACHES['default']['LOCATION'] (первый
+сервер — запись), ключи — через cache.make_key, как у самого кэша.
+"""
+
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+
+_client = None
+_lock = threading.Lock()
+
+
+def is_redis() -> bool:
+    """Кэш default — Redis (иначе LocMemCache и т.п.)."""
+    return isinstance(caches['default'], RedisCache)
+
+
+def client():
+    """redis.Redis по адресу кэша default (один на процесс)."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                import redis
+
+                location = settings.CACHES['default']['LOCATION']
+                if isinstance(location, str):
+                    location = location.split(',')
+                _client = redis.Redis.from_url(location[0])
+    return _client
+
+
+def make_key(key: str) -> str:
+    """Ключ с префиксом и версией кэша default."""
+    return caches['default'].make_key(key)
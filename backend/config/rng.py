@@ -0,0 +1,200 @@
+"""Источник случайности игровых сервисов: потоки по ключу, seed, запись/воспроизведение.
+
+Сервисы берут генератор у RandomService вместо модуля random: поток
+сессии рыбалки (session:<pk>), игрока (player:<pk>) или именованный
+(cafe, inspection). Режим задаётся настройками:
+
+- RNG_SEED не задан и RNG_MODE пуст — все потоки это модуль random,
+  поведение прежнее;
+- RNG_SEED задан — у каждого ключа свой random.Random, зерно которого
+  выводится из RNG_SEED и ключа: прогон воспроизводим независимо от того,
+  в каком порядке перемежаются сессии;
+- RNG_MODE=record — каждое обращение потока к генератору дописывается
+  строкой JSON {"stream", "kind", "value"} в RNG_LOG;
+- RNG_MODE=replay — потоки отдают значения из RNG_LOG по порядку, без
+  генерации; закончившийся журнал — ReplayExhausted.
+
+Все методы random.Random (uniform, choices, betavariate, randint, ...)
+сводятся к random() и getrandbits(), поэтому записываются только они.
+Потоки живут в процессе; с RNG_SEED в памяти держится не больше
+RNG_MAX_STREAMS генераторов. Вытесненный поток не забывается: его
+состояние (getstate, ~2.5 КБ) откладывается и восстанавливается при
+следующем обращении, иначе поток начался бы с зерна заново и повторил
+первые значения. Поток сессии рыбалки удаляется вместе с FishingSession
+(forget_session).
+"""
+
+import hashlib
+import json
+import random
+import threading
+from array import array
+from collections import OrderedDict, defaultdict, deque
+
+from django.conf import settings
+
+MODES = ('', 'record', 'replay')
+DEFAULT_MAX_STREAMS = 10000
+
+
+class ReplayExhausted(LookupError):
+    """В журнале воспроизведения нет следующего значения потока."""
+
+
+def _pack_state(state):
+    """getstate() Mersenne Twister: 625 чисел — в 4-байтовый массив."""
+    version, internal, gauss_next = state
+    return version, array('I', internal).tobytes(), gauss_next
+
+
+def _unpack_state(packed):
+    version, internal, gauss_next = packed
+    return version, tuple(array('I', internal)), gauss_next
+
+
+def derive_seed(seed, key) -> int:
+    """Зерно потока key из общего seed (не зависит от PYTHONHASHSEED)."""
+    digest = hashlib.sha256(f'{seed}:{key}'.encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+class RecordingRandom(random.Random):
+    """random.Random, пишущий каждое значение в журнал."""
+
+    def __init__(self, key, seed, sink):
+        self._key = key
+        self._sink = sink
+        super().__init__(seed)
+
+    def random(self):
+        value = super().random()
+        self._sink(self._key, 'random', value)
+        return value
+
+    def getrandbits(self, k):
+        value = super().getrandbits(k)
+        self._sink(self._key, f'bits{k}', value)
+        return value
+
+
+class ReplayRandom(random.Random):
+    """random.Random, отдающий значения из журнала."""
+
+    def __init__(self, key, draws):
+        self._key = key
+        self._draws = draws
+        super().__init__(0)
+
+    def _next(self, kind):
+        try:
+            recorded_kind, value = self._draws.popleft()
+        except IndexError:
+            raise ReplayExhausted(f'Журнал потока {self._key} закончился') from None
+        if recorded_kind != kind:
+            raise ReplayExhausted(f'Поток {self._key}: ожидался {kind}, в журнале {recorded_kind}')
+        return value
+
+    def random(self):
+        return self._next('random')
+
+    def getrandbits(self, k):
+        return self._next(f'bits{k}')
+
+
+class RandomService:
+    """Потоки случайных чисел по ключу; режим — из настроек RNG_*."""
+
+    def __init__(self, seed=None, mode=None, log_path=None):
+        self.seed = seed if seed is not None else getattr(settings, 'RNG_SEED', None)
+        self.mode = mode if mode is not None else getattr(settings, 'RNG_MODE', '')
+        if self.mode not in MODES:
+            raise ValueError(f'RNG_MODE: ожидалось одно из {MODES}, получено {self.mode!r}')
+        self.log_path = log_path or getattr(settings, 'RNG_LOG', '')
+        if self.mode and not self.log_path:
+            raise ValueError('Для RNG_MODE=record/replay нужен RNG_LOG')
+        self.max_streams = getattr(settings, 'RNG_MAX_STREAMS', DEFAULT_MAX_STREAMS)
+        self._streams = OrderedDict()
+        self._parked = {}  # {key: состояние вытесненного генератора}
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._log = None
+        self._replay = None
+
+    @property
+    def deterministic(self) -> bool:
+        return self.seed is not None or bool(self.mode)
+
+    def stream(self, key):
+        """Генератор потока key (API модуля random)."""
+        if not self.deterministic:
+            return random
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = self._streams[key] = self._create(key)
+                parked = self._parked.pop(key, None)
+                if parked is not None:
+                    stream.setstate(_unpack_state(parked))
+                if self.mode != 'replay' and len(self._streams) > self.max_streams:
+                    old_key, old = self._streams.popitem(last=False)
+                    self._parked[old_key] = _pack_state(old.getstate())
+            else:
+                self._streams.move_to_end(key)
+            return stream
+
+    def session(self, session_id):
+        return self.stream(f'session:{session_id}')
+
+    def player(self, player_id):
+        return self.stream(f'player:{player_id}')
+
+    def stream_for(self, session=None, player_id=None, name='game'):
+        """Поток сессии рыбалки, если она есть, иначе игрока, иначе именованный."""
+        if session is not None:
+            return self.session(session.pk)
+        if player_id is not None:
+            return self.player(player_id)
+        return self.stream(name)
+
+    def forget(self, key):
+        """Забывает поток (и его отложенное состояние): ключ больше не понадобится."""
+        with self._lock:
+            self._streams.pop(key, None)
+            self._parked.pop(key, None)
+
+    def forget_session(self, session_id):
+        self.forget(f'session:{session_id}')
+
+    def reset(self, seed=None):
+        """Забывает потоки; с seed — начинает прогон с новым зерном."""
+        with self._lock:
+            if seed is not None:
+                self.seed = seed
+            self._streams.clear()
+            self._parked.clear()
+            self._replay = None
+
+    def _create(self, key):
+        seed = derive_seed(self.seed, key) if self.seed is not None else None
+        if self.mode == 'record':
+            return RecordingRandom(key, seed, self._write)
+        if self.mode == 'replay':
+            return ReplayRandom(key, self._load_replay()[key])
+        return random.Random(seed)
+
+    def _write(self, key, kind, value):
+        line = json.dumps({'stream': key, 'kind': kind, 'value': value}) + '\n'
+        with self._log_lock:
+            if self._log is None:
+                self._log = open(self.log_path, 'a', encoding='utf-8', buffering=1)
+            self._log.write(line)
+
+    def _load_replay(self):
+        if self._replay is None:
+            self._replay = defaultdict(deque)
+            with open(self.log_path, encoding='utf-8') as fh:
+                for line in fh:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._replay[entry['stream']].append((entry['kind'], entry['value']))
+        return self._replay
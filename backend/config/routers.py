@@ -0,0 +1,141 @@
+"""Маршрутизация чтений на реплику с объявленной согласованностью.
+
+View объявляет `read_consistency = EVENTUAL`, если ей допустимы слегка
+устаревшие данные (рейтинги, каталог, история). Такие GET-запросы читают
+с реплики (alias settings.DATABASE_REPLICA_ALIAS). Всё остальное — с
+primary. После первой записи в рамках запроса или блока reads_from()
+чтения возвращаются на primary, а клиент на REPLICA_PIN_SECONDS
+закрепляется за primary, чтобы видеть собственные записи.
+
+Без alias реплики в DATABASES роутер ничего не меняет.
+"""
+
+import functools
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+EVENTUAL = 'eventual'
+STRONG = 'strong'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_KEY = 'db:pin:{}'
+
+
+class _Scope:
+    """Область чтений: согласованность и признак записи."""
+
+    __slots__ = ('consistency', 'wrote', 'parent')
+
+    def __init__(self, consistency, parent=None):
+        self.consistency = consistency
+        self.parent = parent
+        self.wrote = bool(parent and parent.wrote)
+
+    def mark_write(self):
+        scope = self
+        while scope is not None:
+            scope.wrote = True
+            scope = scope.parent
+
+
+_scope: ContextVar = ContextVar('db_read_scope', default=None)
+
+
+def replica_alias():
+    """Alias реплики или None, если реплика не настроена."""
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', 'replica')
+    return alias if alias in connections.settings else None
+
+
+@contextmanager
+def reads_from(consistency):
+    """Блок с заданной согласованностью чтений (use cases, консьюмеры, задачи)."""
+    scope = _Scope(consistency, parent=_scope.get())
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+def read_consistency(consistency):
+    """Декоратор-вариант reads_from для функций и методов."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with reads_from(consistency):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class ReplicaRouter:
+    """Роутер: EVENTUAL-чтения без предшествующей записи — на реплику."""
+
+    def db_for_read(self, model, **hints):
+        scope = _scope.get()
+        if scope is None or scope.consistency != EVENTUAL or scope.wrote:
+            return 'default'
+        return replica_alias() or 'default'
+
+    def db_for_write(self, model, **hints):
+        scope = _scope.get()
+        if scope is not None:
+            scope.mark_write()
+        # Явно default: объект, прочитанный с реплики, иначе писался бы туда же.
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика — копия primary, связи между их объектами допустимы.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != replica_alias()
+
+
+def _client_key(request):
+    """Идентификатор клиента для закрепления за primary (JWT или сессия)."""
+    raw = request.headers.get('Authorization')
+    if not raw and hasattr(request, 'session'):
+        raw = request.session.session_key
+    if not raw:
+        return None
+    return PIN_KEY.format(hashlib.sha1(raw.encode()).hexdigest())
+
+
+class ReadConsistencyMiddleware:
+    """Открывает область чтений на запрос и применяет read_consistency view."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        scope = _Scope(STRONG)
+        token = _scope.set(scope)
+        try:
+            response = self.get_response(request)
+        finally:
+            _scope.reset(token)
+        if scope.wrote and replica_alias():
+            key = _client_key(request)
+            if key:
+                cache.set(key, True, getattr(settings, 'REPLICA_PIN_SECONDS', 5))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        scope = _scope.get()
+        if scope is None or request.method not in SAFE_METHODS or not replica_alias():
+            return None
+        view = getattr(view_func, 'view_class', view_func)
+        if getattr(view, 'read_consistency', STRONG) != EVENTUAL:
+            return None
+        key = _client_key(request)
+        if key and cache.get(key):
+            return None
+        scope.consistency = EVENTUAL
+        return None
@@ -0,0 +1,39 @@
+"""Общие поля DRF.
+
+CountedRelationField — число объектов связи. Списки аннотируют queryset
+через Count('<связь>') (имя аннотации Django по умолчанию —
+'<связь>__count'), и поле читает её без запроса на строку. Без аннотации
+(одиночный объект после создания, детальный view) — related.count(),
+который использует prefetch_related, если он был.
+"""
+
+from django.db.models import Count
+from rest_framework import serializers
+
+
+class CountedRelationField(serializers.Field):
+    """Только чтение: аннотация '<relation>__count' или relation.count()."""
+
+    def __init__(self, relation, **kwargs):
+        self.relation = relation
+        self.annotation = f'{relation}__count'
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        value = getattr(instance, self.annotation, None)
+        if value is None:
+            value = getattr(instance, self.relation).count()
+        return value
+
+
+def with_counts(queryset, *relations):
+    """
+    Аннотирует queryset Count по связям для CountedRelationField.
+
+    Запрос с GROUP BY не применяет Meta.ordering, поэтому порядок
+    модели задаётся явно — иначе пагинация списка нестабильна.
+    """
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    return queryset.annotate(*(Count(relation) for relation in relations)).order_by(*ordering)
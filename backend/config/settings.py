@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'apps.cafe',
     'apps.home',
     'apps.bar',
+    'apps.bootstrap',
     'channels',
 ]
 
@@ -54,6 +55,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'config.querybudget.QueryBudgetMiddleware',
+    'config.routers.ReadConsistencyMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -88,6 +91,38 @@ DATABASES = {
     }
 }
 
+# === Пул соединений (psycopg_pool) ===
+# Потоки database_sync_to_async консьюмеров (config.db); пул рассчитан на них
+# плюс запас под HTTP-запросы. Для Celery prefork DB_POOL_MAX_SIZE=2 на процесс.
+DB_EXECUTOR_THREADS = int(os.environ.get('DB_EXECUTOR_THREADS', 16))
+if os.environ.get('DB_POOL', 'True').lower() in ('true', '1'):
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', DB_EXECUTOR_THREADS + 4)),
+            'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+            'name': 'default',
+        },
+    }
+
+# === Реплика для чтения (config.routers) ===
+# View с read_consistency = EVENTUAL читают с реплики; после записи клиент
+# REPLICA_PIN_SECONDS секунд читает с primary. В тестах реплика зеркалит default.
+DATABASE_ROUTERS = ['config.routers.ReplicaRouter']
+DATABASE_REPLICA_ALIAS = 'replica'
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 5))
+if os.environ.get('POSTGRES_REPLICA_HOST'):
+    DATABASES[DATABASE_REPLICA_ALIAS] = {
+        **DATABASES['default'],
+        'HOST': os.environ['POSTGRES_REPLICA_HOST'],
+        'PORT': os.environ.get('POSTGRES_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    if 'pool' in DATABASES['default'].get('OPTIONS', {}):
+        DATABASES[DATABASE_REPLICA_ALIAS]['OPTIONS'] = {
+            'pool': {**DATABASES['default']['OPTIONS']['pool'], 'name': DATABASE_REPLICA_ALIAS},
+        }
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -105,6 +140,8 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# WebP-миниатюры изображений каталога (apps.tackle.images): метка -> сторона, px
+IMAGE_THUMBNAIL_SIZES = {'sm': 96, 'md': 256}
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -126,10 +163,22 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'config.fastjson.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'config.fastjson.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
 }
 
+# Сериализатор JSON для DRF и консьюмеров (config.fastjson): auto | orjson | stdlib | dotted path
+JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+
 # === JWT ===
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=12),
@@ -164,11 +213,54 @@ CHANNEL_LAYERS = {
     },
 }
 
+# === Тики рыбалки (apps.fishing.ticks) ===
+# Базовый интервал; под нагрузкой растягивается до FISHING_TICK_MAX_SECONDS.
+FISHING_TICK_SECONDS = float(os.environ.get('FISHING_TICK_SECONDS', 1.5))
+FISHING_TICK_MAX_SECONDS = float(os.environ.get('FISHING_TICK_MAX_SECONDS', 6))
+# Тиков одновременно в процессе; половина DB_EXECUTOR_THREADS остаётся действиям игроков.
+FISHING_MAX_INFLIGHT_TICKS = int(os.environ.get('FISHING_MAX_INFLIGHT_TICKS', DB_EXECUTOR_THREADS // 2))
+
+# === Шардирование тиков рыбалки (apps.fishing.shards) ===
+# Каналы воркеров (manage.py runworker <канал>...); пусто — тики в процессе daphne.
+FISHING_SHARDS = [s.strip() for s in os.environ.get('FISHING_SHARDS', '').split(',') if s.strip()]
+# Ключ кольца: 'location' или 'base'
+FISHING_SHARD_BY = os.environ.get('FISHING_SHARD_BY', 'location')
+# Закреплённые шарды для горячих локаций: "location:5=fishing-hot,base:2=fishing-1"
+FISHING_SHARD_PINS = dict(
+    pair.strip().split('=', 1)
+    for pair in os.environ.get('FISHING_SHARD_PINS', '').split(',') if '=' in pair
+)
+# Воркеры шардов в процессе daphne (для InMemoryChannelLayer и разработки)
+FISHING_SHARDS_EMBEDDED = os.environ.get('FISHING_SHARDS_EMBEDDED', 'False').lower() in ('true', '1')
+FISHING_SHARD_HEARTBEAT = int(os.environ.get('FISHING_SHARD_HEARTBEAT', 10))
+
+# === Случайность (config.rng) ===
+# Зерно потоков сессий/игроков; не задано — модуль random, как раньше.
+RNG_SEED = int(os.environ['RNG_SEED']) if os.environ.get('RNG_SEED') else None
+# '' | 'record' (журнал всех значений в RNG_LOG) | 'replay' (значения из RNG_LOG)
+RNG_MODE = os.environ.get('RNG_MODE', '')
+RNG_LOG = os.environ.get('RNG_LOG', '')
+# Генераторов в памяти; вытесненные хранят только состояние (getstate).
+RNG_MAX_STREAMS = int(os.environ.get('RNG_MAX_STREAMS', 10000))
+
+# === Учёт SQL-запросов (config.querybudget) ===
+QUERY_BUDGET = {
+    'ENABLED': os.environ.get('QUERY_BUDGET_ENABLED', str(DEBUG)).lower() in ('true', '1'),
+    'WARN_QUERIES': int(os.environ.get('QUERY_BUDGET_WARN_QUERIES', 50)),
+    'WARN_DUPLICATES': int(os.environ.get('QUERY_BUDGET_WARN_DUPLICATES', 10)),
+}
+
+# === Метрики (config.metrics, /metrics) ===
+# Без токена /metrics открыт только при DEBUG.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+# Как часто процесс daphne сохраняет снимок реестра для /metrics (0 — не сохранять).
+METRICS_PUSH_SECONDS = int(os.environ.get('METRICS_PUSH_SECONDS', '30'))
+
 # === Игровые настройки ===
 GAME_SETTINGS = {
     'GAME_TICK_SECONDS': 30,       # 30 реальных секунд = 1 игровой час
-    'HUNGER_TICK_MINUTES': 5,      # снижение сытости каждые 5 минут
-    'HUNGER_DECREASE': 2,          # на сколько снижается сытость за тик
+    'HUNGER_TICK_MINUTES': 5,      # сытость на локации снижается на
+    'HUNGER_DECREASE': 2,          # HUNGER_DECREASE за HUNGER_TICK_MINUTES минут
     'STARTING_MONEY': 500.00,      # начальные деньги
     'STARTING_RANK': 1,            # начальный разряд
     'MAX_CREEL_SIZE': 30,          # максимум рыб в садке
@@ -5,8 +5,11 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from config.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     path('api/auth/', include('apps.accounts.urls')),
     path('api/', include('apps.world.urls')),
     path('api/', include('apps.shop.urls')),
@@ -15,6 +15,19 @@ from apps.inventory.models import PlayerRod, InventoryItem, CaughtFish
 from apps.fishing.models import FishingSession, FightState, GameTime
 
 
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    """Кэш и присутствие на локациях не переживают тест (данные по id: индекс квестов и т.п.)."""
+    from django.core.cache import cache
+
+    from apps.tackle.images import reset_thumbnails_index
+    from apps.world import services as world_services
+    cache.clear()
+    reset_thumbnails_index()
+    world_services._store = None
+    yield
+
+
 @pytest.fixture
 def user(db):
     return User.objects.create_user(username='fisher', password='testpass123')
@@ -225,3 +238,30 @@ def fishing_session_caught(player, location, player_rod, fish_species):
         cast_time=timezone.now(),
         hooked_species=fish_species, hooked_weight=1.5, hooked_length=25.0,
     )
+
+
+@pytest.fixture
+def assert_max_queries(db):
+    """
+    Контекстный менеджер: падает, если блок выполнил больше num запросов.
+
+        with assert_max_queries(5):
+            service.do_something()
+    """
+    from contextlib import contextmanager
+
+    from config.querybudget import track_queries
+
+    @contextmanager
+    def _assert(num, using=None):
+        with track_queries('test', using=using, log=False, detail=True) as stats:
+            yield stats
+        if stats.count > num:
+            lines = '\n'.join(f'  {i}. {sql}' for i, (sql, _) in enumerate(stats.queries, 1))
+            dupes = '\n'.join(f'  x{n}: {fp}' for fp, n in stats.duplicates.items())
+            pytest.fail(
+                f'Ожидалось не больше {num} запросов, выполнено {stats.count}:\n{lines}'
+                + (f'\nПовторы:\n{dupes}' if dupes else ''),
+            )
+
+    return _assert